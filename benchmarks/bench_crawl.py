@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+크롤러 전체 처리량 벤치마크
+
+로컬 쇼핑몰(fixture_shop.py)을 띄우고 ProductCrawler(main.py)를 그 주소로 실행하여
+상품/초, 주고받은 용량, 단계별 시간(perf_spans.jsonl)을 출력한다.
+
+사용자 config.py는 import만 해도 결과 폴더를 지우므로 읽지 않는다. 대신 임시 폴더에
+벤치마크용 config.py를 만들고, 크롤러는 그 폴더를 import 경로 맨 앞에 둔 별도 프로세스에서 실행한다.
+(서버와 크롤러가 같은 프로세스의 GIL을 나눠 쓰지 않도록 분리)
+
+    python benchmarks/bench_crawl.py --products 20
+    python benchmarks/bench_crawl.py --products 10000 --latency-ms 30 --option EXCEL_STREAMING=True
+"""
+
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.fixture_shop import FixtureShop  # noqa: E402
+from utils.perf_trace import STAGES, percentile  # noqa: E402
+
+# 벤치마크용 config.py (main.py / final_analyzer_universal.py가 from config import *로 쓰는 값)
+CONFIG_TEMPLATE = '''# 벤치마크 실행용 임시 설정 (benchmarks/bench_crawl.py가 생성)
+import os
+from datetime import datetime
+
+TEST_PRODUCTS = 3
+TEST_MODE = True
+TEST_PRODUCT_COUNT = {product_count}
+
+code = "bench"
+brandname = "벤치마크"
+category = "39130000"
+price_increase_rate = 1.0
+minimum_price = 100
+use_login = False
+login_url = ""
+product_base_url = {base_url!r} + "/"
+catalog_url_template = {base_url!r} + "/product/list.html?cate_no=1&page={{page}}"
+login_credentials = {{'userid': '', 'password': ''}}
+PRODUCT_LINK_PATTERN = '/product/detail.html'
+
+LOGIN_REQUIRED = False
+MAIN_URL = product_base_url
+GALLERY_URL = catalog_url_template.format(page=1)
+SAMPLE_PRODUCT_URL = {sample_url!r}
+USERNAME = ''
+PASSWORD = ''
+SITE_NAME = code
+
+now = datetime.now()
+tdate = now.strftime("%y%m%d%H")
+base_path = {run_root!r} + f'/{{tdate}}{{code}}'
+thumbnail_path = f'{{base_path}}/cr'
+output_path = f'{{base_path}}/output'
+os.makedirs(thumbnail_path, exist_ok=True)
+os.makedirs(output_path, exist_ok=True)
+
+# 벤치마크 기본값: 상품 사이 대기 없음, 모든 링크 시도, 단계 시간 기록
+REQUEST_DELAY = 0
+MAX_LINK_ATTEMPTS = {link_limit}
+MAX_PRODUCT_LINKS = {link_limit}
+PERF_TRACE = True
+{extra_options}
+'''
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="로컬 쇼핑몰 대상 크롤러 처리량 벤치마크")
+    parser.add_argument('--products', type=int, default=20, help="추출할 상품 수 (카탈로그 크기 기본값)")
+    parser.add_argument('--catalog-size', type=int, help="카탈로그 상품 수 (기본: --products)")
+    parser.add_argument('--detail-images', type=int, default=4, help="상품당 상세이미지 수")
+    parser.add_argument('--latency-ms', type=int, default=0, help="요청마다 추가할 서버 지연 (ms)")
+    parser.add_argument('--option', action='append', default=[],
+                        help="벤치마크 config.py에 추가할 설정 (예: --option EXCEL_STREAMING=True, 여러 번 사용 가능)")
+    parser.add_argument('--workdir', help="결과 폴더 (기본: 임시 폴더)")
+    parser.add_argument('--json', help="결과 요약을 저장할 JSON 파일")
+    parser.add_argument('--quiet', action='store_true', help="크롤러 출력 숨김")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def format_options(options):
+    """--option KEY=VALUE 목록을 config.py 문장으로 변환 (VALUE는 파이썬 리터럴, 아니면 문자열)"""
+    lines = []
+    for option in options:
+        name, _, value = option.partition('=')
+        name = name.strip()
+        if not name.isidentifier():
+            raise SystemExit(f"[ERROR] 잘못된 설정 이름: {option}")
+        try:
+            value = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            pass
+        lines.append(f"{name} = {value!r}")
+    return "\n".join(lines)
+
+
+def run_child(config_dir):
+    """벤치마크 config.py로 ProductCrawler 실행 (자식 프로세스)"""
+    import asyncio
+    sys.path.insert(0, config_dir)
+    import main as crawler
+    success = asyncio.run(crawler.ProductCrawler().run_full_crawling())
+    sys.exit(0 if success else 1)
+
+
+def load_spans(path):
+    spans = []
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    spans.append(json.loads(line))
+    return spans
+
+
+def summarize_spans(spans):
+    """단계별 상품당 시간 요약 (ms) - PerfTracer.summary와 같은 방식으로 상품별 합산"""
+    per_stage = {}
+    for span in spans:
+        per_product = per_stage.setdefault(span['stage'], {})
+        per_product[span.get('product')] = per_product.get(span.get('product'), 0.0) + span['ms']
+    summary = {}
+    for stage in [s for s in STAGES if s in per_stage] + sorted(s for s in per_stage if s not in STAGES):
+        values = sorted(per_stage[stage].values())
+        summary[stage] = {
+            'count': len(values),
+            'p50_ms': round(percentile(values, 0.5), 1),
+            'p90_ms': round(percentile(values, 0.9), 1),
+            'p99_ms': round(percentile(values, 0.99), 1),
+            'total_ms': round(sum(values), 1),
+        }
+    return summary
+
+
+def folder_bytes(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+
+def main():
+    args = parse_args()
+    if args.child:
+        run_child(args.child)
+        return
+
+    catalog_size = max(args.catalog_size or args.products, args.products)
+    workdir = args.workdir or tempfile.mkdtemp(prefix='crawl_bench_')
+    os.makedirs(workdir, exist_ok=True)
+    run_root = os.path.join(workdir, 'images')
+
+    with FixtureShop(catalog_size, args.detail_images, latency_ms=args.latency_ms) as shop:
+        config_text = CONFIG_TEMPLATE.format(
+            product_count=args.products,
+            base_url=shop.base_url,
+            sample_url=shop.product_url(1),
+            run_root=run_root.replace('\\', '/'),
+            link_limit=catalog_size,
+            extra_options=format_options(args.option),
+        )
+        with open(os.path.join(workdir, 'config.py'), 'w', encoding='utf-8') as f:
+            f.write(config_text)
+
+        print(f"[BENCH] 로컬 쇼핑몰: {shop.gallery_url} (카탈로그 {catalog_size}개, 목표 {args.products}개)")
+        print(f"[BENCH] 결과 폴더: {workdir}")
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([workdir, REPO_ROOT]), PYTHONIOENCODING='utf-8')
+        start = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', workdir],
+            cwd=workdir, env=env,
+            stdout=subprocess.DEVNULL if args.quiet else None,
+        )
+        elapsed = time.perf_counter() - start
+        served = shop.stats()
+
+    run_folders = [os.path.join(run_root, name) for name in os.listdir(run_root)] if os.path.isdir(run_root) else []
+    spans = []
+    for folder in run_folders:
+        spans.extend(load_spans(os.path.join(folder, 'perf_spans.jsonl')))
+    products_ok = sum(1 for span in spans if span['stage'] == 'product_total' and span.get('success'))
+    attempted = sum(1 for span in spans if span['stage'] == 'product_total')
+    output_bytes = sum(folder_bytes(os.path.join(folder, sub)) for folder in run_folders for sub in ('cr', 'output'))
+
+    result = {
+        'exit_code': process.returncode,
+        'elapsed_s': round(elapsed, 2),
+        'products_ok': products_ok,
+        'products_attempted': attempted,
+        'products_per_s': round(products_ok / elapsed, 3) if elapsed else 0,
+        'requests_served': served['requests'],
+        'bytes_served': served['bytes'],
+        'output_image_bytes': output_bytes,
+        'stages': summarize_spans(spans),
+        'options': args.option,
+    }
+
+    print("=" * 70)
+    if process.returncode != 0:
+        print(f"[BENCH] 크롤러 비정상 종료 (exit {process.returncode}) - 위 출력 확인 (Playwright 설치 여부 등)")
+    print(f"[BENCH] 상품 {products_ok}/{attempted}개, {elapsed:.1f}초, {result['products_per_s']:.2f} 상품/초")
+    print(f"[BENCH] 서버 응답 {served['requests']}건 {served['bytes'] / (1024 * 1024):.1f}MB, "
+          f"결과 이미지 {output_bytes / (1024 * 1024):.1f}MB")
+    print("[BENCH] 단계별 상품당 시간 (ms): 상품수 / p50 / p90 / p99 / 합계")
+    for stage, stats in result['stages'].items():
+        print(f"[BENCH]   {stage:<17} {stats['count']:>5} / {stats['p50_ms']:.0f} / {stats['p90_ms']:.0f} / "
+              f"{stats['p99_ms']:.0f} / {stats['total_ms']:.0f}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"[BENCH] 결과 저장: {args.json}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
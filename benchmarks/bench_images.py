@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+이미지 처리 마이크로벤치마크
+
+utils/image_optimizer.py의 렌더링 작업(render_thumbnail_job, render_detail_job)을
+생성된 이미지 묶음에 반복 실행하여 단계별 시간과 최대 메모리를 출력한다. 네트워크는 쓰지 않는다.
+
+- download: 로컬(127.0.0.1) 서버에서 requests로 원본 받기
+- thumbnail_render: 썸네일 작업 전체 (= thumbnail_compose 합성 + thumbnail_encode 인코딩)
+- slice_render: 상세 작업 전체 (= detail_decode 디코딩 + detail_trim 여백 분석
+  + detail_stitch 결합/10등분 + detail_encode 조각 인코딩)
+
+단계 이름은 크롤링 실행의 perf_spans.jsonl(download/thumbnail_render/slice_render)과 같다.
+세부 단계는 image_optimizer의 encode_image/_decode_rgb와 whitespace_trim.find_content_segments
+호출 시간을 합산하고, 나머지를 합성(결합/분할) 시간으로 본다.
+
+메모리는 두 가지로 본다.
+- py_peak: tracemalloc 최대값 (파이썬 객체: 다운로드/인코딩 바이트 등)
+- rss_peak: 프로세스 최대 메모리 증가분 (Pillow 픽셀 버퍼 포함, tracemalloc에는 잡히지 않음)
+작업마다 새 프로세스에서 실행하여 rss_peak이 앞 작업의 영향을 받지 않게 한다.
+
+사용자 config.py는 import만 해도 결과 폴더를 지우므로 읽지 않는다.
+
+    python benchmarks/bench_images.py
+    python benchmarks/bench_images.py --case huge --case tall_slices --repeat 10
+    python benchmarks/bench_images.py --json before.json
+    python benchmarks/bench_images.py --compare before.json      # 느려진 단계가 있으면 exit 1
+    python benchmarks/bench_images.py --run-folder images/YYYYMMDDHHMM_kidgym --run-products 5
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+import requests  # noqa: E402
+from PIL import Image, ImageDraw  # noqa: E402
+
+from utils import image_optimizer, whitespace_trim  # noqa: E402
+from utils.source_store import load_manifest, read_source  # noqa: E402
+
+# 기본 이미지 묶음: (너비, 높이, 형식)
+CORPUS_CASES = {
+    'small': {'thumbnail': (320, 320, 'JPEG'), 'details': [(860, 600, 'JPEG')] * 2},
+    'typical': {'thumbnail': (1000, 1000, 'JPEG'), 'details': [(860, 2400, 'JPEG')] * 4},
+    'huge': {'thumbnail': (4000, 4000, 'JPEG'), 'details': [(3000, 9000, 'JPEG')] * 2},
+    'png_alpha': {'thumbnail': (800, 800, 'PNG'), 'details': [(900, 2000, 'PNG')] * 3},
+    'tall_slices': {'thumbnail': (600, 600, 'JPEG'), 'details': [(860, 3000, 'JPEG')] * 12},
+}
+JOBS = ('download', 'thumbnail', 'detail')
+JOB_STAGES = {
+    'download': ('download',),
+    'thumbnail': ('thumbnail_render', 'thumbnail_compose', 'thumbnail_encode'),
+    'detail': ('slice_render', 'detail_decode', 'detail_trim', 'detail_stitch', 'detail_encode'),
+}
+PRODUCT_NAME = "벤치마크 상품 테스트용 긴 이름-001"
+
+# 비교 시 이보다 작은 차이는 측정 오차로 보고 무시
+NOISE_MS = 2.0
+NOISE_BYTES = 5 * 1024 * 1024
+
+
+def make_image(width, height, image_format='JPEG', seed=0):
+    """색 블록/글자 줄/잡음이 섞인 상품 이미지 (같은 시드는 같은 바이트)"""
+    rng = random.Random(seed)
+    alpha = image_format == 'PNG'
+    img = Image.new('RGBA' if alpha else 'RGB', (width, height), (0, 0, 0, 0) if alpha else 'white')
+    draw = ImageDraw.Draw(img)
+    block = max(40, width // 8)
+    margin = height // 12  # 위/아래 흰 여백 (여백 제거 분석 대상)
+    for top in range(margin, height - margin, block):
+        for left in range(0, width, block):
+            box = [left, top, left + block - 4, min(top + block - 4, height - margin)]
+            color = (rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255), 255)
+            if rng.random() < 0.5:
+                draw.rectangle(box, fill=color)
+            elif rng.random() < 0.5:
+                draw.ellipse(box, fill=color)
+    for y in range(margin, height - margin, 28):
+        if rng.random() < 0.3:
+            draw.text((20, y), f"상세 설명 {seed}-{y} SIZE 120 x 80 cm", fill=(20, 20, 20, 255))
+    # 사진처럼 압축되도록 잡음 추가 (PNG는 투명도 유지)
+    noise = Image.effect_noise((width, height), 40).convert('RGB')
+    textured = Image.blend(img.convert('RGB'), noise, 0.12)
+    if alpha:
+        textured.putalpha(img.getchannel('A'))
+    buffer = io.BytesIO()
+    if image_format == 'JPEG':
+        textured.save(buffer, 'JPEG', quality=90)
+    else:
+        textured.save(buffer, image_format)
+    return buffer.getvalue()
+
+
+def build_corpus(case_names, seed=0):
+    """{이름: {'thumbnail': 바이트, 'details': [바이트, ...]}} 생성"""
+    corpus = {}
+    for case_index, name in enumerate(case_names):
+        spec = CORPUS_CASES[name]
+        base = seed * 1000 + case_index * 100
+        corpus[name] = {
+            'thumbnail': make_image(*spec['thumbnail'], seed=base),
+            'details': [make_image(*size, seed=base + index + 1) for index, size in enumerate(spec['details'])],
+        }
+    return corpus
+
+
+def write_corpus(corpus, directory):
+    """묶음을 파일로 저장, 같은 구조의 경로 목록 반환 (측정 프로세스는 파일로 읽음)"""
+    paths = {}
+    for name, images in corpus.items():
+        paths[name] = {'thumbnail': None, 'details': []}
+        for index, body in enumerate([images['thumbnail']] + images['details']):
+            if body is None:
+                continue
+            path = os.path.join(directory, f"{name}_{index:03}.img")
+            with open(path, 'wb') as f:
+                f.write(body)
+            if index == 0:
+                paths[name]['thumbnail'] = path
+            else:
+                paths[name]['details'].append(path)
+    return paths
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def load_run_corpus(run_folder, limit):
+    """실행 폴더 src/에 보관된 실제 원본을 상품별 묶음으로 읽기 (KEEP_SOURCE_IMAGES)"""
+    corpus = {}
+    for image_counter, entry in sorted(load_manifest(run_folder).items())[:limit]:
+        corpus[f"run_{image_counter:03}"] = {
+            'thumbnail': read_source(run_folder, entry['thumbnail']) if entry.get('thumbnail') else None,
+            'details': [read_source(run_folder, path) for _, path in entry.get('details', [])],
+        }
+    return corpus
+
+
+class CorpusServer:
+    """이미지 묶음을 로컬 주소로 제공 (download 단계용)"""
+
+    def __init__(self, corpus):
+        self.files = {}
+        for name, images in corpus.items():
+            if images['thumbnail']:
+                self.files[f"/{name}/thumbnail"] = images['thumbnail']
+            for index, body in enumerate(images['details']):
+                self.files[f"/{name}/detail_{index}"] = body
+        files = self.files
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                body = files.get(self.path)
+                self.send_response(200 if body is not None else 404)
+                self.send_header('Content-Type', 'application/octet-stream')
+                self.send_header('Content-Length', str(len(body or b'')))
+                self.end_headers()
+                self.wfile.write(body or b'')
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def urls(self, name):
+        host, port = self.server.server_address
+        return [f"http://{host}:{port}{path}" for path in self.files if path.startswith(f"/{name}/")]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def peak_rss_bytes():
+    """현재 프로세스의 최대 메모리 (측정할 수 없으면 None)"""
+    # Linux의 ru_maxrss는 exec 후에도 fork한 부모 값이 남으므로 /proc의 VmHWM 사용
+    if os.path.exists('/proc/self/status'):
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024  # macOS는 bytes, 그 외는 KB 단위
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage', 'QuotaPagedPoolUsage',
+                    'QuotaPeakNonPagedPoolUsage', 'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage')]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+    return None
+
+
+# ===================== 작업 실행 (측정 프로세스) =====================
+_call_seconds = {}
+_timers_installed = False
+
+
+def _timed(name, func):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _call_seconds[name] = _call_seconds.get(name, 0.0) + time.perf_counter() - start
+    return wrapper
+
+
+def _install_timers():
+    """세부 단계 시간 합산용으로 인코딩/디코딩/여백 분석 함수를 감쌈 (측정 프로세스 안에서만)"""
+    global _timers_installed
+    if _timers_installed:
+        return
+    image_optimizer.encode_image = _timed('encode', image_optimizer.encode_image)
+    image_optimizer._decode_rgb = _timed('decode', image_optimizer._decode_rgb)
+    whitespace_trim.find_content_segments = _timed('trim', whitespace_trim.find_content_segments)
+    _timers_installed = True
+
+
+def _run_once(job, payload, work_dir, options):
+    """작업 1회 실행, {단계: 초} 반환"""
+    _call_seconds.clear()
+    start = time.perf_counter()
+    if job == 'download':
+        with requests.Session() as session:
+            for url in payload:
+                response = session.get(url, timeout=30)
+                response.raise_for_status()
+                _ = response.content
+        return {'download': time.perf_counter() - start}
+
+    if job == 'thumbnail':
+        result = image_optimizer.render_thumbnail_job(payload, 1, PRODUCT_NAME, work_dir, None, options['encoder'])
+        total = time.perf_counter() - start
+        encode = _call_seconds.get('encode', 0.0)
+        stages = {'thumbnail_render': total, 'thumbnail_compose': total - encode, 'thumbnail_encode': encode}
+    else:
+        sources = list(enumerate(payload))
+        result = image_optimizer.render_detail_job(sources, 1, work_dir, None, options['encoder'], options['trim'])
+        total = time.perf_counter() - start
+        decode, trim, encode = (_call_seconds.get(name, 0.0) for name in ('decode', 'trim', 'encode'))
+        stages = {'slice_render': total, 'detail_decode': decode, 'detail_trim': trim,
+                  'detail_stitch': total - decode - trim - encode, 'detail_encode': encode}
+        if options['trim'] is None:
+            del stages['detail_trim']
+    if not result.get('success'):
+        raise RuntimeError(f"{job} 작업 실패")
+    return stages
+
+
+def run_job(job, inputs, options):
+    """측정 프로세스에서 작업 반복 실행 (inputs: download는 URL 목록, 그 외는 파일 경로)
+
+    첫 실행(준비: 폰트/템플릿 캐시, 연결)은 시간에서 빼고 최대 메모리 증가분 측정에만 쓰며,
+    tracemalloc은 시간 측정을 느리게 하므로 마지막에 한 번 더 실행하여 따로 잰다.
+    원본은 프로세스 간 전달(pickle) 대신 파일에서 읽는다 (전달 중 생긴 임시 복사본이
+    작업보다 큰 최대 메모리를 먼저 남기면 rss_peak 증가분이 측정되지 않음).
+    """
+    _install_timers()
+    if job == 'thumbnail':
+        payload = _read(inputs)
+    elif job == 'detail':
+        payload = [_read(path) for path in inputs]
+    else:
+        payload = inputs
+    work_dir = tempfile.mkdtemp(prefix='bench_images_')
+    output = contextlib.nullcontext() if options['verbose'] else contextlib.redirect_stdout(io.StringIO())
+    try:
+        with output:
+            rss_before = peak_rss_bytes()
+            _run_once(job, payload, work_dir, options)
+            rss_after = peak_rss_bytes()
+
+            samples = {}
+            for _ in range(options['repeat']):
+                for stage, seconds in _run_once(job, payload, work_dir, options).items():
+                    samples.setdefault(stage, []).append(seconds)
+
+            tracemalloc.start()
+            try:
+                _run_once(job, payload, work_dir, options)
+                _, py_peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    rss_peak = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+    return {'samples': samples, 'py_peak': py_peak, 'rss_peak': rss_peak}
+
+
+# ===================== 실행/요약 =====================
+def parse_args():
+    parser = argparse.ArgumentParser(description="이미지 다운로드/썸네일/상세 조각 처리 마이크로벤치마크")
+    parser.add_argument('--case', action='append', choices=sorted(CORPUS_CASES),
+                        help="실행할 이미지 묶음 (여러 번 사용 가능, 기본: 전체)")
+    parser.add_argument('--only', choices=JOBS, action='append', help="실행할 작업 (여러 번 사용 가능, 기본: 전체)")
+    parser.add_argument('--repeat', type=int, default=5, help="작업별 측정 반복 횟수 (준비 실행 제외)")
+    parser.add_argument('--seed', type=int, default=0, help="이미지 생성 시드")
+    parser.add_argument('--run-folder', help="main.py 실행 폴더 (src/에 보관된 실제 원본도 측정)")
+    parser.add_argument('--run-products', type=int, default=3, help="--run-folder에서 측정할 상품 수")
+    parser.add_argument('--format', choices=['jpeg', 'webp'], help="결과 형식 (기본: JPEG)")
+    parser.add_argument('--optimize', action='store_true', help="JPEG 허프만 테이블 최적화")
+    parser.add_argument('--progressive', action='store_true', help="프로그레시브 JPEG")
+    parser.add_argument('--slice-target-bytes', type=int, help="상세 조각 1장 목표 용량 (bytes)")
+    parser.add_argument('--trim', action='store_true', help="상세이미지 여백 제거 포함 (NumPy 필요)")
+    parser.add_argument('--in-process', action='store_true',
+                        help="작업마다 새 프로세스를 쓰지 않음 (빠르지만 rss_peak 측정 안 함)")
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일")
+    parser.add_argument('--compare', help="이전 --json 결과와 비교 (느려지거나 메모리가 늘면 exit 1)")
+    parser.add_argument('--threshold', type=float, default=0.2, help="비교 시 회귀로 볼 증가율 (기본 0.2 = 20%%)")
+    parser.add_argument('--verbose', action='store_true', help="렌더링 작업 출력 표시")
+    return parser.parse_args()
+
+
+def summarize(measured):
+    """반복 측정값을 단계별 ms 요약으로 변환 (작업 전체 단계에 메모리 포함)"""
+    summary = {}
+    for job, result in measured.items():
+        for stage in JOB_STAGES[job]:
+            values = result['samples'].get(stage)
+            if not values:
+                continue
+            summary[stage] = {
+                'median_ms': round(statistics.median(values) * 1000, 2),
+                'min_ms': round(min(values) * 1000, 2),
+                'max_ms': round(max(values) * 1000, 2),
+            }
+        total_stage = JOB_STAGES[job][0]
+        if total_stage in summary:
+            summary[total_stage]['py_peak_bytes'] = result['py_peak']
+            summary[total_stage]['rss_peak_bytes'] = result['rss_peak']
+    return summary
+
+
+def format_mb(value):
+    return "-" if value is None else f"{value / (1024 * 1024):.1f}"
+
+
+def print_results(results):
+    print("[BENCH] 단계별 시간 (ms): 중앙값 / 최소 / 최대, 메모리 (MB): py_peak / rss_peak")
+    for case, stages in results.items():
+        print(f"[BENCH] {case}")
+        for stage, stats in stages.items():
+            line = (f"[BENCH]   {stage:<17} {stats['median_ms']:>9.1f} / {stats['min_ms']:>9.1f} / "
+                    f"{stats['max_ms']:>9.1f}")
+            if 'py_peak_bytes' in stats:
+                line += f"   {format_mb(stats['py_peak_bytes'])} / {format_mb(stats['rss_peak_bytes'])}"
+            print(line)
+
+
+def compare_results(results, baseline, threshold):
+    """이전 결과 대비 증가율이 threshold를 넘는 (묶음, 단계) 목록"""
+    regressions = []
+    for case, stages in results.items():
+        for stage, stats in stages.items():
+            before = baseline.get(case, {}).get(stage)
+            if not before:
+                continue
+            checks = [('median_ms', NOISE_MS, 'ms'), ('py_peak_bytes', NOISE_BYTES, 'B'), ('rss_peak_bytes', NOISE_BYTES, 'B')]
+            for key, noise, unit in checks:
+                old, new = before.get(key), stats.get(key)
+                if old is None or new is None:
+                    continue
+                if new - old > max(old * threshold, noise):
+                    change = f"+{(new - old) / old * 100:.0f}%" if old else "new"
+                    regressions.append(f"{case} {stage} {key}: {old:.1f}{unit} -> {new:.1f}{unit} ({change})")
+    return regressions
+
+
+def main():
+    args = parse_args()
+    case_names = args.case or list(CORPUS_CASES)
+    jobs = [job for job in JOBS if not args.only or job in args.only]
+    options = {
+        'repeat': max(1, args.repeat),
+        'verbose': args.verbose,
+        'trim': {} if args.trim else None,
+        'encoder': image_optimizer.resolve_encoder({
+            'format': args.format,
+            'optimize': args.optimize,
+            'progressive': args.progressive,
+            'slice_target_bytes': args.slice_target_bytes,
+        }),
+    }
+    if options['trim'] is not None and not whitespace_trim.is_available():
+        print("[WARNING] NumPy가 없어 여백 제거 없이 측정")
+        options['trim'] = None
+
+    start = time.perf_counter()
+    corpus = build_corpus(case_names, args.seed)
+    if args.run_folder:
+        corpus.update(load_run_corpus(args.run_folder.rstrip('/\\'), args.run_products))
+    print(f"[BENCH] 이미지 묶음 {len(corpus)}개 준비: {time.perf_counter() - start:.1f}초")
+
+    server = CorpusServer(corpus) if 'download' in jobs else None
+    corpus_dir = tempfile.mkdtemp(prefix='bench_corpus_')
+    # 작업마다 새 프로세스 (spawn: 부모의 이미지 생성 메모리를 물려받지 않음)
+    spawn = multiprocessing.get_context('spawn')
+    results = {}
+    try:
+        for case, paths in write_corpus(corpus, corpus_dir).items():
+            payloads = {
+                'download': server.urls(case) if server else None,
+                'thumbnail': paths['thumbnail'],
+                'detail': paths['details'],
+            }
+            measured = {}
+            for job in jobs:
+                if not payloads[job]:
+                    continue
+                if args.in_process:
+                    measured[job] = run_job(job, payloads[job], options)
+                    measured[job]['rss_peak'] = None
+                else:
+                    with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as executor:
+                        measured[job] = executor.submit(run_job, job, payloads[job], options).result()
+            results[case] = summarize(measured)
+            print(f"[BENCH] {case} 측정 완료")
+    finally:
+        if server is not None:
+            server.close()
+        shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    print("=" * 70)
+    print_results(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'options': vars(args), 'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"[BENCH] 결과 저장: {args.json}")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"[BENCH] 이전 결과 대비 회귀 {len(regressions)}건 (기준 +{args.threshold * 100:.0f}%):")
+            for line in regressions:
+                print(f"[BENCH]   {line}")
+            sys.exit(1)
+        print(f"[BENCH] 이전 결과 대비 회귀 없음 ({args.compare})")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+벤치마크용 로컬 쇼핑몰 (Cafe24 형식)
+
+실제 사이트(kidgymb2b.co.kr) 대신 크롤러 성능을 반복 측정하기 위한 로컬 HTTP 서버.
+상품 수를 지정하면 같은 시드로 항상 같은 카탈로그를 만든다.
+- 갤러리: /product/list.html?cate_no=1&page=N (ul.prdList, 상품 링크 /product/detail.html?product_no=N)
+- 상품 상세: og:title, 가격, 선택옵션(select), 대표 이미지(.viewImgWrap), lazy loading 상세이미지(#prdDetail)
+- 이미지: 상품마다 다른 JPEG를 요청 시 생성 (상세이미지 너비 860px, 공통 안내 이미지 1개 포함)
+
+단독 실행하면 서버만 띄운다 (config.py의 주소를 바꿔 수동 테스트할 때 사용):
+    python benchmarks/fixture_shop.py --products 200 --port 8765
+"""
+
+import argparse
+import io
+import random
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from PIL import Image, ImageDraw
+
+SHOP_NAME = "벤치마크샵"
+OPTION_NAMES = ["블루", "레드", "그린", "옐로우", "블랙", "화이트"]
+DETAIL_WIDTH = 860
+COMMON_IMAGE_PATH = "/web/product/extra/common_size_chart.jpg"
+
+GALLERY_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>{shop} - 전체상품</title></head>
+<body>
+<div id="header"><a href="/"><img src="/web/upload/logo.png" alt="logo"></a></div>
+<div class="xans-product-listnormal">
+<ul class="prdList grid4">
+{items}
+</ul>
+</div>
+<div class="xans-product-normalpaging">{paging}</div>
+</body></html>
+"""
+
+GALLERY_ITEM_TEMPLATE = """<li id="anchorBoxId_{no}" class="xans-record-">
+<div class="thumbnail"><a href="/product/detail.html?product_no={no}&cate_no=1&display_group=1"><img src="/web/product/medium/{no}.jpg" alt="{name}"></a></div>
+<div class="description"><strong class="name"><a href="/product/detail.html?product_no={no}&cate_no=1&display_group=1"><span>{name}</span></a></strong>
+<ul class="spec"><li><span>{price_text}원</span></li></ul></div>
+</li>"""
+
+DETAIL_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8">
+<title>{name} - {shop}</title>
+<meta property="og:title" content="{name} - {shop}">
+<meta property="og:image" content="/web/product/big/{no}.jpg">
+</head>
+<body>
+<div id="header"><a href="/"><img src="/web/upload/logo.png" alt="logo"></a></div>
+<div class="xans-product-detail">
+<div class="detailArea">
+<div class="imgArea"><div class="viewImgWrap"><img src="/web/product/big/{no}.jpg" class="BigImage" alt="{name}"></div></div>
+<div class="infoArea">
+<h2 class="name">{name}</h2>
+<table><tr><th>판매가</th><td><strong id="span_product_price_text" class="price">{price_text}원</strong></td></tr></table>
+<table class="xans-product-option"><tr><th>옵션</th><td>
+<select id="product_option_id1" name="option1" class="ProductOption0">
+<option value="*">- [필수] 옵션을 선택해 주세요 -</option>
+<option value="**">-------------------</option>
+{options}
+</select></td></tr></table>
+</div>
+</div>
+<div id="prdDetail"><div class="cont">
+{detail_images}
+</div></div>
+</div>
+<script>
+document.addEventListener('DOMContentLoaded', function () {{
+  var observer = new IntersectionObserver(function (entries) {{
+    entries.forEach(function (entry) {{
+      if (entry.isIntersecting) {{
+        entry.target.src = entry.target.getAttribute('data-src');
+        observer.unobserve(entry.target);
+      }}
+    }});
+  }});
+  document.querySelectorAll('img[data-src]').forEach(function (img) {{ observer.observe(img); }});
+}});
+</script>
+</body></html>
+"""
+
+# 1x1 투명 GIF (lazy loading 자리표시 이미지)
+BLANK_GIF = bytes.fromhex("47494638396101000100800000000000ffffff21f90401000000002c00000000010001000002024401003b")
+
+
+def product_name(product_no):
+    return f"[벤치] 테스트 상품 {product_no:05d}"
+
+
+def product_price(product_no):
+    return 10000 + (product_no * 7919) % 90 * 1000
+
+
+@lru_cache(maxsize=256)
+def render_jpeg(kind, product_no, index, width, height):
+    """시드가 고정된 상품별 이미지 (지각 해시가 서로 다르도록 도형 배치를 상품마다 다르게)"""
+    rng = random.Random(f"{kind}:{product_no}:{index}")
+    image = Image.new('RGB', (width, height), (255, 255, 255))
+    draw = ImageDraw.Draw(image)
+    for _ in range(12):
+        x0 = rng.randrange(0, width - 40)
+        y0 = rng.randrange(0, height - 40)
+        x1 = min(width, x0 + rng.randrange(40, width // 2))
+        y1 = min(height, y0 + rng.randrange(40, height // 3))
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        if rng.random() < 0.5:
+            draw.rectangle((x0, y0, x1, y1), fill=color)
+        else:
+            draw.ellipse((x0, y0, x1, y1), fill=color)
+    draw.text((20, 20), f"{kind} {product_no} {index}", fill=(0, 0, 0))
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=85)
+    return buffer.getvalue()
+
+
+class FixtureShop:
+    """생성된 카탈로그를 제공하는 로컬 HTTP 서버 (별도 스레드)"""
+
+    def __init__(self, product_count=50, detail_images=4, page_size=None, latency_ms=0,
+                 common_image=True, host='127.0.0.1', port=0):
+        self.product_count = product_count
+        self.detail_images = detail_images
+        self.page_size = page_size or product_count  # 기본: 1페이지에 전체 상품
+        self.latency = latency_ms / 1000
+        self.common_image = common_image
+        self.host = host
+        self.port = port
+        self.server = None
+        self.thread = None
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.bytes_sent = 0
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def gallery_url(self):
+        return f"{self.base_url}/product/list.html?cate_no=1&page=1"
+
+    def product_url(self, product_no):
+        return f"{self.base_url}/product/detail.html?product_no={product_no}&cate_no=1&display_group=1"
+
+    def start(self):
+        shop = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                shop._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, name='fixture-shop', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self):
+        with self.lock:
+            return {'requests': self.requests, 'bytes': self.bytes_sent}
+
+    # ---------- 응답 생성 ----------
+
+    def _handle(self, handler):
+        if self.latency:
+            time.sleep(self.latency)
+        parts = urlsplit(handler.path)
+        query = parse_qs(parts.query)
+        path = parts.path
+        try:
+            if path in ('/', '/index.html'):
+                body, content_type = self._gallery_page(1), 'text/html; charset=utf-8'
+            elif path == '/product/list.html':
+                body, content_type = self._gallery_page(int(query.get('page', ['1'])[0])), 'text/html; charset=utf-8'
+            elif path == '/product/detail.html':
+                body, content_type = self._detail_page(int(query['product_no'][0])), 'text/html; charset=utf-8'
+            elif path.endswith('.jpg') or path.endswith('.gif') or path.endswith('.png'):
+                body, content_type = self._image(path)
+            else:
+                body = None
+        except (KeyError, ValueError):
+            body = None
+        if body is None:
+            handler.send_error(404)
+            return
+        handler.send_response(200)
+        handler.send_header('Content-Type', content_type)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.send_header('Cache-Control', 'max-age=3600')
+        handler.end_headers()
+        handler.wfile.write(body)
+        with self.lock:
+            self.requests += 1
+            self.bytes_sent += len(body)
+
+    def _gallery_page(self, page):
+        first = (page - 1) * self.page_size + 1
+        last = min(self.product_count, first + self.page_size - 1)
+        if first > last:
+            return None
+        items = "\n".join(
+            GALLERY_ITEM_TEMPLATE.format(no=no, name=product_name(no), price_text=f"{product_price(no):,}")
+            for no in range(first, last + 1)
+        )
+        pages = (self.product_count + self.page_size - 1) // self.page_size
+        paging = " ".join(f'<a href="/product/list.html?cate_no=1&page={n}">{n}</a>' for n in range(1, min(pages, 10) + 1))
+        return GALLERY_TEMPLATE.format(shop=SHOP_NAME, items=items, paging=paging).encode('utf-8')
+
+    def _detail_page(self, product_no):
+        if not 1 <= product_no <= self.product_count:
+            return None
+        rng = random.Random(product_no)
+        options = "\n".join(
+            f'<option value="P{product_no:05d}{i}">{name}</option>'
+            for i, name in enumerate(rng.sample(OPTION_NAMES, rng.randrange(1, 4)))
+        )
+        images = [
+            f'<img src="/web/upload/blank.gif" data-src="/web/product/extra/detail/{product_no}_{i}.jpg" alt="">'
+            for i in range(1, self.detail_images + 1)
+        ]
+        if self.common_image:
+            images.append(f'<img src="/web/upload/blank.gif" data-src="{COMMON_IMAGE_PATH}" alt="">')
+        return DETAIL_TEMPLATE.format(
+            shop=SHOP_NAME, no=product_no, name=product_name(product_no),
+            price_text=f"{product_price(product_no):,}", options=options, detail_images="\n".join(images)
+        ).encode('utf-8')
+
+    def _image(self, path):
+        if path == '/web/upload/blank.gif':
+            return BLANK_GIF, 'image/gif'
+        if path == '/web/upload/logo.png':
+            buffer = io.BytesIO()
+            Image.new('RGB', (120, 40), (30, 30, 30)).save(buffer, 'PNG')
+            return buffer.getvalue(), 'image/png'
+        if path == COMMON_IMAGE_PATH:
+            return render_jpeg('common', 0, 0, DETAIL_WIDTH, 900), 'image/jpeg'
+        name = path.rsplit('/', 1)[-1][:-len('.jpg')]
+        if path.startswith('/web/product/medium/'):
+            return render_jpeg('list', int(name), 0, 300, 300), 'image/jpeg'
+        if path.startswith('/web/product/big/'):
+            return render_jpeg('big', int(name), 0, 800, 800), 'image/jpeg'
+        if path.startswith('/web/product/extra/detail/'):
+            product_no, index = (int(value) for value in name.split('_'))
+            if not 1 <= product_no <= self.product_count or not 1 <= index <= self.detail_images:
+                return None, None
+            height = random.Random(f"height:{product_no}:{index}").randrange(1200, 2000)
+            return render_jpeg('detail', product_no, index, DETAIL_WIDTH, height), 'image/jpeg'
+        return None, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 로컬 쇼핑몰 서버")
+    parser.add_argument('--products', type=int, default=50, help="상품 수")
+    parser.add_argument('--detail-images', type=int, default=4, help="상품당 상세이미지 수")
+    parser.add_argument('--page-size', type=int, help="갤러리 페이지당 상품 수 (기본: 전체)")
+    parser.add_argument('--latency-ms', type=int, default=0, help="요청마다 추가할 지연 (ms)")
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    shop = FixtureShop(args.products, args.detail_images, args.page_size, args.latency_ms, port=args.port).start()
+    print(f"[FIXTURE] 로컬 쇼핑몰 실행 중: {shop.gallery_url} (상품 {args.products}개, Ctrl+C로 종료)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shop.stop()
+        print(f"[FIXTURE] 종료: {shop.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 상품 페이지 직접 분석 및 정확한 선택자 탐지 (범용 버전)
 """
 import asyncio
+import logging
 import traceback
 from playwright.async_api import async_playwright
 from config import *
@@ -12,12 +13,37 @@ from datetime import datetime
 from smart_detector_final import SmartDetector
 import urllib.request
 import urllib.error
-from PIL import Image
+from PIL import Image, ImageFile
 import io
 import requests
 from concurrent.futures import ThreadPoolExecutor
 from threading import Lock
 import hashlib
+import os
+from utils.image_dedup import PerceptualHashIndex
+from utils.image_filter_cache import RejectedImageCache
+from utils.options import get_option
+from utils.perf_trace import PerfTracer
+from utils.har_archive import create_har_session
+import time
+
+logger = logging.getLogger(__name__)
+
+# 상세이미지 파일 크기 기준 (HTTP 헤더/브라우저 Resource Timing 공통)
+MIN_DETAIL_IMAGE_BYTES = 5120  # 5KB (키드짐 특화: 기존 10KB에서 완화)
+MAX_DETAIL_IMAGE_BYTES = 10485760  # 10MB
+
+# 브라우저가 받은 이미지 본문 크기 (Resource Timing, 기록이 없거나 교차 출처 제한이면 0)
+RESOURCE_SIZE_JS = """
+    const resourceSize = (url) => {
+        const entries = url ? performance.getEntriesByName(url) : [];
+        for (let i = entries.length - 1; i >= 0; i--) {
+            const size = entries[i].encodedBodySize || entries[i].transferSize;
+            if (size) return size;
+        }
+        return 0;
+    };
+"""
 
 
 class FinalAnalyzer:
@@ -26,16 +52,58 @@ class FinalAnalyzer:
         self.smart_detector = SmartDetector()
         self.selectors = {}
         self.test_data = []
-        # 중복 이미지 추적을 위한 해시 집합
-        self.image_hashes = set()
+        # 상품 간 반복되는 공통 이미지 추적을 위한 지각 해시 인덱스 (사이트별 저장)
+        self.image_hashes = PerceptualHashIndex(
+            min_products=get_option('IMAGE_DEDUP_MIN_PRODUCTS', 3),
+            max_hashes=get_option('IMAGE_DEDUP_MAX_HASHES', 2000),
+            max_urls=get_option('IMAGE_DEDUP_MAX_URLS', 5000),
+            index_path=os.path.join(os.path.dirname(base_path), '_cache', f'phash_{SITE_NAME}.json')
+        ) if get_option('IMAGE_DEDUP', True) else None
+        # 반복 거부되는 이미지(로딩 스피너, 안내 배너, 아이콘) 네거티브 캐시 (사이트별 저장)
+        self.rejected_images = RejectedImageCache(
+            min_rejections=get_option('REJECTED_PATTERN_MIN_COUNT', 8),
+            probe_interval=get_option('REJECTED_PATTERN_PROBE_INTERVAL', 10),
+            ttl_days=get_option('REJECTED_CACHE_TTL_DAYS', 7),
+            max_urls=get_option('REJECTED_URL_LIMIT', 5000),
+            index_path=os.path.join(os.path.dirname(base_path), '_cache', f'rejected_{SITE_NAME}.json')
+        ) if get_option('IMAGE_REJECT_CACHE', True) else None
         # 성능 최적화 관련 속성
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
         self.verified_images_cache = {}  # URL -> (valid, file_size) 캐시
+        # 상품별 단계 시간 측정 (PERF_TRACE = False면 파일 없이 요약만)
+        self.perf = PerfTracer(
+            os.path.join(base_path, 'perf_spans.jsonl') if get_option('PERF_TRACE', True) else None
+        )
         self.cache_lock = Lock()
         self.max_workers = 4
+        # 갤러리에서 수집할 상품 링크 수 (기본 10개, 벤치마크 등 대량 실행 시 config.py에서 조정)
+        self.max_product_links = get_option('MAX_PRODUCT_LINKS', 10)
+        # HAR 기록/재생 (config.py의 HAR_MODE가 있을 때만, 이미지 검증 요청도 같은 세션 사용)
+        self.har = create_har_session(base_path, SITE_NAME)
+        if self.har is not None:
+            self.har.mount(self.session)
+    
+    async def _new_context(self, browser):
+        """브라우저 컨텍스트 생성 (HAR 기록/재생 적용)"""
+        options = {'user_agent': "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36"}
+        if self.har is not None:
+            options.update(self.har.context_options())
+        context = await browser.new_context(**options)
+        if self.har is not None:
+            await self.har.attach(context)
+        return context
+    
+    async def _close_context(self, context):
+        """컨텍스트 종료 (HAR 기록은 컨텍스트를 닫을 때 저장됨)"""
+        try:
+            await context.close()
+        except Exception as e:
+            print(f"[WARNING] 브라우저 컨텍스트 종료 실패: {e}")
+        if self.har is not None:
+            self.har.close()
     
     async def _detect_product_link_selector(self, page):
         """상품 갤러리에서 상품 링크 a 태그의 선택자를 동적으로 탐지"""
@@ -62,7 +130,7 @@ class FinalAnalyzer:
         print("[ANALYZER] 최종 상품 분석기 시작...")
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=False)
-            context = await browser.new_context(user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36")
+            context = await self._new_context(browser)
             page = await context.new_page()
             try:
                 # 로그인
@@ -104,6 +172,7 @@ class FinalAnalyzer:
                 # 결과 저장
                 self._save_result()
             finally:
+                await self._close_context(context)
                 await browser.close()
     
     async def _get_test_links(self, page, product_link_selector=None):
@@ -118,7 +187,8 @@ class FinalAnalyzer:
                     return links.map(link => link.href).filter(href => href);
                 }}
             ''')
-            unique_links = list(set(links))[:10]
+            # 페이지 순서 유지 (실행마다 같은 링크를 골라야 HAR 재생 결과가 같음)
+            unique_links = list(dict.fromkeys(links))[:self.max_product_links]
             return unique_links
             
         except Exception as e:
@@ -250,8 +320,11 @@ class FinalAnalyzer:
     async def _extract_single_product(self, page, url):
         """단일 상품 데이터 추출"""
         try:
-            await page.goto(url, timeout=30000)
-            await page.wait_for_load_state("networkidle", timeout=15000)
+            with self.perf.span('navigation', url=url):
+                await page.goto(url, timeout=30000)
+            with self.perf.span('ready_wait', kind='networkidle'):
+                await page.wait_for_load_state("networkidle", timeout=15000)
+            extraction_start = time.perf_counter()
             
             data = {'url': url}
             
@@ -424,21 +497,24 @@ class FinalAnalyzer:
             else:
                 data['썸네일'] = None
             
+            self.perf.record('extraction', time.perf_counter() - extraction_start, part='fields')
+            
             # 상세페이지 이미지
             if self.selectors.get('상세페이지'):
                 try:
-                    print(f"[DEBUG] 상세페이지 이미지 추출 시작...")
-                    print(f"[DEBUG] 사용할 선택자: {self.selectors['상세페이지']}")
+                    logger.debug("상세페이지 이미지 추출 시작...")
+                    logger.debug("사용할 선택자: %s", self.selectors['상세페이지'])
                     
                     # lazy loading을 위한 단계적 스크롤
-                    print("[DEBUG] 페이지 스크롤 시작...")
+                    logger.debug("페이지 스크롤 시작...")
                     scroll_steps = [0, 0.25, 0.5, 0.75, 1.0]
-                    for step in scroll_steps:
-                        await page.evaluate(f"window.scrollTo(0, document.body.scrollHeight * {step})")
-                        await page.wait_for_timeout(800)  # 키드짐 특화: 대기시간 증가 (lazy loading 대응)
-                    
-                    # 이미지 로드 완료 대기 추가
-                    await page.wait_for_timeout(1000)
+                    with self.perf.span('ready_wait', kind='lazy_scroll'):
+                        for step in scroll_steps:
+                            await page.evaluate(f"window.scrollTo(0, document.body.scrollHeight * {step})")
+                            await page.wait_for_timeout(800)  # 키드짐 특화: 대기시간 증가 (lazy loading 대응)
+                        
+                        # 이미지 로드 완료 대기 추가
+                        await page.wait_for_timeout(1000)
                     
                     # 키드짐 특화 선택자를 우선순위로 배치
                     selectors_to_try = [
@@ -465,40 +541,63 @@ class FinalAnalyzer:
                     detail_images = []
                     for selector in selectors_to_try:
                         try:
-                            print(f"[DEBUG] 선택자 시도: {selector}")
-                            images = await page.query_selector_all(selector)
-                            print(f"[DEBUG] 찾은 이미지 수: {len(images)}")
+                            logger.debug("선택자 시도: %s", selector)
+                            # 후보 이미지의 URL/실제 크기/디코딩 상태를 한 번의 evaluate로 수집
+                            with self.perf.span('extraction', part='image_candidates'):
+                                image_states = await self._collect_image_states(page, selector)
+                            logger.debug("찾은 이미지 수: %s", len(image_states))
+                            thumbnail_url = data.get('썸네일', '')
                             
-                            for img in images:
-                                src = await img.get_attribute('src')
-                                data_src = await img.get_attribute('data-src')
-                                data_original = await img.get_attribute('data-original')
-                                best_url = data_original or data_src or src
+                            candidates = []
+                            for state in image_states:
+                                # URL 정규화
+                                normalized_url = self._normalize_url(state.get('src'), page.url)
+                                if not normalized_url or normalized_url == thumbnail_url:
+                                    continue
                                 
-                                if best_url:
-                                    # URL 정규화
-                                    normalized_url = self._normalize_url(best_url, page.url)
-                                    # 썸네일 URL과 동일한지 확인
-                                    thumbnail_url = data.get('썸네일', '')
-                                    
-                                    # 유효성 검사 및 중복 체크 (Playwright fallback 지원)
-                                    if (normalized_url and 
-                                        await self._is_valid_detail_image(normalized_url, page) and 
-                                        normalized_url not in detail_images and
-                                        normalized_url != thumbnail_url):
-                                        detail_images.append(normalized_url)
-                                        print(f"[DEBUG] 유효한 상세 이미지 추가: {normalized_url}")
+                                # 학습된 공통 이미지/이전에 거부된 이미지는 검증 요청 없이 제외
+                                if self.image_hashes is not None and self.image_hashes.is_boilerplate_url(normalized_url):
+                                    continue
+                                if self.rejected_images is not None and self.rejected_images.check(normalized_url):
+                                    continue
+                                
+                                # 브라우저가 해당 URL을 이미 디코딩한 경우에만 실제 크기 사용
+                                # (lazy loading 자리표시 이미지의 크기를 잘못 쓰지 않도록 currentSrc 비교)
+                                image_info = None
+                                if state.get('loaded') and state.get('current_src') == normalized_url:
+                                    image_info = state
+                                candidates.append((normalized_url, image_info))
+                            
+                            validation_start = time.perf_counter()
+                            # 아직 로드되지 않은 이미지는 브라우저에서 한 번에 병렬 로드
+                            pending_urls = [url for url, info in candidates if info is None and self._passes_image_url_filters(url, verbose=False)]
+                            browser_infos = await self._load_images_in_browser(page, pending_urls) if pending_urls else {}
+                            
+                            for normalized_url, image_info in candidates:
+                                if normalized_url in detail_images:
+                                    continue
+                                image_info = image_info or browser_infos.get(normalized_url)
+                                # 브라우저 일괄 로드에서 이미 실패한 이미지는 403 대응 재로드 생략
+                                browser_failed = image_info is None and normalized_url in pending_urls
+                                
+                                # 유효성 검사 (브라우저 크기 우선, 로드 실패 이미지만 HTTP 검증)
+                                if await self._is_valid_detail_image(normalized_url, page, image_info, browser_failed):
+                                    detail_images.append(normalized_url)
+                                    logger.debug("유효한 상세 이미지 추가: %s", normalized_url)
+                            self.perf.record('image_validation', time.perf_counter() - validation_start,
+                                             selector=selector, candidates=len(candidates), browser_loaded=len(pending_urls))
                             
                             # 유효한 이미지를 찾았으면 다음 선택자는 시도하지 않음
                             if detail_images:
-                                print(f"[DEBUG] {selector} 선택자로 {len(detail_images)}개 이미지 찾음")
+                                logger.debug("%s 선택자로 %s개 이미지 찾음", selector, len(detail_images))
                                 break
                                 
                         except Exception as e:
-                            print(f"[DEBUG] {selector} 선택자 오류: {e}")
+                            logger.debug("%s 선택자 오류: %s", selector, e)
                         
                         # 키드짐 특화: 각 선택자 시도 간격 증가 (DOM 로딩 대기)
-                        await page.wait_for_timeout(300)
+                        with self.perf.span('ready_wait', kind='selector_retry'):
+                            await page.wait_for_timeout(300)
                     
                     data['상세페이지'] = detail_images[:10]
                     print(f"[DEBUG] 최종 상세페이지 이미지: {len(data['상세페이지'])}개")
@@ -568,43 +667,60 @@ class FinalAnalyzer:
             from urllib.parse import urljoin
             return urljoin(base_url, url)
         
-    async def _get_image_info_via_playwright(self, page, url):
-        """Playwright를 통한 이미지 정보 추출 (403 오류 대응)"""
+    async def _collect_image_states(self, page, selector):
+        """선택자에 해당하는 이미지들의 URL, 실제 크기, 디코딩 상태를 한 번에 수집"""
+        try:
+            return await page.evaluate("""
+                (selector) => {
+                    """ + RESOURCE_SIZE_JS + """
+                    return Array.from(document.querySelectorAll(selector)).map(img => ({
+                        src: img.getAttribute('data-original') || img.getAttribute('data-src') || img.getAttribute('src'),
+                        current_src: img.currentSrc || img.src || '',
+                        width: img.naturalWidth || 0,
+                        height: img.naturalHeight || 0,
+                        loaded: !!(img.complete && img.naturalWidth > 0),
+                        file_size: resourceSize(img.currentSrc || img.src)
+                    }));
+                }
+            """, selector)
+        except Exception as e:
+            print(f"[WARNING] 이미지 상태 수집 실패 ({selector}): {e}")
+            return []
+
+    async def _load_images_in_browser(self, page, urls, timeout_ms=5000):
+        """브라우저에서 여러 이미지를 병렬 로드하여 실제 크기 반환 (URL -> 정보, 로드 실패 제외)"""
         try:
-            # 브라우저에서 이미지 정보 추출
-            result = await page.evaluate(f"""
-                async () => {{
-                    try {{
+            results = await page.evaluate("""
+                ([urls, timeoutMs]) => {
+                    """ + RESOURCE_SIZE_JS + """
+                    return Promise.all(urls.map(url => new Promise(resolve => {
                         const img = new Image();
-                        return new Promise((resolve, reject) => {{
-                            img.onload = () => {{
-                                resolve({{
-                                    width: img.naturalWidth,
-                                    height: img.naturalHeight,
-                                    src: img.src
-                                }});
-                            }};
-                            img.onerror = () => reject(new Error('Image load failed'));
-                            img.src = '{url}';
-                            
-                            // 5초 타임아웃
-                            setTimeout(() => reject(new Error('Timeout')), 5000);
-                        }});
-                    }} catch (e) {{
-                        return null;
-                    }}
-                }}
-            """)
-            return result
+                        const timer = setTimeout(() => resolve(null), timeoutMs);
+                        img.onload = () => {
+                            clearTimeout(timer);
+                            resolve({url: url, width: img.naturalWidth, height: img.naturalHeight, loaded: true,
+                                     file_size: resourceSize(img.currentSrc || url)});
+                        };
+                        img.onerror = () => {
+                            clearTimeout(timer);
+                            resolve(null);
+                        };
+                        img.src = url;
+                    })));
+                }
+            """, [urls, timeout_ms])
+            return {info['url']: info for info in results if info}
         except Exception as e:
-            print(f"[FALLBACK] Playwright 이미지 정보 추출 실패: {e}")
-            return None
+            print(f"[FALLBACK] Playwright 이미지 일괄 로드 실패: {e}")
+            return {}
 
-    async def _is_valid_detail_image(self, url, page=None):
-        """키드짐 특화: 유효한 상세 이미지 검증 (가로 300px 이상, 파일 크기 5KB 이상, 의미 필터링 완화, Playwright fallback 지원)"""
-        if not url:
-            return False
-        
+    async def _get_image_info_via_playwright(self, page, url):
+        """Playwright를 통한 이미지 정보 추출 (403 오류 대응)"""
+        infos = await self._load_images_in_browser(page, [url])
+        return infos.get(url)
+
+    def _passes_image_url_filters(self, url, verbose=True):
+        """URL 패턴/확장자 기반 1차 필터링 (네트워크 요청 없음)"""
         url_lower = url.lower()
         
         # 1단계: URL 패턴 기반 필터링 (확실히 제외할 UI 요소들)
@@ -634,128 +750,183 @@ class FinalAnalyzer:
         if not is_product_image:
             for pattern in exclude_patterns:
                 if pattern in url_lower:
-                    print(f"[FILTER] 패턴 '{pattern}' 발견으로 이미지 제외: {url}")
+                    if verbose:
+                        logger.debug("[FILTER] 패턴 '%s' 발견으로 이미지 제외: %s", pattern, url)
                     return False
-        else:
-            print(f"[PRIORITY] 키드짐 상품 이미지 경로 감지, 우선 검증: {url}")
+        elif verbose:
+            logger.debug("[PRIORITY] 키드짐 상품 이미지 경로 감지, 우선 검증: %s", url)
         
         # 2단계: 이미지 파일 형식 확인
         image_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp']
         has_image_ext = any(ext in url_lower for ext in image_extensions)
         if not has_image_ext:
-            print(f"[FILTER] 이미지 확장자 없음으로 제외: {url}")
+            if verbose:
+                logger.debug("[FILTER] 이미지 확장자 없음으로 제외: %s", url)
+            return False
+        
+        return True
+
+    async def _is_valid_detail_image(self, url, page=None, image_info=None, browser_failed=False):
+        """키드짐 특화: 유효한 상세 이미지 검증 (거부 캐시 우선 조회 후 실제 검증)
+        
+        image_info: 브라우저가 이미 디코딩한 이미지 정보 (width/height/file_size). 있으면 이미지 재요청 없이 판단
+        browser_failed: 브라우저에서 이미 로드에 실패한 이미지 (HTTP 403이어도 브라우저로 다시 로드하지 않음)
+        """
+        if not url:
             return False
         
+        # 이전에 거부된 URL 또는 학습된 거부 경로는 네트워크 요청 없이 제외
+        if self.rejected_images is not None and self.rejected_images.check(url):
+            return False
+        
+        result = await self._probe_detail_image(url, page, image_info, browser_failed)
+        
+        # 일시적 오류(None)는 기록하지 않아 다음 상품에서 다시 검증
+        if self.rejected_images is not None:
+            if result:
+                self.rejected_images.record_accepted(url)
+            elif result is False:
+                self.rejected_images.record_rejected(url)
+        return bool(result)
+
+    def _passes_file_size(self, url, file_size, source='HTTP'):
+        """파일 크기 기준 (5KB 이상, 10MB 이하) 통과 여부"""
+        if file_size < MIN_DETAIL_IMAGE_BYTES:
+            logger.debug("[FILTER] 파일 크기 너무 작음 (%s bytes, %s)으로 이미지 제외: %s", file_size, source, url)
+            return False
+        if file_size > MAX_DETAIL_IMAGE_BYTES:
+            logger.debug("[FILTER] 파일 크기 너무 큼 (%s bytes, %s)으로 이미지 제외: %s", file_size, source, url)
+            return False
+        return True
+
+    def _head_file_size(self, url, headers):
+        """HEAD 요청으로 파일 크기 확인 (content-length가 없거나 요청 실패면 None)"""
+        try:
+            response = self.session.head(url, headers=headers, timeout=10)
+            content_length = response.headers.get('content-length')
+            if response.status_code == 200 and content_length:
+                return int(content_length)
+        except Exception as e:
+            logger.debug("[FILTER] 파일 크기 확인 실패: %s - %s", url, e)
+        return None
+
+    async def _probe_detail_image(self, url, page=None, image_info=None, browser_failed=False):
+        """상세 이미지 실제 검증 (가로 300px 이상, 파일 크기 5KB 이상, 의미 필터링 완화, Playwright fallback 지원)
+        
+        반환값: True(유효), False(거부), None(네트워크 일시 오류로 판단 불가)
+        """
+        # 1~2단계: URL 패턴 및 확장자 필터링
+        if not self._passes_image_url_filters(url):
+            return False
+        
+        # 사이트에 맞는 헤더 설정 (Referer는 config.py의 상품 페이지 베이스 URL)
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Referer': product_base_url,
+            'Accept': 'image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
+            'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'Connection': 'keep-alive',
+            'Sec-Fetch-Dest': 'image',
+            'Sec-Fetch-Mode': 'no-cors',
+            'Sec-Fetch-Site': 'same-origin'
+        }
+        
+        # 브라우저 디코딩 결과가 있으면 실제 해상도로 바로 판단 (이미지 재다운로드 생략)
+        if image_info and image_info.get('width', 0) > 0:
+            width, height = image_info['width'], image_info.get('height', 0)
+            if width < 300:
+                logger.debug("[FILTER] 해상도 기준 미달 (%sx%s, 브라우저)으로 이미지 제외: %s", width, height, url)
+                return False
+            # 파일 크기도 HTTP 검증과 같은 기준 (브라우저 기록에 크기가 없으면 HEAD로만 확인)
+            file_size = image_info.get('file_size') or self._head_file_size(url, headers)
+            if file_size and not self._passes_file_size(url, file_size, '브라우저'):
+                return False
+            logger.debug("[VALID] 해상도 검증 통과 (%sx%s, 브라우저): %s", width, height, url)
+            return True
+        
         # 3단계: 실제 이미지 다운로드 및 해상도/크기 검증 (기준서 요구사항)
         try:
-            import requests
-            from PIL import Image
-            from io import BytesIO
-            
-            # 키드짐 사이트에 맞는 헤더 설정 (main.py ImageDownloadOptimizer와 동일)
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Referer': 'https://kidgymb2b.co.kr/',
-                'Accept': 'image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
-                'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Sec-Fetch-Dest': 'image',
-                'Sec-Fetch-Mode': 'no-cors',
-                'Sec-Fetch-Site': 'same-origin'
-            }
-            
-            # 이미지 헤더만 다운로드하여 크기 확인 (성능 최적화)
-            response = requests.head(url, headers=headers, timeout=10)
+            # 이미지 헤더만 다운로드하여 크기 확인 (성능 최적화, 세션 연결 재사용)
+            response = self.session.head(url, headers=headers, timeout=10)
             if response.status_code != 200:
                 # HTTP 403 등의 오류 발생 시 Playwright fallback 시도
-                if response.status_code == 403 and page:
-                    print(f"[FALLBACK] HTTP 403 오류, Playwright로 재시도: {url}")
+                if response.status_code == 403 and page and not browser_failed:
+                    logger.debug("[FALLBACK] HTTP 403 오류, Playwright로 재시도: %s", url)
                     try:
                         # Playwright를 통한 이미지 정보 추출
                         image_info = await self._get_image_info_via_playwright(page, url)
                         if image_info and image_info.get('width', 0) >= 300:
-                            print(f"[FALLBACK] Playwright로 성공 ({image_info['width']}x{image_info['height']}): {url}")
+                            logger.debug("[FALLBACK] Playwright로 성공 (%sx%s): %s", image_info['width'], image_info['height'], url)
                             return True
                     except Exception as e:
-                        print(f"[FALLBACK] Playwright 실패: {url} - {e}")
+                        logger.debug("[FALLBACK] Playwright 실패: %s - %s", url, e)
                 
-                print(f"[FILTER] HTTP 응답 오류 ({response.status_code})으로 이미지 제외: {url}")
-                return False
+                logger.debug("[FILTER] HTTP 응답 오류 (%s)으로 이미지 제외: %s", response.status_code, url)
+                return None if response.status_code >= 500 or response.status_code == 429 else False
             
             # 파일 크기 검증 (기준서: 파일 크기 필터링)
             content_length = response.headers.get('content-length')
-            if content_length:
-                file_size = int(content_length)
-                # 키드짐 특화: 너무 작은 파일 (5KB 미만) 제외 (기존 10KB에서 완화)
-                if file_size < 5120:  # 5KB
-                    print(f"[FILTER] 파일 크기 너무 작음 ({file_size} bytes)으로 이미지 제외: {url}")
-                    return False
-                # 너무 큰 파일 (10MB 초과) 제외
-                if file_size > 10485760:  # 10MB
-                    print(f"[FILTER] 파일 크기 너무 큼 ({file_size} bytes)으로 이미지 제외: {url}")
-                    return False
+            if content_length and not self._passes_file_size(url, int(content_length)):
+                return False
             
             # 해상도 검증을 위해 실제 이미지 일부 다운로드 (기준서: 가로 660px 이상)
-            # 키드짐 사이트에 맞는 헤더 설정 (main.py ImageDownloadOptimizer와 동일)
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Referer': 'https://kidgymb2b.co.kr/',
-                'Accept': 'image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
-                'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Sec-Fetch-Dest': 'image',
-                'Sec-Fetch-Mode': 'no-cors',
-                'Sec-Fetch-Site': 'same-origin'
-            }
-            response = requests.get(url, headers=headers, timeout=15, stream=True)
+            response = self.session.get(url, headers=headers, timeout=15, stream=True)
             if response.status_code != 200:
                 # HTTP 403 등의 오류 발생 시 Playwright fallback 시도 (GET 요청)
-                if response.status_code == 403 and page:
-                    print(f"[FALLBACK] HTTP 403 오류 (GET), Playwright로 재시도: {url}")
+                if response.status_code == 403 and page and not browser_failed:
+                    logger.debug("[FALLBACK] HTTP 403 오류 (GET), Playwright로 재시도: %s", url)
                     try:
                         # Playwright를 통한 이미지 정보 추출
                         image_info = await self._get_image_info_via_playwright(page, url)
                         if image_info and image_info.get('width', 0) >= 300:
-                            print(f"[FALLBACK] Playwright로 성공 ({image_info['width']}x{image_info['height']}): {url}")
+                            logger.debug("[FALLBACK] Playwright로 성공 (%sx%s): %s", image_info['width'], image_info['height'], url)
                             return True
                     except Exception as e:
-                        print(f"[FALLBACK] Playwright 실패: {url} - {e}")
+                        logger.debug("[FALLBACK] Playwright 실패: %s - %s", url, e)
                 
-                print(f"[FILTER] 이미지 다운로드 실패로 제외: {url}")
-                return False
+                logger.debug("[FILTER] 이미지 다운로드 실패로 제외: %s", url)
+                return None if response.status_code >= 500 or response.status_code == 429 else False
             
             # 이미지 해상도 확인
             try:
-                image_data = BytesIO()
-                downloaded = 0
-                # 최대 100KB만 다운로드해서 해상도 확인 (성능 최적화)
-                for chunk in response.iter_content(chunk_size=8192):
-                    if downloaded > 102400:  # 100KB 제한
-                        break
-                    image_data.write(chunk)
-                    downloaded += len(chunk)
+                # 헤더(SOF 등)만 파싱되면 바로 중단 (최대 100KB, 픽셀 디코딩 없음)
+                width, height = self._read_image_size(response, max_bytes=102400)
+                if width is None:
+                    logger.debug("[FILTER] 이미지 해상도 확인 실패로 제외: %s", url)
+                    return False
                 
-                image_data.seek(0)
-                with Image.open(image_data) as img:
-                    width, height = img.size
-                    
-                    # 키드짐 특화: 가로 해상도 300px 이상 (기존 660px에서 완화)
-                    if width < 300:
-                        print(f"[FILTER] 해상도 기준 미달 ({width}x{height})으로 이미지 제외: {url}")
-                        return False
-                    
-                    print(f"[VALID] 해상도 검증 통과 ({width}x{height}): {url}")
-                    return True
+                # 키드짐 특화: 가로 해상도 300px 이상 (기존 660px에서 완화)
+                if width < 300:
+                    logger.debug("[FILTER] 해상도 기준 미달 (%sx%s)으로 이미지 제외: %s", width, height, url)
+                    return False
+                
+                logger.debug("[VALID] 해상도 검증 통과 (%sx%s): %s", width, height, url)
+                return True
                     
             except Exception as e:
-                print(f"[FILTER] 이미지 해상도 확인 실패로 제외: {url} - {e}")
+                logger.debug("[FILTER] 이미지 해상도 확인 실패로 제외: %s - %s", url, e)
                 return False
+            finally:
+                response.close()
                 
         except Exception as e:
-            print(f"[FILTER] 이미지 검증 중 오류로 제외: {url} - {e}")
-            return False
+            logger.debug("[FILTER] 이미지 검증 중 오류로 제외: %s - %s", url, e)
+            return None
+    
+    @staticmethod
+    def _read_image_size(response, max_bytes=102400):
+        """스트리밍 응답에서 이미지 헤더만 읽어 (너비, 높이) 반환 (실패 시 (None, None))"""
+        parser = ImageFile.Parser()
+        downloaded = 0
+        for chunk in response.iter_content(chunk_size=4096):
+            parser.feed(chunk)
+            if parser.image is not None:
+                return parser.image.size
+            downloaded += len(chunk)
+            if downloaded > max_bytes:
+                break
+        return None, None
     
     def _save_result(self):
         """결과 저장 (SmartDetector 정보 포함)"""
@@ -1032,6 +1203,13 @@ class FinalAnalyzer:
 
 
 if __name__ == "__main__":
-    analyzer = FinalAnalyzer()
-    asyncio.run(analyzer.run())
+    import argparse
+    from utils.log_setup import setup_logging
+    from utils.run_profiler import add_profile_arguments, run_profiled
+    parser = argparse.ArgumentParser(description="상품 페이지 선택자 자동 탐지")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    setup_logging()
+    # --profile이면 프로파일 결과를 실행 폴더에 저장
+    run_profiled(lambda: FinalAnalyzer().run(), args.profile, base_path, args.profile_top)
     print("[COMPLETE] 추출 완료! 자동 종료됩니다.")
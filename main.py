@@ -1,23 +1,32 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import argparse
 import asyncio
+import os
 import ssl
 import time
 import re
-import logging
 from datetime import datetime
 from openpyxl import Workbook
 from config import *
 from utils.image_optimizer import ImageDownloadOptimizer
+from utils.response_cache import ImageResponseCache
+from utils.render_pool import ImageRenderPool
+from utils.options import get_option
+from utils.output_sinks import create_output_sinks
+from utils.product_store import ProductStoreSink
+from utils.row_template import MarketRowTemplate
+from utils.log_setup import setup_logging
+from utils.run_profiler import add_profile_arguments, run_profiled
 from final_analyzer_universal import FinalAnalyzer
 
 
 # SSL 인증서 검증 비활성화
 ssl._create_default_https_context = ssl._create_unverified_context
 
-# 로깅 설정
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# 로깅 설정 (진단 메시지는 config.py에 LOG_LEVEL = 'DEBUG'일 때만 출력)
+setup_logging()
 
 # 테스트할 상품 개수 추가 확인
 TEST_PRODUCTS = getattr(sys.modules[__name__], 'TEST_PRODUCTS', 3) if 'sys' in locals() else 3
@@ -28,19 +37,13 @@ class ProductCrawler(FinalAnalyzer):
     
     def __init__(self):
         super().__init__()  # FinalAnalyzer 초기화
-        # 성능 측정 변수들
+        # 성능 측정 변수들 (단계별 시간은 self.perf에 기록)
         self.image_counter = 1
         self.start_time = time.time()
-        self.json_products_count = 0
-        self.fallback_products_count = 0
-        self.json_processing_time = 0
-        self.fallback_processing_time = 0
         self.network_requests_saved = 0
-        
-        # 엑셀 설정
-        import openpyxl
-        self.wb = openpyxl.Workbook()
-        self.sheet = self.wb.active
+        # 상품 링크 시도 수 상한, 상품 사이 대기 시간 (서버 부하 방지, config.py에서 조정 가능)
+        self.max_link_attempts = get_option('MAX_LINK_ATTEMPTS', 20)
+        self.request_delay = get_option('REQUEST_DELAY', 1)
         
         # 엑셀 헤더 (config.py 표준 완전 준수 - 절대 변경 금지)
         self.headers = [
@@ -59,16 +62,58 @@ class ProductCrawler(FinalAnalyzer):
             "상품상세15", "상품상세16", "상품상세17", "상품상세18", "상품상세19", "상품상세20",
             "상품상세21", "상품상세22", "상품상세23", "상품상세24"
         ]
-        self.sheet.append(self.headers)
+        
+        # 결과 파일 설정 (엑셀 + OUTPUT_FORMATS의 csv/jsonl/parquet)
+        # EXCEL_STREAMING = True면 엑셀도 상품마다 바로 기록하는 write-only 모드
+        self.output_sinks = create_output_sinks(
+            base_path, f'{tdate}{code}', self.headers,
+            formats=get_option('OUTPUT_FORMATS', ['xlsx']),
+            excel_streaming=get_option('EXCEL_STREAMING', False)
+        )
+        
+        # 로컬 상품 저장소 (PRODUCT_STORE = True면 실행 간 비교 후 신규/변경 상품만 따로 내보냄)
+        if get_option('PRODUCT_STORE', False):
+            self.output_sinks.append(ProductStoreSink(
+                get_option('PRODUCT_STORE_PATH', os.path.join(os.path.dirname(base_path), 'products.sqlite')),
+                SITE_NAME, f'{tdate}{code}', self.headers, base_path, f'{tdate}{code}'
+            ))
         
         # 방문한 링크 추적
         self.visited_links = set()
         self.product_infos = []
         
+        # 브라우저가 받은 이미지 응답 재사용 (선택 기능, 기본 비활성화)
+        self.response_cache = None
+        if get_option('CAPTURE_IMAGE_RESPONSES', False):
+            cache_dir = None
+            if get_option('IMAGE_RESPONSE_CACHE_DISK', False):
+                cache_dir = os.path.join(os.path.dirname(base_path), '_cache', 'responses')
+            self.response_cache = ImageResponseCache(
+                max_memory_bytes=get_option('IMAGE_RESPONSE_CACHE_MB', 256) * 1024 * 1024,
+                disk_dir=cache_dir,
+                url_filter=lambda url: self._passes_image_url_filters(url, verbose=False),
+                max_age_seconds=get_option('IMAGE_RESPONSE_CACHE_MAX_AGE_HOURS', 24) * 3600
+            )
+        
+        # 이미지 렌더링 풀 (CPU 작업을 이벤트 루프 밖에서 병렬 처리, 브라우저 시작 전에 생성)
+        self.render_pool = None
+        self.pending_image_tasks = set()  # 완료된 작업은 done 콜백에서 제거 (이미지 바이트 해제)
+        self.image_task_slots = None  # 동시에 진행할 상품 이미지 작업 수 제한 (이벤트 루프 안에서 생성)
+        if get_option('IMAGE_RENDER_POOL', True):
+            self.render_pool = ImageRenderPool(get_option('IMAGE_RENDER_WORKERS', None))
+            self.render_pool.warm_up()
+        
         # 이미지 다운로드 최적화 객체
-        self.download_optimizer = ImageDownloadOptimizer()
+        self.download_optimizer = ImageDownloadOptimizer(hash_index=self.image_hashes, response_cache=self.response_cache, perf=self.perf)
         # 이미지 폴더 경로 저장 (엑셀 저장 시 같은 경로 사용)
         self.image_base_path = self.download_optimizer.base_path
+        if self.har is not None:
+            self.har.mount(self.download_optimizer.session)
+        # 마켓 업로드 행 템플릿 (고정/실행 값은 한 번만 채우고 상품별 칸만 채움)
+        self.row_template = MarketRowTemplate(
+            self.headers, brandname, category, code, tdate, now,
+            image_ext=self.download_optimizer.output_extension
+        )
     
     async def run_full_crawling(self):
         """메인 크롤링 실행 (JSON 의존성 제거됨)"""
@@ -79,8 +124,10 @@ class ProductCrawler(FinalAnalyzer):
         
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36")
+            context = await self._new_context(browser)
             page = await context.new_page()
+            if self.response_cache is not None:
+                self.response_cache.attach(page)
             
             try:
                 print("[JSON_REMOVED] 실시간 선택자 탐지 모드로 전환")
@@ -124,8 +171,17 @@ class ProductCrawler(FinalAnalyzer):
                     print(f"[CRAWLING] {TEST_PRODUCT_COUNT}개 상품 크롤링 시작...")
                     await self._crawl_products(page, test_links)
                     
-                    # 7. 엑셀 파일 저장
-                    self._save_excel_file()
+                    # 백그라운드 이미지 작업 완료 대기
+                    await self._wait_image_tasks()
+                    
+                    # 학습된 공통 이미지 인덱스/거부 이미지 캐시 저장 (다음 실행에서 재사용)
+                    if self.image_hashes is not None:
+                        self.image_hashes.save()
+                    if self.rejected_images is not None:
+                        self.rejected_images.save()
+                    
+                    # 7. 엑셀 파일 저장 (남은 이미지 작업의 단계 기록까지 포함해 보고)
+                    await self._save_excel_file()
                     
                     print(f"[SUCCESS] 크롤링 완료: {self.image_counter-1}개 상품 처리")
                     
@@ -139,7 +195,17 @@ class ProductCrawler(FinalAnalyzer):
                 traceback.print_exc()
                 return False
             finally:
-                await browser.close()
+                try:
+                    # 이미지 작업이 끝난 뒤 닫아야 그 작업의 단계 기록이 파일/보고에 남음
+                    await self._wait_image_tasks()
+                finally:
+                    # 실패/중단(Ctrl+C) 시에도 처리된 상품 행은 파일로 남김 (정상 종료 시에는 이미 닫혀 있어 무시)
+                    self._close_output_sinks()
+                    self.perf.close()
+                    await self._close_context(context)
+                    await browser.close()
+                    if self.render_pool is not None:
+                        self.render_pool.close()
         
         print("[JSON_REMOVED] ProductCrawler 실행 완료")
         return True
@@ -149,7 +215,7 @@ class ProductCrawler(FinalAnalyzer):
         successful_count = 0
         seen_names = set()  # 중복 상품명 방지
         
-        for i in range(min(len(test_links), 20)):  # 최대 20개 링크에서 시도
+        for i in range(min(len(test_links), self.max_link_attempts)):  # 최대 max_link_attempts개 링크에서 시도
             if successful_count >= TEST_PRODUCT_COUNT:
                 print(f"[COMPLETE] 목표 달성! {TEST_PRODUCT_COUNT}개 상품 추출 완료")
                 break
@@ -159,6 +225,10 @@ class ProductCrawler(FinalAnalyzer):
             print(f"[PRODUCT] 상품 {i+1} 처리 중... (성공: {successful_count}/{TEST_PRODUCT_COUNT})")
             print(f"[LINK] {link}")
             
+            # 이 상품에서 기록하는 단계 시간(백그라운드 이미지 작업 포함)은 링크 순번으로 묶음
+            self.perf.begin_product(i + 1)
+            product_start = time.perf_counter()
+            success = False
             try:
                 success = await self._extract_and_save_product(page, link, seen_names)
                 if success:
@@ -169,10 +239,11 @@ class ProductCrawler(FinalAnalyzer):
                     
             except Exception as e:
                 print(f"[ERROR] 상품 {i+1} 오류: {str(e)[:100]}")
+            self.perf.record('product_total', time.perf_counter() - product_start, url=link, success=success)
             
             # 서버 부하 방지
-            if i < len(test_links) - 1:
-                await asyncio.sleep(1)
+            if i < len(test_links) - 1 and self.request_delay:
+                await asyncio.sleep(self.request_delay)
         
         print(f"[RESULT] 크롤링 완료: {successful_count}개 성공")
     
@@ -239,128 +310,54 @@ class ProductCrawler(FinalAnalyzer):
             thumbnail_url = product_data.get('썸네일', '')
             detail_img_urls = product_data.get('상세페이지', [])
             
-            # 썸네일 처리
             thumbnail_success = False
-            if thumbnail_url:
-                thumbnail_success = self.download_optimizer.download_and_process_thumbnail(
-                    thumbnail_url, self.image_counter, product_name
-                )
-            
-            # 상세이미지 처리  
             detail_success = False
-            if detail_img_urls:
-                detail_success = self.download_optimizer.download_and_process_detail_images(
-                    detail_img_urls, self.image_counter, product_name
-                )
-            
-            # 5. 엑셀 데이터 생성 (config.py 표준 86개 컬럼 완전 준수)
-            options = product_data.get('선택옵션', [])
-            option_string = ""
-            if options:
-                option_list = []
-                for option_name in options:
-                    formatted_option = f"{option_name}==0=10000=0=0=0="
-                    option_list.append(formatted_option)
-                option_string = "[필수선택]\n" + "\n".join(option_list)
-                if option_string.count("10000") == 1:
-                    option_string = ""
-            
-            # config.py 방식과 동일한 상품코드 생성 (config.py의 now 변수 사용)
-            product_code = str(now)[3:4] + str(now)[5:7] + str(now)[8:10] + code + str(self.image_counter)
-            
-            # 썸네일 URL 생성 (config.py 형식)
-            thumbnail_url_final = f"http://ai.esmplus.com/tstkimtt/{tdate}{code}/cr/{self.image_counter}_cr.jpg"
-            
-            # 상세설명 HTML 생성 (config.py 형식)
-            detail_description = "<center> <img src='http://gi.esmplus.com/tstkimtt/head.jpg' /><br>"
-            for i in range(1, 11):
-                detail_description += f"<img src='http://ai.esmplus.com/tstkimtt/{tdate}{code}/output/{self.image_counter:03}_{i:03}.jpg' /><br />"
-            detail_description += "<img src='http://gi.esmplus.com/tstkimtt/deliver.jpg' /></center>"
-            
-            option_type = "" if option_string == "" else "SM"
+            if self.render_pool is not None:
+                # 렌더링 풀 사용: 이미지 작업을 백그라운드로 넘기고 바로 다음 단계 진행
+                # (진행 중 작업이 워커 수만큼 차 있으면 하나가 끝날 때까지 대기하여 메모리 증가 방지)
+                if self.image_task_slots is None:
+                    self.image_task_slots = asyncio.Semaphore(self.render_pool.max_workers)
+                await self.image_task_slots.acquire()
+                try:
+                    task = asyncio.create_task(self._process_images_in_background(
+                        thumbnail_url, detail_img_urls, self.image_counter, product_name
+                    ))
+                except Exception:
+                    self.image_task_slots.release()
+                    raise
+                self.pending_image_tasks.add(task)
+                task.add_done_callback(self._on_image_task_done)
+            else:
+                # 썸네일 처리
+                if thumbnail_url:
+                    thumbnail_success = self.download_optimizer.download_and_process_thumbnail(
+                        thumbnail_url, self.image_counter, product_name
+                    )
+                
+                # 상세이미지 처리  
+                if detail_img_urls:
+                    detail_success = self.download_optimizer.download_and_process_detail_images(
+                        detail_img_urls, self.image_counter, product_name
+                    )
             
-            row_data = [
-                product_code,           # 업체상품코드
-                "",                     # 모델명 (빈 값)
-                brandname,              # 브랜드 (config.py에서 가져옴)
-                brandname,              # 제조사 (config.py에서 가져옴)
-                "국내=서울=강남구",      # 원산지
-                product_name,           # 상품명
-                "",                     # 홍보문구 (빈 값)
-                "",                     # 요약상품명 (빈 값)
-                category,               # 카테고리코드 (config.py에서 가져옴)
-                code + tdate,           # 사용자분류명
-                "",                     # 한줄메모 (빈 값)
-                "",                     # 시중가 (빈 값)
-                "",                     # 원가 (빈 값)
-                "",                     # 표준공급가 (빈 값)
-                clean_price,            # 판매가
-                "선결제",               # 배송방법
-                "3500",                 # 배송비
-                "0",                    # 구매수량
-                "y",                    # 과세여부
-                "9000",                 # 판매수량
-                thumbnail_url_final,    # 이미지1URL
-                thumbnail_url_final,    # 이미지2URL
-                "",                     # 이미지3URL (빈 값)
-                "",                     # 이미지4URL (빈 값)
-                "",                     # GIF생성 (빈 값)
-                "",                     # 이미지6URL (빈 값)
-                "",                     # 이미지7URL (빈 값)
-                "",                     # 이미지8URL (빈 값)
-                "",                     # 이미지9URL (빈 값)
-                "",                     # 이미지10URL (빈 값)
-                "",                     # 추가정보입력사항 (빈 값)
-                option_type,            # 옵션타입
-                option_string,          # 옵션구분
-                "",                     # 선택옵션 (빈 값)
-                "",                     # 입력형옵션 (빈 값)
-                "",                     # 추가구매옵션 (빈 값)
-                detail_description,     # 상세설명
-                "",                     # 추가상세설명 (빈 값)
-                "",                     # 광고/홍보 (빈 값)
-                "",                     # 제조일자 (빈 값)
-                "",                     # 유효일자 (빈 값)
-                "",                     # 사은품내용 (빈 값)
-                "쿠폰",                 # 키워드
-                "",                     # 인증구분 (빈 값)
-                "c",                    # 인증정보
-                "",                     # 거래처 (빈 값)
-                "",                     # 영어상품명 (빈 값)
-                "",                     # 중국어상품명 (빈 값)
-                "",                     # 일본어상품명 (빈 값)
-                "",                     # 영어상세설명 (빈 값)
-                "",                     # 중국어상세설명 (빈 값)
-                "",                     # 일본어상세설명 (빈 값)
-                "25",                   # 상품무게
-                "",                     # 영어키워드 (빈 값)
-                "",                     # 중국어키워드 (빈 값)
-                "",                     # 일본어키워드 (빈 값)
-                "",                     # 생산지국가 (빈 값)
-                "",                     # 전세계배송코드 (빈 값)
-                "",                     # 사이즈 (빈 값)
-                "",                     # 포장방법 (빈 값)
-                "",                     # 상품상세코드 (빈 값)
-                "상세설명일괄참조",       # 상품상세1
-                "상세설명일괄참조",       # 상품상세2
-                "상세설명일괄참조",       # 상품상세3
-                "상세설명일괄참조",       # 상품상세4
-                "상세설명일괄참조",       # 상품상세5
-                "상세설명일괄참조",       # 상품상세6
-                "N",                    # 상품상세7 (사은품여부)
-                "상세설명일괄참조",       # 상품상세8
-                "상세설명일괄참조",       # 상품상세9
-                "상세설명일괄참조",       # 상품상세10
-                "상세설명일괄참조",       # 상품상세11
-                "상세설명일괄참조",       # 상품상세12
-                thumbnail_url_final     # 상품상세13 (마지막에 이미지 URL)
-            ]
+            # 5. 엑셀 데이터 생성 (config.py 표준 86개 컬럼, 실행 시작 시 컴파일한 행 템플릿 사용)
+            row_data = self.row_template.build(
+                self.image_counter, product_name, clean_price, product_data.get('선택옵션', [])
+            )
+            product_code = row_data[0]
             
-            # 6. 엑셀에 데이터 추가
-            self.sheet.append(row_data)
+            # 6. 엑셀(및 추가 출력 형식)에 데이터 추가
+            with self.perf.span('row_write', image_counter=self.image_counter):
+                self._write_output_row(row_data, {
+                    'url': url,
+                    'image_counter': self.image_counter,
+                    'product_code': product_code,
+                    'data': product_data
+                })
             
             print(f"[SAVE] 상품 저장 완료: {product_name} | {clean_price}원")
-            print(f"   [IMAGES] 썸네일: {'OK' if thumbnail_success else 'FAIL'}, 상세: {'OK' if detail_success else 'FAIL'}")
+            if self.render_pool is None:
+                print(f"   [IMAGES] 썸네일: {'OK' if thumbnail_success else 'FAIL'}, 상세: {'OK' if detail_success else 'FAIL'}")
             
             self.image_counter += 1
             return True
@@ -369,6 +366,44 @@ class ProductCrawler(FinalAnalyzer):
             print(f"[ERROR] 상품 추출 실패: {e}")
             return False
     
+    async def _process_images_in_background(self, thumbnail_url, detail_img_urls, image_counter, product_name):
+        """백그라운드 이미지 작업 (다운로드 후 렌더링 풀에서 썸네일/상세이미지 생성)"""
+        try:
+            thumbnail_success, detail_success = await self.download_optimizer.process_product_images_async(
+                thumbnail_url, detail_img_urls, image_counter, product_name, self.render_pool
+            )
+            print(f"   [IMAGES] 상품 {image_counter} 썸네일: {'OK' if thumbnail_success else 'FAIL'}, 상세: {'OK' if detail_success else 'FAIL'}")
+        except Exception as e:
+            print(f"[ERROR] 상품 {image_counter} 이미지 처리 실패: {e}")
+    
+    def _on_image_task_done(self, task):
+        """이미지 작업 종료 시 (취소 포함) 목록에서 제거하고 자리 반환"""
+        self.pending_image_tasks.discard(task)
+        self.image_task_slots.release()
+    
+    async def _wait_image_tasks(self):
+        """남은 백그라운드 이미지 작업 완료 대기"""
+        if self.pending_image_tasks:
+            print(f"[RENDER] 남은 이미지 작업 {len(self.pending_image_tasks)}개 완료 대기...")
+            await asyncio.gather(*list(self.pending_image_tasks), return_exceptions=True)
+            self.pending_image_tasks.clear()
+    
+    def _write_output_row(self, row_data, product):
+        """모든 출력 대상에 상품 행 기록 (추가 형식 실패는 엑셀 저장에 영향 없음)"""
+        for sink in self.output_sinks:
+            try:
+                sink.write(row_data, product)
+            except Exception as e:
+                print(f"[WARNING] {sink.extension} 행 기록 실패: {e}")
+    
+    def _close_output_sinks(self):
+        """모든 출력 대상 닫기 (각 출력 대상의 close는 한 번만 저장하므로 여러 번 호출해도 안전)"""
+        for sink in self.output_sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                print(f"[ERROR] {sink.extension} 파일 저장 실패: {e}")
+    
     def _parse_price(self, price_text):
         """가격 텍스트에서 숫자 추출"""
         try:
@@ -380,19 +415,25 @@ class ProductCrawler(FinalAnalyzer):
         except:
             return 0
     
-    def _save_excel_file(self):
-        """엑셀 파일 저장 (키드짐 폴더 안)"""
+    async def _save_excel_file(self):
+        """엑셀 파일 저장 (키드짐 폴더 안, 남은 이미지 작업 완료 후 출력 대상/성능 기록 닫기)"""
         try:
-            # 키드짐 폴더 안에 엑셀 파일 저장
-            filename = f'C:/Users/ME/Documents/project/croller/images/{tdate}{code}/{tdate}{code}.xlsx'
-            self.wb.save(filename)
-            print(f"[EXCEL] 엑셀 파일 저장 완료: {filename}")
+            await self._wait_image_tasks()
+            
+            # 키드짐 폴더 안에 엑셀 파일 저장 (config.py의 base_path = 이미지 폴더)
+            self._close_output_sinks()
             
             # 성능 리포트
             end_time = time.time()
             total_time = end_time - self.start_time
             print(f"[PERF] 총 처리 시간: {total_time:.2f}초")
             print(f"[PERF] 처리된 상품: {self.image_counter-1}개")
+            if self.response_cache is not None:
+                self.network_requests_saved = self.response_cache.hits
+                self.response_cache.report()
+            self.download_optimizer.report_encoding()
+            self.perf.report()
+            self.perf.close()
             
         except Exception as e:
             print(f"[ERROR] 엑셀 저장 실패: {e}")
@@ -407,11 +448,15 @@ if __name__ == "__main__":
     - JSON 파일 없이 선택자 자동 탐지 및 크롤링
     - 기존 결과물 형식 100% 보존 (엑셀 헤더, 이미지 규격)
     """
+    parser = argparse.ArgumentParser(description="범용 쇼핑몰 크롤러")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    
     print("키드짐 B2B 크롤러 시작! 작업을 시작할게요.. 잠깐만 기다려주세요*^.^*")
     
     try:
-        # 비동기 크롤링 실행
-        asyncio.run(ProductCrawler().run_full_crawling())
+        # 비동기 크롤링 실행 (--profile이면 프로파일 결과를 실행 폴더에 저장)
+        run_profiled(lambda: ProductCrawler().run_full_crawling(), args.profile, base_path, args.profile_top)
         print("[SUCCESS] 크롤링 작업이 성공적으로 완료되었습니다!")
         
     except KeyboardInterrupt:
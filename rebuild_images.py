@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+실행 폴더 이미지 재렌더링 (크롤링 없이)
+
+main.py 실행 시 src/에 보관된 원본 이미지와 src/products.jsonl의 상품 정보로
+썸네일(cr/)과 상세 조각(output/)을 렌더링 풀에서 병렬로 다시 만든다.
+썸네일 폰트/배지 스타일을 바꾼 뒤 다시 크롤링하지 않고 결과만 갱신할 때 사용한다.
+
+사용법:
+    python rebuild_images.py C:/Users/ME/Documents/project/croller/images/202506251200kidgym
+    python rebuild_images.py <실행 폴더> --only thumbnails
+    python rebuild_images.py <실행 폴더> --products 3,7 --workers 4
+
+주의: config.py는 import 시 새 실행 폴더를 만들고 같은 이름 폴더를 지우므로 여기서는 import하지 않는다.
+(그래서 브라우저/세션 상태가 없는 이 스크립트는 Windows에서도 spawn 프로세스 풀로 렌더링한다)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from utils.image_optimizer import render_thumbnail_job, render_detail_job, resolve_encoder, normalize_thumbnail_variants
+from utils.render_pool import ImageRenderPool
+from utils.source_store import load_manifest, read_source
+from utils.log_setup import setup_logging
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="보관된 원본으로 썸네일/상세 조각 재렌더링")
+    parser.add_argument('run_folder', help="main.py 실행 결과 폴더 (cr/, output/, src/ 포함)")
+    parser.add_argument('--only', choices=['thumbnails', 'details'], help="썸네일 또는 상세 조각만 재렌더링")
+    parser.add_argument('--products', help="재렌더링할 상품 번호 (쉼표 구분, 기본: 전체)")
+    parser.add_argument('--workers', type=int, help="렌더링 워커 수 (기본: CPU 코어 수)")
+    parser.add_argument('--format', choices=['jpeg', 'webp'], help="결과 형식 (기본: JPEG)")
+    parser.add_argument('--optimize', action='store_true', help="JPEG 허프만 테이블 최적화")
+    parser.add_argument('--progressive', action='store_true', help="프로그레시브 JPEG")
+    parser.add_argument('--slice-target-bytes', type=int, help="상세 조각 1장 목표 용량 (bytes)")
+    parser.add_argument('--trim', action='store_true', help="상세이미지 위/아래 여백과 빈 구간 제거 (NumPy 필요)")
+    parser.add_argument('--verbose', action='store_true', help="이미지/조각별 진단 메시지 출력")
+    parser.add_argument('--thumbnail-variants', help='썸네일 추가 크기 JSON (예: \'[{"size": 300, "badge": false}]\')')
+    return parser.parse_args()
+
+
+async def rebuild(run_folder, products, pool, encoder, only=None, variants=None, trim=None):
+    """상품별 렌더링 작업을 풀에 넣고 결과 집계"""
+    cr_path = f"{run_folder}/cr"
+    output_path = f"{run_folder}/output"
+    os.makedirs(cr_path, exist_ok=True)
+    os.makedirs(output_path, exist_ok=True)
+
+    # 원본은 작업 직전에 읽음 (동시에 메모리에 올리는 상품 수를 워커 수의 2배로 제한)
+    semaphore = asyncio.Semaphore(pool.max_workers * 2)
+
+    async def run_job(kind, image_counter, entry):
+        product_name = entry.get('product_name', '')
+        async with semaphore:
+            if kind == 'thumbnail':
+                image_bytes = read_source(run_folder, entry['thumbnail'])
+                return await pool.run(render_thumbnail_job, image_bytes, image_counter, product_name, cr_path, None, encoder, variants)
+            sources = [(idx, read_source(run_folder, path)) for idx, path in entry['details']]
+            return await pool.run(render_detail_job, sources, image_counter, output_path, None, encoder, trim)
+
+    jobs = []
+    for image_counter, entry in sorted(products.items()):
+        if only != 'details' and entry.get('thumbnail'):
+            jobs.append(('thumbnail', image_counter, entry))
+        if only != 'thumbnails' and entry.get('details'):
+            jobs.append(('detail', image_counter, entry))
+
+    results = await asyncio.gather(*(run_job(*job) for job in jobs), return_exceptions=True)
+
+    failed = []
+    written_bytes = 0
+    for (kind, image_counter, _), result in zip(jobs, results):
+        if isinstance(result, Exception) or not result.get('success'):
+            failed.append(f"{kind}:{image_counter}")
+            continue
+        written_bytes += result.get('bytes', 0)
+    return len(jobs), failed, written_bytes
+
+
+def main():
+    args = parse_args()
+    # config.py를 읽지 않도록 로깅 설정값을 모두 직접 지정 (spawn 워커에서도 같은 설정)
+    logging_args = ('DEBUG' if args.verbose else 'INFO', '', False, False)
+    setup_logging(*logging_args)
+    run_folder = args.run_folder.rstrip('/\\')
+
+    try:
+        products = load_manifest(run_folder)
+    except FileNotFoundError:
+        print(f"[ERROR] 원본 보관 기록이 없습니다: {run_folder}/src/products.jsonl")
+        print(f"[INFO] KEEP_SOURCE_IMAGES가 켜진 상태로 main.py를 실행한 폴더만 재렌더링할 수 있습니다.")
+        return
+
+    if args.products:
+        selected = {int(number) for number in args.products.split(',') if number.strip()}
+        products = {number: entry for number, entry in products.items() if number in selected}
+
+    encoder = resolve_encoder({
+        'format': args.format,
+        'optimize': args.optimize,
+        'progressive': args.progressive,
+        'slice_target_bytes': args.slice_target_bytes,
+    })
+    if encoder['format'] != 'JPEG':
+        print(f"[WARNING] 결과 형식이 {encoder['format']}이므로 기존 엑셀의 .jpg 이미지 URL과 파일명이 달라집니다.")
+
+    variants = normalize_thumbnail_variants(json.loads(args.thumbnail_variants)) if args.thumbnail_variants else []
+
+    print(f"[REBUILD] 재렌더링 시작: 상품 {len(products)}개 ({run_folder})")
+    start = time.time()
+    pool = ImageRenderPool(args.workers, start_method='spawn', initializer=setup_logging, initargs=logging_args)
+    try:
+        job_count, failed, written_bytes = asyncio.run(rebuild(run_folder, products, pool, encoder, args.only, variants, {} if args.trim else None))
+    finally:
+        pool.close()
+
+    elapsed = time.time() - start
+    print(f"[REBUILD] 완료: 작업 {job_count}개, 실패 {len(failed)}개, "
+          f"{written_bytes / (1024 * 1024):.1f}MB, {elapsed:.2f}초")
+    if failed:
+        print(f"[REBUILD] 실패 목록: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
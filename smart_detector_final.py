@@ -3,9 +3,12 @@
 """
 import json
 import asyncio
+import logging
 import re
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 
 class SmartDetector:
     """범용 쇼핑몰 선택자 자동 탐지 엔진"""
@@ -138,7 +141,7 @@ class SmartDetector:
         ]
         
         all_candidates = []
-        print("[DEBUG] 상품명 전체 후보 스캔:")
+        logger.debug("상품명 전체 후보 스캔:")
         
         # 모든 후보 테스트
         for selector in candidates:
@@ -150,7 +153,7 @@ class SmartDetector:
                         if text:
                             text = text.strip()
                             if 3 <= len(text) <= 100:  # 적절한 길이
-                                print(f"[DEBUG] {selector}[{i}]: '{text}'")
+                                logger.debug("%s[%s]: '%s'", selector, i, text)
                                 
                                 # 제외 패턴 체크 (강화된 로직)
                                 should_exclude = False
@@ -159,12 +162,12 @@ class SmartDetector:
                                 # 1. 정확 매칭 (완전히 같은 경우)
                                 if text in exclude_patterns or text_lower in [p.lower() for p in exclude_patterns]:
                                     should_exclude = True
-                                    print(f"[DEBUG] -> 정확 매칭 제외됨: '{text[:30]}...'")
+                                    logger.debug("-> 정확 매칭 제외됨: '%s...'", text[:30])
                                 
                                 # 2. 부분 매칭 (주요 키워드 포함)
                                 elif any(pattern.lower() in text_lower for pattern in exclude_patterns):
                                     should_exclude = True
-                                    print(f"[DEBUG] -> 부분 매칭 제외됨: '{text[:30]}...'")
+                                    logger.debug("-> 부분 매칭 제외됨: '%s...'", text[:30])
                                 
                                 if should_exclude:
                                     continue
@@ -182,7 +185,7 @@ class SmartDetector:
                                 ]
                                 if selector in product_class_selectors:
                                     score += 100  # 클래스명 기반 선택자에 최고 우선순위
-                                    print(f"[DEBUG] -> 상품명 클래스 선택자 보너스! +100점")
+                                    logger.debug("-> 상품명 클래스 선택자 보너스! +100점")
                                 
                                 # 길이 점수
                                 if 5 <= len(text) <= 50:
@@ -199,18 +202,18 @@ class SmartDetector:
                                 # 브랜드명 대괄호 초고점 보너스!
                                 if '[' in text and ']' in text:
                                     score += 50  # 다른 모든 후보를 압도
-                                    print(f"[DEBUG] -> 브랜드명 대괄호 발견! +50점")
+                                    logger.debug("-> 브랜드명 대괄호 발견! +50점")
                                     
                                 # UI 요소 및 카테고리명 추가 감점 (제외 패턴을 빠져나간 경우)
                                 ui_indicators = ['좋아요', '싫어요', '찜하기', '버튼', '클릭', '선택']
                                 if any(ui_word in text_lower for ui_word in ui_indicators):
                                     score -= 100  # UI 요소 강력 배제
-                                    print(f"[DEBUG] -> UI 요소 감점 -100점")
+                                    logger.debug("-> UI 요소 감점 -100점")
                                     
                                 category_indicators = ['볼&골대', '네트리더', '타겟게임', '체육용품', '운동기구']
                                 if any(cat in text for cat in category_indicators):
                                     score -= 200  # 카테고리명 강력 배제
-                                    print(f"[DEBUG] -> 카테고리명 감점 -200점")
+                                    logger.debug("-> 카테고리명 감점 -200점")
                                     
                                 # 상품 관련 키워드 보너스
                                 product_keywords = ['가방', '신발', '의류', '장난감', '어린이', '아이', '배낭', '유모차']
@@ -221,7 +224,7 @@ class SmartDetector:
                                 generic_header_selectors = ['h1', 'h2', 'h3', 'h4', 'h5']
                                 if selector in generic_header_selectors:
                                     score -= 30  # 제네릭 헤더는 낮은 우선순위로 (fallback용)
-                                    print(f"[DEBUG] -> 제네릭 헤더 태그 페널티 -30점")
+                                    logger.debug("-> 제네릭 헤더 태그 페널티 -30점")
                                     
                                 all_candidates.append({
                                     'selector': f"{selector}[{i}]",
@@ -229,18 +232,18 @@ class SmartDetector:
                                     'score': score,
                                     'element_selector': selector
                                 })
-                                print(f"[DEBUG] -> 점수: {score}")
+                                logger.debug("-> 점수: %s", score)
                                 
             except Exception as e:
-                print(f"[DEBUG] {selector}: 오류 - {e}")
+                logger.debug("%s: 오류 - %s", selector, e)
                 continue
         
         # 점수로 정렬
         all_candidates.sort(key=lambda x: x['score'], reverse=True)
         
-        print("\n[DEBUG] 상위 5개 후보:")
+        logger.debug("상위 5개 후보:")
         for i, candidate in enumerate(all_candidates[:5]):
-            print(f"[DEBUG] {i+1}. {candidate['selector']}: '{candidate['text']}' (점수: {candidate['score']})")
+            logger.debug("%s. %s: '%s' (점수: %s)", i+1, candidate['selector'], candidate['text'], candidate['score'])
         
         # 최고 점수 후보 선택 (강화된 검증)
         if all_candidates:
@@ -254,20 +257,20 @@ class SmartDetector:
                     unique_texts.add(text_key)
                     filtered_candidates.append(candidate)
                 else:
-                    print(f"[DEBUG] 중복 상품명 제거: '{candidate['text'][:30]}...'")
+                    logger.debug("중복 상품명 제거: '%s...'", candidate['text'][:30])
             
             # 최소 점수 기준 강화 (UI 요소와 카테고리명 배제)
             valid_candidates = [c for c in filtered_candidates if c['score'] >= 30]  # 기존 5에서 30으로 상향
             
             if valid_candidates:
                 best = valid_candidates[0]
-                print(f"\n[DEBUG] 최종 선택: {best['element_selector']} -> '{best['text']}' (점수: {best['score']})")
+                logger.debug("최종 선택: %s -> '%s' (점수: %s)", best['element_selector'], best['text'], best['score'])
                 return best['element_selector']
             else:
-                print(f"[DEBUG] 적절한 상품명 후보를 찾을 수 없음 (최고점: {all_candidates[0]['score'] if all_candidates else 0})")
+                logger.debug("적절한 상품명 후보를 찾을 수 없음 (최고점: %s)", all_candidates[0]['score'] if all_candidates else 0)
                 return None
         else:
-            print("[DEBUG] 상품명 후보가 전혀 없음")
+            logger.debug("상품명 후보가 전혀 없음")
             return None
     
     async def _find_price(self, page):
@@ -346,7 +349,7 @@ class SmartDetector:
         if all_price_candidates:
             all_price_candidates.sort(key=lambda x: x['score'], reverse=True)
             best_candidate = all_price_candidates[0]
-            print(f"[DEBUG] 최고 가격 후보: {best_candidate['selector']} -> '{best_candidate['price']}' (점수: {best_candidate['score']})")
+            logger.debug("최고 가격 후보: %s -> '%s' (점수: %s)", best_candidate['selector'], best_candidate['price'], best_candidate['score'])
             return best_candidate['selector']
         
         return None
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+
+"""
+테스트 공통 설정
+
+config.py는 import 시 실행 폴더를 지우고 다시 만들기 때문에, get_option()이 실제
+config.py를 읽지 않도록 빈 config 모듈을 먼저 등록한다 (모든 선택 설정은 기본값 사용).
+"""
+
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.modules.setdefault('config', types.ModuleType('config'))
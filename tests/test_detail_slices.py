@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+import io
+import random
+
+import pytest
+from PIL import Image
+
+from utils import image_optimizer
+from utils.image_optimizer import _stream_slices, render_detail_job
+
+
+def _noise_png(width, height, seed):
+    """무작위 픽셀 PNG (조각 경계가 한 줄이라도 어긋나면 픽셀이 달라짐)"""
+    img = Image.frombytes('RGB', (width, height), random.Random(seed).randbytes(width * height * 3))
+    buffer = io.BytesIO()
+    img.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def _combine_then_crop(images, slice_count=10):
+    """기존 방식: 전체 결합 이미지를 만든 뒤 10등분 (왼쪽 정렬, 빈 곳 흰색, 나머지 행 버림)"""
+    width = max(img.width for img in images)
+    height = sum(img.height for img in images)
+    combined = Image.new('RGB', (width, height), 'white')
+    top = 0
+    for img in images:
+        combined.paste(img, (0, top))
+        top += img.height
+    slice_height = height // slice_count
+    return [combined.crop((0, slice_height * i, width, slice_height * (i + 1))) for i in range(slice_count)]
+
+
+def _capture_slices(monkeypatch):
+    slices = []
+
+    def encode(img, path, quality, encoder=None, target_bytes=None):
+        slices.append(img.copy())
+        return 0, 0
+
+    monkeypatch.setattr(image_optimizer, 'encode_image', encode)
+    return slices
+
+
+def _open_rgb(data):
+    return Image.open(io.BytesIO(data)).convert('RGB')
+
+
+def test_streamed_slices_match_combined_canvas(tmp_path, monkeypatch):
+    slices = _capture_slices(monkeypatch)
+    # 여러 조각에 걸치는 원본, 조각 하나 안의 작은 원본, 너비가 다른 원본, 너비 부족 원본
+    sources = [_noise_png(700, 333, 1), _noise_png(860, 1207, 2), _noise_png(500, 90, 3),
+               _noise_png(760, 45, 4), _noise_png(660, 418, 5)]
+    result = render_detail_job(list(enumerate(sources)), 7, str(tmp_path))
+
+    assert result['success']
+    assert [path.rsplit('/', 1)[1] for path in result['paths']] == [f"007_{i:03}.jpg" for i in range(1, 11)]
+    expected = _combine_then_crop([_open_rgb(data) for index, data in enumerate(sources) if index != 2])
+    assert [img.size for img in slices] == [img.size for img in expected]
+    assert all(got.tobytes() == want.tobytes() for got, want in zip(slices, expected))
+
+
+def test_content_segments_match_cropped_sources(tmp_path, monkeypatch):
+    slices = _capture_slices(monkeypatch)
+    first, second = _noise_png(700, 600, 6), _noise_png(800, 500, 7)
+    valid_sources = [(first, 700, 600, [(20, 180), (300, 590)]), (second, 800, 500, [(0, 500)])]
+    result = _stream_slices(valid_sources, 1, str(tmp_path))
+
+    assert result['success']
+    first_img = _open_rgb(first)
+    pieces = [first_img.crop((0, 20, 700, 180)), first_img.crop((0, 300, 700, 590)), _open_rgb(second)]
+    expected = _combine_then_crop(pieces)
+    assert all(got.tobytes() == want.tobytes() for got, want in zip(slices, expected))
+    assert len(slices) == 10
+
+
+def test_too_short_detail_fails_without_output(tmp_path, monkeypatch):
+    slices = _capture_slices(monkeypatch)
+    result = render_detail_job([(0, _noise_png(700, 9, 8))], 1, str(tmp_path))
+    assert not result['success']
+    assert slices == []
+
+
+def _slice_sizes(slices):
+    return {img.width for img in slices}, sum(img.height for img in slices)
+
+
+@pytest.mark.filterwarnings('ignore::PIL.Image.DecompressionBombWarning')  # 헤더 확인 시 Pillow 경고 후 제외
+def test_pixel_limits_reject_oversized_source(tmp_path, monkeypatch):
+    monkeypatch.setattr(Image, 'MAX_IMAGE_PIXELS', Image.MAX_IMAGE_PIXELS)  # apply_pixel_limits가 바꾸는 전역값 복원
+    slices = _capture_slices(monkeypatch)
+    sources = [_noise_png(700, 1000, 9), _noise_png(700, 400, 10)]
+    result = render_detail_job(list(enumerate(sources)), 1, str(tmp_path), limits={'max_image_pixels': 700 * 1000 - 1})
+
+    assert result['success']
+    assert _slice_sizes(slices) == ({700}, 400)
+    assert Image.MAX_IMAGE_PIXELS == 700 * 1000 - 1
+
+
+def test_pixel_limits_downscale_wide_source(tmp_path, monkeypatch):
+    monkeypatch.setattr(Image, 'MAX_IMAGE_PIXELS', Image.MAX_IMAGE_PIXELS)
+    slices = _capture_slices(monkeypatch)
+    result = render_detail_job([(0, _noise_png(1600, 300, 11))], 1, str(tmp_path), limits={'max_width': 800})
+
+    assert result['success']
+    assert _slice_sizes(slices) == ({800}, 150)
+
+
+def test_pixel_limits_stop_at_product_budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(Image, 'MAX_IMAGE_PIXELS', Image.MAX_IMAGE_PIXELS)
+    slices = _capture_slices(monkeypatch)
+    sources = [_noise_png(700, 300, 12), _noise_png(700, 300, 13), _noise_png(700, 100, 14)]
+    result = render_detail_job(list(enumerate(sources)), 1, str(tmp_path), limits={'max_product_pixels': 700 * 500})
+
+    # 상한을 넘긴 두 번째 이후는 (더 작은 세 번째도) 순서 유지를 위해 제외
+    assert result['success']
+    assert _slice_sizes(slices) == ({700}, 300)
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import requests
+
+from utils.har_archive import HarRecorder, HarSession, REQUESTS_ARCHIVE
+
+IMAGE_URL = 'https://shop.example/web/product/big/1.jpg'
+PAGE_URL = 'https://shop.example/product/detail.html?product_no=1'
+IMAGE_BODY = bytes(range(256)) * 40
+
+
+def _replay_session(tmp_path):
+    recorder = HarRecorder(str(tmp_path / REQUESTS_ARCHIVE))
+    recorder.add('GET', IMAGE_URL, 200, [('Content-Type', 'image/jpeg'), ('Content-Encoding', 'gzip')], IMAGE_BODY)
+    recorder.add('GET', PAGE_URL, 200, [('Content-Type', 'text/html; charset=utf-8')], '<p>상품</p>'.encode('utf-8'))
+    recorder.save()
+    har = HarSession('replay', str(tmp_path))
+    session = requests.Session()
+    har.mount(session)
+    return har, session
+
+
+def test_replay_returns_recorded_body(tmp_path):
+    _, session = _replay_session(tmp_path)
+    response = session.get(IMAGE_URL)
+    assert response.status_code == 200
+    assert response.content == IMAGE_BODY
+    assert response.headers['Content-Length'] == str(len(IMAGE_BODY))
+    assert 'Content-Encoding' not in response.headers
+    assert session.get(PAGE_URL).text == '<p>상품</p>'
+
+
+def test_replay_streamed_get_then_close(tmp_path):
+    # _probe_detail_image와 같은 사용: stream=True, iter_content로 일부만 읽고 close
+    _, session = _replay_session(tmp_path)
+    response = session.get(IMAGE_URL, stream=True)
+    chunks = []
+    for chunk in response.iter_content(4096):
+        chunks.append(chunk)
+        if len(chunks) == 1:
+            break
+    assert chunks[0] == IMAGE_BODY[:4096]
+    response.close()
+
+    response = session.get(IMAGE_URL, stream=True)
+    assert b''.join(response.iter_content(4096)) == IMAGE_BODY
+    response.close()
+
+
+def test_replay_head_uses_get_length(tmp_path):
+    _, session = _replay_session(tmp_path)
+    response = session.head(IMAGE_URL)
+    assert response.status_code == 200
+    assert response.headers['Content-Length'] == str(len(IMAGE_BODY))
+    assert response.content == b''
+
+
+def test_replay_miss_is_404_and_counted(tmp_path):
+    har, session = _replay_session(tmp_path)
+    session.get(IMAGE_URL)
+    response = session.get('https://shop.example/missing.jpg', stream=True)
+    assert response.status_code == 404
+    assert response.content == b''
+    response.close()
+    assert (har.adapters[0].hits, har.adapters[0].misses) == (1, 1)
+
+
+def test_archive_reads_bodies_on_lookup(tmp_path):
+    har, session = _replay_session(tmp_path)
+    archive = har.archive
+    status, headers, size, source = archive.entries[('GET', IMAGE_URL)]
+    assert size == len(IMAGE_BODY)
+    assert not isinstance(source[1], bytes)  # 로드 시에는 본문을 읽지 않음
+    assert archive.lookup('GET', IMAGE_URL)[3] == IMAGE_BODY
+    assert archive.lookup('HEAD', IMAGE_URL)[2:] == (len(IMAGE_BODY), b'')
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+import io
+import random
+import threading
+
+from PIL import Image
+
+from utils.image_dedup import PerceptualHashIndex, dhash_from_bytes, hamming_distance
+
+
+def _image_bytes(seed, quality=90):
+    """seed마다 다른 부드러운 무늬 JPEG (재압축해도 dHash가 거의 같음)"""
+    small = Image.frombytes('L', (8, 8), random.Random(seed).randbytes(64))
+    buffer = io.BytesIO()
+    small.resize((320, 240), Image.Resampling.BICUBIC).convert('RGB').save(buffer, 'JPEG', quality=quality)
+    return buffer.getvalue()
+
+
+def test_recompressed_image_has_close_hash():
+    assert hamming_distance(dhash_from_bytes(_image_bytes(1)), dhash_from_bytes(_image_bytes(1, quality=40))) <= 4
+    assert hamming_distance(dhash_from_bytes(_image_bytes(1)), dhash_from_bytes(_image_bytes(2))) > 4
+
+
+def test_image_is_learned_after_min_products():
+    index = PerceptualHashIndex(min_products=3)
+    banner = _image_bytes(1)
+    assert not index.observe('https://cdn.example/a/banner.jpg', banner, '상품1')
+    assert not index.observe('https://cdn.example/a/banner.jpg', banner, '상품1')  # 같은 상품은 한 번만 셈
+    assert not index.observe('https://cdn.example/b/banner.jpg', _image_bytes(1, quality=40), '상품2')
+    assert index.observe('https://cdn.example/c/banner.jpg', banner, '상품3')
+    assert not index.hash_products  # 학습된 해시는 후보 목록에서 빠짐
+
+    assert index.observe('https://cdn.example/d/banner.jpg', banner, '상품4')
+    assert not index.observe('https://cdn.example/d/detail.jpg', _image_bytes(2), '상품4')
+    assert index.is_boilerplate_url('https://cdn.example/a/banner.jpg')
+    assert not index.is_boilerplate_url('https://cdn.example/d/detail.jpg')
+    assert not index.is_boilerplate_url('https://cdn.example/unknown.jpg')
+
+
+def test_filter_urls_drops_learned_images():
+    index = PerceptualHashIndex(min_products=2)
+    for product in ('상품1', '상품2'):
+        index.observe(f'https://cdn.example/{product}/notice.jpg', _image_bytes(3), product)
+    urls = ['https://cdn.example/상품1/notice.jpg', 'https://cdn.example/new.jpg']
+    assert index.filter_urls(urls) == ['https://cdn.example/new.jpg']
+
+
+def test_candidates_and_urls_are_bounded(tmp_path):
+    path = str(tmp_path / 'phash.json')
+    index = PerceptualHashIndex(min_products=2, index_path=path, max_hashes=5, max_urls=8)
+    for product in ('상품1', '상품2'):
+        index.observe(f'https://cdn.example/{product}/notice.jpg', _image_bytes(0), product)
+    for seed in range(1, 21):
+        index.observe(f'https://cdn.example/detail_{seed}.jpg', _image_bytes(seed), f'상품{seed}')
+    assert len(index.hash_products) <= 5
+    assert len(index.url_hashes) == 8
+    assert 'https://cdn.example/detail_20.jpg' in index.url_hashes  # 최근 것은 남음
+    assert 'https://cdn.example/detail_1.jpg' not in index.url_hashes
+    index.save()
+
+    reloaded = PerceptualHashIndex(min_products=2, index_path=path, max_hashes=3, max_urls=4)
+    assert reloaded.boilerplate_hashes == index.boilerplate_hashes  # 학습된 해시는 항상 유지
+    assert len(reloaded.hash_products) == 3
+    assert list(reloaded.url_hashes) == list(index.url_hashes)[-4:]
+    assert reloaded.observe('https://cdn.example/again.jpg', _image_bytes(0), '상품9')
+
+
+def test_lookups_are_safe_while_downloads_observe():
+    index = PerceptualHashIndex(min_products=2)
+    images = [_image_bytes(seed) for seed in range(40)]
+    hashes = [dhash_from_bytes(data) for data in images]
+    errors = []
+
+    def download(worker):
+        try:
+            for seed, data in enumerate(images):
+                index.observe(f'https://cdn.example/{worker}/{seed}.jpg', data, f'상품{worker}')
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=download, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        for dhash in hashes:
+            index.is_boilerplate_hash(dhash)
+        index.is_boilerplate_url('https://cdn.example/0/1.jpg')
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert all(index.is_boilerplate_hash(dhash) for dhash in hashes)
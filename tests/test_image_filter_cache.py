@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+import json
+import time
+
+from utils.image_filter_cache import RejectedImageCache, url_path_prefix
+
+CDN = 'https://cdn.example/web/upload/'
+
+
+def _learn_prefix(cache, count=8):
+    for index in range(count):
+        cache.record_rejected(f"{CDN}icon_{index}.gif")
+    assert url_path_prefix(f"{CDN}x.jpg") in cache.learned_prefixes
+
+
+def test_exact_url_is_skipped_after_rejection():
+    cache = RejectedImageCache()
+    assert cache.check('https://shop.example/a.jpg') is None
+    cache.record_rejected('https://shop.example/a.jpg', '너비 부족')
+    assert cache.check('https://shop.example/a.jpg') == '너비 부족'
+
+
+def test_prefix_learned_after_repeated_rejections():
+    cache = RejectedImageCache(min_rejections=8)
+    for index in range(7):
+        cache.record_rejected(f"{CDN}icon_{index}.gif")
+    assert not cache.learned_prefixes
+    cache.record_rejected(f"{CDN}icon_7.gif")
+    assert url_path_prefix(CDN + 'x') in cache.learned_prefixes
+
+
+def test_learned_prefix_still_probes_samples_and_unlearns():
+    cache = RejectedImageCache(probe_interval=10)
+    _learn_prefix(cache)
+    urls = [f"{CDN}detail_{index}.jpg" for index in range(200)]
+    probed = [url for url in urls if cache.check(url) is None]
+    # 일부만 검증하고, 같은 URL은 항상 같은 판정 (후보 필터와 검증 단계에서 두 번 조회)
+    assert 0 < len(probed) < len(urls)
+    assert [url for url in urls if cache.check(url) is None] == probed
+    cache.record_accepted(probed[0])
+    assert not cache.learned_prefixes
+    assert all(cache.check(url) is None for url in urls)
+
+
+def test_rejected_urls_are_bounded_oldest_first():
+    cache = RejectedImageCache(min_rejections=1000, max_urls=3)
+    for index in range(5):
+        cache.record_rejected(f"https://shop.example/{index}.jpg")
+    assert list(cache.rejected) == [f"https://shop.example/{index}.jpg" for index in (2, 3, 4)]
+
+
+def test_saved_entries_expire(tmp_path):
+    path = str(tmp_path / 'rejected.json')
+    cache = RejectedImageCache(index_path=path, ttl_days=7)
+    _learn_prefix(cache)
+    cache.record_rejected('https://shop.example/fresh.jpg')
+    cache.save()
+
+    assert RejectedImageCache(index_path=path, ttl_days=7).learned_prefixes
+
+    with open(path, encoding='utf-8') as f:
+        saved = json.load(f)
+    stale = time.time() - 8 * 86400
+    saved['learned_prefixes'] = {prefix: stale for prefix in saved['learned_prefixes']}
+    for url, entry in saved['rejected'].items():
+        if url.startswith(CDN):
+            entry[1] = stale
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(saved, f)
+    reloaded = RejectedImageCache(index_path=path, ttl_days=7)
+    assert not reloaded.learned_prefixes
+    assert url_path_prefix(CDN + 'x') not in reloaded.prefix_stats  # 다시 8회 거부되어야 학습
+    assert list(reloaded.rejected) == ['https://shop.example/fresh.jpg']
+
+
+def test_expired_rejection_is_checked_again(monkeypatch):
+    cache = RejectedImageCache(ttl_days=7)
+    cache.record_rejected('https://shop.example/a.jpg')
+    later = time.time() + 8 * 86400
+    monkeypatch.setattr(time, 'time', lambda: later)
+    assert cache.check('https://shop.example/a.jpg') is None
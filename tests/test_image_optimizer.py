@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+import io
+import random
+
+import pytest
+from PIL import Image
+
+from utils import image_optimizer
+from utils.image_optimizer import encode_image, resolve_encoder
+
+
+def _gradient(width=320, height=240):
+    return Image.linear_gradient('L').resize((width, height)).convert('RGB')
+
+
+def _count_saves(monkeypatch):
+    calls = []
+    original = Image.Image.save
+
+    def save(self, fp, format=None, **params):
+        calls.append(format)
+        return original(self, fp, format, **params)
+
+    monkeypatch.setattr(Image.Image, 'save', save)
+    return calls
+
+
+def test_encode_image_skips_baseline_by_default(tmp_path, monkeypatch):
+    calls = _count_saves(monkeypatch)
+    encoder = resolve_encoder({'optimize': True, 'progressive': True})
+    written, baseline = encode_image(_gradient(), str(tmp_path / 'a.jpg'), 90, encoder)
+    assert calls == ['JPEG']
+    assert written == baseline == (tmp_path / 'a.jpg').stat().st_size
+
+
+def test_encode_image_reports_baseline_when_enabled(tmp_path, monkeypatch):
+    calls = _count_saves(monkeypatch)
+    encoder = resolve_encoder({'optimize': True, 'report_baseline': True})
+    written, baseline = encode_image(_gradient(), str(tmp_path / 'a.jpg'), 90, encoder)
+    assert calls == ['JPEG', 'JPEG']
+    assert written == (tmp_path / 'a.jpg').stat().st_size
+    assert baseline > 0
+
+
+def test_default_encoder_matches_plain_jpeg(tmp_path):
+    img = _gradient()
+    encode_image(img, str(tmp_path / 'a.jpg'), 90)
+    img.save(str(tmp_path / 'b.jpg'), 'JPEG', quality=90)
+    assert (tmp_path / 'a.jpg').read_bytes() == (tmp_path / 'b.jpg').read_bytes()
+    assert image_optimizer.DEFAULT_ENCODER['report_baseline'] is False
+
+
+def _noise(width=400, height=300, seed=0):
+    return Image.frombytes('RGB', (width, height), random.Random(seed).randbytes(width * height * 3))
+
+
+def _jpeg_size(img, quality):
+    buffer = io.BytesIO()
+    img.save(buffer, 'JPEG', quality=quality)
+    return buffer.tell()
+
+
+def test_target_bytes_picks_highest_quality_that_fits(tmp_path):
+    img = _noise()
+    sizes = {quality: _jpeg_size(img, quality) for quality in range(50, 91)}
+    target = sizes[72] + 1
+    written, _ = encode_image(img, str(tmp_path / 'a.jpg'), 90, None, target)
+
+    best = max(quality for quality, size in sizes.items() if size <= target)
+    assert written <= target
+    assert written == sizes[best] == (tmp_path / 'a.jpg').stat().st_size
+    assert all(size > target for quality, size in sizes.items() if quality > best)
+
+
+def test_target_bytes_falls_back_to_min_quality(tmp_path):
+    img = _noise()
+    written, _ = encode_image(img, str(tmp_path / 'a.jpg'), 90, {'min_quality': 60}, 1000)
+    assert written == _jpeg_size(img, 60)
+
+
+def test_webp_too_tall_is_saved_as_jpeg(tmp_path):
+    encoder = resolve_encoder({'format': 'WEBP'})
+    if encoder['format'] != 'WEBP':
+        pytest.skip("Pillow WebP 미지원")
+    path = tmp_path / '001_001.webp'
+    written, _ = encode_image(_gradient(700, image_optimizer.WEBP_MAX_DIMENSION + 1), str(path), 90, encoder)
+    assert written == path.stat().st_size
+    assert path.read_bytes()[:2] == b'\xff\xd8'  # JPEG
+
+    encode_image(_gradient(700, 2000), str(path), 90, encoder)
+    assert path.read_bytes()[8:12] == b'WEBP'
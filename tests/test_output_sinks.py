@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+
+from openpyxl import load_workbook
+
+from utils.output_sinks import create_output_sinks
+
+HEADERS = ['상품명', '가격', '비고']
+
+
+def test_all_sinks_keep_rows_and_close_twice_safely(tmp_path):
+    sinks = create_output_sinks(str(tmp_path), 'run', HEADERS, formats=['csv', 'jsonl'])
+    assert [sink.extension for sink in sinks] == ['xlsx', 'csv', 'jsonl']
+    for sink in sinks:
+        sink.write(['공', 1000])
+    # 실패 경로(finally)와 정상 경로에서 모두 닫힐 수 있음
+    for _ in range(2):
+        for sink in sinks:
+            sink.close()
+
+    sheet = load_workbook(tmp_path / 'run.xlsx').active
+    assert [list(row) for row in sheet.iter_rows(values_only=True)] == [HEADERS, ['공', 1000, None]]
+    with open(tmp_path / 'run.csv', encoding='utf-8-sig', newline='') as f:
+        assert list(csv.reader(f)) == [HEADERS, ['공', '1000', '']]
+    with open(tmp_path / 'run.jsonl', encoding='utf-8') as f:
+        assert [json.loads(line) for line in f] == [{'상품명': '공', '가격': 1000, '비고': ''}]
+
+
+def test_streaming_excel_closes_once(tmp_path):
+    sink = create_output_sinks(str(tmp_path), 'run', HEADERS, excel_streaming=True)[0]
+    sink.write(['공', 1000, '메모'])
+    sink.close()
+    sink.close()  # write-only Workbook은 두 번 저장하면 예외
+    sheet = load_workbook(tmp_path / 'run.xlsx').active
+    assert sheet.max_row == 2
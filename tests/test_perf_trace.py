@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+from utils.perf_trace import PerfTracer
+
+
+def test_spans_are_written_and_summarized(tmp_path):
+    path = tmp_path / 'perf_spans.jsonl'
+    perf = PerfTracer(str(path))
+    perf.record('download', 0.5, product=1)
+    perf.record('download', 0.25, product=1)
+    perf.record('download', 1.0, product=2)
+    perf.close()
+
+    lines = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    assert [(line['product'], line['ms']) for line in lines] == [(1, 500.0), (1, 250.0), (2, 1000.0)]
+    summary = perf.summary()['download']
+    assert (summary['count'], summary['total'], summary['max']) == (2, 1.75, 1.0)
+
+
+def test_record_after_close_does_not_reopen_file(tmp_path):
+    path = tmp_path / 'perf_spans.jsonl'
+    perf = PerfTracer(str(path))
+    perf.record('download', 0.5, product=1)
+    perf.close()
+    perf.record('thumbnail', 0.5, product=1)  # 늦게 끝난 백그라운드 작업
+
+    assert perf.file is None
+    assert len(path.read_text(encoding='utf-8').splitlines()) == 1
+    assert 'thumbnail' in perf.summary()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+
+from openpyxl import load_workbook
+
+from utils.product_store import ProductStore, ProductStoreSink, canonical_product_id
+
+HEADERS = ['상품명', '가격', '이미지1URL']
+
+
+def _hash(row, images=None):
+    return ProductStore.content_hash(HEADERS, row, images)
+
+
+def test_canonical_product_id():
+    assert canonical_product_id('https://shop.example/product/detail.html?product_no=123&cate_no=4') == '123'
+    assert canonical_product_id('https://shop.example/product/공/456/category/1/') == '456'
+    assert canonical_product_id('https://shop.example/goods/view/?x=1#top') == 'shop.example/goods/view'
+
+
+def test_content_hash_ignores_volatile_columns():
+    assert _hash(['공', 1000, 'run1/1_cr.jpg']) == _hash(['공', 1000, 'run2/7_cr.jpg'])
+    assert _hash(['공', 1000, '']) != _hash(['공', 1100, ''])
+    assert _hash(['공', 1000, ''], ['a.jpg']) != _hash(['공', 1000, ''], ['b.jpg'])
+
+
+def test_upsert_reports_new_changed_unchanged(tmp_path):
+    store = ProductStore(str(tmp_path / 'products.sqlite'), 'shop')
+    row = ['공', 1000, 'run1/1_cr.jpg']
+    assert store.upsert('run1', '1', 'u1', '공', _hash(row), row) == 'new'
+    assert store.upsert('run1', '2', 'u2', '줄', _hash(['줄', 500, '']), ['줄', 500, '']) == 'new'
+
+    moved = ['공', 1000, 'run2/3_cr.jpg']
+    assert store.upsert('run2', '1', 'u1', '공', _hash(moved), moved) == 'unchanged'
+    assert list(store.changed_rows('run2')) == []
+    repriced = ['공', 1200, 'run2/3_cr.jpg']
+    assert store.upsert('run2', '1', 'u1', '공', _hash(repriced), repriced) == 'changed'
+    assert list(store.changed_rows('run2')) == [repriced]
+    assert store.unseen_products('run2') == [('2', 'u2', '줄', 'run1')]
+    store.close()
+
+    # 다른 사이트는 같은 상품 번호라도 별도 상품, 파일을 다시 열어도 유지
+    reopened = ProductStore(str(tmp_path / 'products.sqlite'), 'other')
+    assert reopened.upsert('run3', '1', 'u1', '공', _hash(row), row) == 'new'
+    count = reopened.connection.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+    stored = reopened.connection.execute(
+        "SELECT row_json, first_seen_run, changed_run FROM products WHERE site = 'shop' AND product_id = '1'"
+    ).fetchone()
+    reopened.close()
+    assert count == 3
+    assert (json.loads(stored[0]), stored[1], stored[2]) == (repriced, 'run1', 'run2')
+
+
+def test_sink_exports_delta_and_delisted(tmp_path):
+    db_path = str(tmp_path / 'products.sqlite')
+    products = [{'url': f'https://shop.example/p?product_no={number}', 'data': {'상품명': name}}
+                for number, name in ((1, '공'), (2, '줄'))]
+
+    first = ProductStoreSink(db_path, 'shop', 'run1', HEADERS, str(tmp_path), 'run1')
+    first.write(['공', 1000, ''], products[0])
+    first.write(['줄', 500, ''], products[1])
+    first.close()
+    assert first.counts == {'new': 2, 'changed': 0, 'unchanged': 0}
+
+    second = ProductStoreSink(db_path, 'shop', 'run2', HEADERS, str(tmp_path), 'run2')
+    second.write(['공', 1200, ''], products[0])
+    second.close()
+    second.close()
+    assert second.counts == {'new': 0, 'changed': 1, 'unchanged': 0}
+
+    sheet = load_workbook(tmp_path / 'run2_delta.xlsx').active
+    assert [list(row) for row in sheet.iter_rows(values_only=True)] == [HEADERS, ['공', 1200, None]]
+    with open(tmp_path / 'run2_delisted.csv', encoding='utf-8-sig', newline='') as f:
+        assert list(csv.reader(f))[1] == ['2', products[1]['url'], '줄', 'run1']
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+
+from utils.render_pool import ImageRenderPool, _warm_up_worker
+
+
+def test_spawn_pool_runs_jobs_in_worker_processes():
+    pool = ImageRenderPool(2, start_method='spawn')
+    try:
+        assert pool.mode == 'process'
+        pids = asyncio.run(_run_many(pool, 4))
+    finally:
+        pool.close()
+    assert os.getpid() not in pids
+
+
+async def _run_many(pool, count):
+    return set(await asyncio.gather(*(pool.run(_warm_up_worker) for _ in range(count))))
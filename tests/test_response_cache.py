@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+import time
+import types
+
+from utils.response_cache import ImageResponseCache
+
+
+def _body(size, fill=b'x'):
+    return fill * size
+
+
+def test_small_bodies_are_not_cached():
+    cache = ImageResponseCache(min_bytes=100)
+    cache.put('https://cdn.example/icon.gif', _body(99))
+    assert cache.get('https://cdn.example/icon.gif') is None
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_lru_eviction_spills_to_disk(tmp_path):
+    cache = ImageResponseCache(max_memory_bytes=250, min_bytes=1, disk_dir=str(tmp_path))
+    cache.put('a', _body(100, b'a'))
+    cache.put('b', _body(100, b'b'))
+    assert cache.get('a') == _body(100, b'a')  # a가 최근 사용, b가 가장 오래됨
+    cache.put('c', _body(100, b'c'))
+
+    assert list(cache.entries) == ['a', 'c']
+    assert cache.memory_bytes == 200
+    assert cache.get('b') == _body(100, b'b')  # 디스크에서 읽음
+    assert cache.hits == 2
+    assert cache.bytes_saved == 200
+
+
+def test_disk_is_trimmed_to_limit(tmp_path):
+    cache = ImageResponseCache(max_memory_bytes=100, min_bytes=1, disk_dir=str(tmp_path), max_disk_bytes=250)
+    for name in 'abcde':
+        cache.put(name, _body(100, name.encode()))
+    assert cache.disk_bytes <= 250
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def _response(url, status=200, resource_type='image', body=b'y' * 64):
+    async def read_body():
+        return body
+    return types.SimpleNamespace(url=url, status=status, body=read_body,
+                                 request=types.SimpleNamespace(resource_type=resource_type))
+
+
+def test_only_filtered_image_responses_are_captured():
+    cache = ImageResponseCache(min_bytes=1, url_filter=lambda url: '/detail/' in url)
+    responses = [
+        _response('https://cdn.example/detail/1.jpg'),
+        _response('https://cdn.example/detail/2.jpg', status=304),
+        _response('https://cdn.example/detail/3.js', resource_type='script'),
+        _response('https://cdn.example/banner/4.jpg'),
+    ]
+    for response in responses:
+        asyncio.run(cache._on_response(response))
+    assert list(cache.entries) == ['https://cdn.example/detail/1.jpg']
+
+
+def test_disk_limit_counts_files_from_earlier_runs(tmp_path):
+    first = ImageResponseCache(max_memory_bytes=100, min_bytes=1, disk_dir=str(tmp_path))
+    for name in 'abc':
+        first.put(name, _body(100, name.encode()))
+    assert first.disk_bytes == 200
+
+    second = ImageResponseCache(max_memory_bytes=100, min_bytes=1, disk_dir=str(tmp_path), max_disk_bytes=150)
+    assert second.disk_bytes == 100
+    assert len(list(tmp_path.iterdir())) == 1
+    assert second.get('b') == _body(100, b'b')  # 가장 최근에 밀려난 파일만 남음
+
+
+def test_expired_entries_are_misses(tmp_path, monkeypatch):
+    cache = ImageResponseCache(max_memory_bytes=100, min_bytes=1, disk_dir=str(tmp_path), max_age_seconds=60)
+    cache.put('old', _body(100, b'o'))
+    cache.put('new', _body(100, b'n'))  # old는 디스크로 이동
+    later = time.time() + 120
+    monkeypatch.setattr(time, 'time', lambda: later)
+
+    assert cache.get('old') is None
+    assert cache.get('new') is None
+    assert cache.memory_bytes == 0
+    assert cache.disk_bytes == 0
+    assert not list(tmp_path.iterdir())
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_expired_files_are_removed_at_startup(tmp_path):
+    stale = tmp_path / 'stale'
+    stale.write_bytes(_body(100))
+    old = time.time() - 7200
+    os.utime(stale, (old, old))
+    cache = ImageResponseCache(min_bytes=1, disk_dir=str(tmp_path), max_age_seconds=3600)
+    assert cache.disk_bytes == 0
+    assert not stale.exists()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime
+
+import pytest
+
+from utils.row_template import ROW_LAYOUT, MarketRowTemplate
+
+HEADERS = [header for header, _ in ROW_LAYOUT]
+NOW = datetime(2026, 3, 7, 9, 5)
+RUN = dict(brandname="브랜드", category="50001234", code="kr", tdate="202603070905", now=NOW)
+
+
+def _legacy_row(image_counter, product_name, price, options, brandname, category, code, tdate, now, image_ext='jpg'):
+    """템플릿 도입 전 main.py의 행 생성 (비교 기준)"""
+    option_string = ""
+    if options:
+        option_string = "[필수선택]\n" + "\n".join(f"{option_name}==0=10000=0=0=0=" for option_name in options)
+        if option_string.count("10000") == 1:
+            option_string = ""
+    product_code = str(now)[3:4] + str(now)[5:7] + str(now)[8:10] + code + str(image_counter)
+    thumbnail_url = f"http://ai.esmplus.com/tstkimtt/{tdate}{code}/cr/{image_counter}_cr.{image_ext}"
+    detail_description = "<center> <img src='http://gi.esmplus.com/tstkimtt/head.jpg' /><br>"
+    for i in range(1, 11):
+        detail_description += f"<img src='http://ai.esmplus.com/tstkimtt/{tdate}{code}/output/{image_counter:03}_{i:03}.{image_ext}' /><br />"
+    detail_description += "<img src='http://gi.esmplus.com/tstkimtt/deliver.jpg' /></center>"
+    option_type = "" if option_string == "" else "SM"
+    return ([product_code, "", brandname, brandname, "국내=서울=강남구", product_name, "", "", category, code + tdate,
+             "", "", "", "", price, "선결제", "3500", "0", "y", "9000", thumbnail_url, thumbnail_url]
+            + [""] * 9 + [option_type, option_string, "", "", "", detail_description]
+            + ["", "", "", "", "", "쿠폰", "", "c"] + [""] * 7 + ["25"] + [""] * 8
+            + ["상세설명일괄참조"] * 6 + ["N"] + ["상세설명일괄참조"] * 5 + [thumbnail_url])
+
+
+@pytest.mark.parametrize('image_counter, options, image_ext', [
+    (1, None, 'jpg'),
+    (7, ['빨강'], 'jpg'),  # 옵션 1개는 빈 값
+    (123, ['빨강', '파랑'], 'webp'),
+])
+def test_rows_match_legacy_builder(image_counter, options, image_ext):
+    template = MarketRowTemplate(HEADERS, image_ext=image_ext, **RUN)
+    row = template.build(image_counter, "상품 이름", 15000, options)
+    assert len(row) == len(HEADERS)
+    assert row == _legacy_row(image_counter, "상품 이름", 15000, options, image_ext=image_ext, **RUN)
+
+
+def test_rows_do_not_share_state():
+    template = MarketRowTemplate(HEADERS, **RUN)
+    first = template.build(1, "첫 상품", 1000, ['a', 'b'])
+    second = template.build(2, "둘째 상품", 2000)
+    assert first[HEADERS.index("상품명")] == "첫 상품"
+    assert first[HEADERS.index("옵션타입")] == "SM"
+    assert second[HEADERS.index("옵션타입")] == ""
+    assert template.base_row[HEADERS.index("상품명")] is None
+
+
+def test_header_order_mismatch_is_rejected():
+    with pytest.raises(ValueError):
+        MarketRowTemplate(list(reversed(HEADERS)), **RUN)
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from utils.run_profiler import PROFILE_FILENAME, REPORT_FILENAME, run_profiled
+
+
+def _worker_profile_hook():
+    return sys.getprofile() is None
+
+
+def test_run_profiled_without_mode_returns_result(tmp_path):
+    async def crawl():
+        return 7
+
+    assert run_profiled(lambda: crawl(), None, str(tmp_path)) == 7
+    assert os.listdir(tmp_path) == []
+
+
+def test_run_profiled_writes_report(tmp_path):
+    async def crawl():
+        await asyncio.sleep(0.01)
+        return 'done'
+
+    assert run_profiled(lambda: crawl(), 'cprofile', str(tmp_path), 5) == 'done'
+    assert (tmp_path / REPORT_FILENAME).exists()
+    assert (tmp_path / PROFILE_FILENAME).exists()
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason="fork 미지원")
+def test_forked_workers_do_not_inherit_profile_hook(tmp_path):
+    # 프로파일 중에 처음 fork되는 렌더링 워커와 같은 상황
+    executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('fork'))
+
+    async def crawl():
+        return await asyncio.get_running_loop().run_in_executor(executor, _worker_profile_hook)
+
+    try:
+        assert run_profiled(lambda: crawl(), 'cprofile', str(tmp_path)) is True
+    finally:
+        executor.shutdown()
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import random
+
+from PIL import Image, ImageDraw, ImageFont
+
+from utils import image_optimizer
+from utils.image_optimizer import (BADGE_BOX, _render_thumbnail_template, get_fitting_font,
+                                   normalize_thumbnail_variants, render_thumbnail)
+
+
+def _photo_png(width, height, seed=0):
+    img = Image.frombytes('RGB', (width, height), random.Random(seed).randbytes(width * height * 3))
+    buffer = io.BytesIO()
+    img.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def _default_fonts(monkeypatch):
+    """폰트 파일 없이 Pillow 기본 TrueType 폰트로 크기별 측정"""
+    monkeypatch.setattr(image_optimizer, 'load_font', lambda font_path, font_size: ImageFont.load_default(font_size))
+
+
+def _linear_fitting_size(draw, text, max_width, max_font_size=80, min_font_size=32):
+    """기존 방식: 큰 크기부터 2pt씩 줄이며 처음 들어가는 크기"""
+    for font_size in range(max_font_size, min_font_size - 1, -2):
+        bbox = draw.textbbox((0, 0), text, font=ImageFont.load_default(font_size))
+        if bbox[2] - bbox[0] <= max_width:
+            return font_size
+    return min_font_size
+
+
+def test_binary_search_font_size_matches_linear_search(monkeypatch):
+    _default_fonts(monkeypatch)
+    draw = ImageDraw.Draw(Image.new('RGB', (650, 650)))
+    for length in range(1, 17):
+        text = ('상품명ABCwij' * 2)[:length]
+        for max_width in (120, 300, 600):
+            font = get_fitting_font(draw, text, max_width, 'default-test-font', 80, 32)
+            assert font.size == _linear_fitting_size(draw, text, max_width), (text, max_width)
+
+
+def _capture_canvases(monkeypatch):
+    canvases = []
+
+    def encode(img, path, quality, encoder=None, target_bytes=None):
+        canvases.append(img.copy())
+        return 0, 0
+
+    monkeypatch.setattr(image_optimizer, 'encode_image', encode)
+    return canvases
+
+
+def test_template_thumbnail_matches_drawing_from_scratch(tmp_path, monkeypatch):
+    canvases = _capture_canvases(monkeypatch)
+    # 가로/세로로 긴 원본도 상품 이미지가 배지/회색 영역과 겹치지 않아야 함
+    sources = [_photo_png(900, 600, 1), _photo_png(300, 1200, 2), _photo_png(2000, 300, 3)]
+    for source in sources:
+        render_thumbnail(source, '테스트 상품-이름이 긴 경우', str(tmp_path / 'a.jpg'))
+    assert image_optimizer.get_thumbnail_template() is image_optimizer.get_thumbnail_template()
+
+    # 기존 방식: 매번 새 캔버스에 그리고, 배지는 상품 이미지 위에 마지막으로 그림
+    badge = _render_thumbnail_template(True).crop(BADGE_BOX)
+    monkeypatch.setattr(image_optimizer, 'get_thumbnail_template', lambda badge=True: _render_thumbnail_template(False))
+    for source in sources:
+        render_thumbnail(source, '테스트 상품-이름이 긴 경우', str(tmp_path / 'b.jpg'))
+    for canvas in canvases[len(sources):]:
+        canvas.paste(badge, BADGE_BOX[:2])
+
+    cached, scratch = canvases[:len(sources)], canvases[len(sources):]
+    assert all(a.tobytes() == b.tobytes() for a, b in zip(cached, scratch))
+
+
+def test_thumbnail_variants_are_written_with_expected_sizes(tmp_path):
+    variants = normalize_thumbnail_variants([{'size': 300, 'name': 'm'}, 120, {'size': 200, 'name': 'plain', 'badge': False},
+                                             0, 700])
+    assert [v['name'] for v in variants] == ['m', '120', 'plain']
+    thumbnail_path = str(tmp_path / '3_cr.jpg')
+    paths, written, baseline = render_thumbnail(_photo_png(800, 800), '상품', thumbnail_path, variants=variants)
+
+    assert sorted(os.path.basename(path) for path in paths) == ['3_cr_120.jpg', '3_cr_m.jpg', '3_cr_plain.jpg']
+    assert written == sum(os.path.getsize(path) for path in paths + [thumbnail_path])
+    sizes = {os.path.basename(path): Image.open(path).size for path in paths}
+    assert sizes == {'3_cr_m.jpg': (300, 300), '3_cr_120.jpg': (120, 120), '3_cr_plain.jpg': (200, 200)}
+    # 배지 없는 크기는 우측 상단이 흰색, 배지 포함 크기는 파란색
+    with Image.open(str(tmp_path / '3_cr_plain.jpg')) as plain, Image.open(str(tmp_path / '3_cr_m.jpg')) as badged:
+        assert min(plain.convert('RGB').getpixel((195, 5))) > 230
+        assert badged.convert('RGB').getpixel((292, 5))[2] > 150 > badged.convert('RGB').getpixel((292, 5))[0]
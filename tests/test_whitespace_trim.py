@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+import io
+
+import pytest
+from PIL import Image, ImageDraw
+
+from utils import whitespace_trim
+from utils.whitespace_trim import find_content_segments
+
+pytestmark = pytest.mark.skipif(not whitespace_trim.is_available(), reason="NumPy 필요")
+
+
+def _open(bands, width=800, height=2000, image_format='PNG'):
+    """흰 바탕에 검은 가로 띠 [(top, bottom), ...]를 그린 이미지를 디코딩 전 상태로 반환"""
+    img = Image.new('RGB', (width, height), 'white')
+    draw = ImageDraw.Draw(img)
+    for top, bottom in bands:
+        draw.rectangle((100, top, width - 100, bottom - 1), fill='black')
+    buffer = io.BytesIO()
+    img.save(buffer, image_format)
+    return Image.open(io.BytesIO(buffer.getvalue()))
+
+
+def _covers(segments, band):
+    return any(top <= band[0] and band[1] <= bottom for top, bottom in segments)
+
+
+def test_blank_image_has_no_content():
+    assert find_content_segments(_open([]), (800, 2000)) == []
+
+
+@pytest.mark.parametrize('image_format', ['PNG', 'JPEG'])
+def test_margins_and_long_gaps_are_removed(image_format):
+    bands = [(300, 500), (1200, 1400)]
+    segments = find_content_segments(_open(bands, image_format=image_format), (800, 2000))
+
+    assert len(segments) == 2
+    assert all(_covers(segments, band) for band in bands)
+    kept = sum(bottom - top for top, bottom in segments)
+    assert kept < 600  # 내용 400px + 여백 (분석 해상도 오차 포함)
+    assert all(0 <= top < bottom <= 2000 for top, bottom in segments)
+
+
+def test_short_gaps_are_kept():
+    bands = [(300, 500), (550, 700)]
+    segments = find_content_segments(_open(bands), (800, 2000), {'min_gap': 100})
+    assert len(segments) == 1
+    assert _covers(segments, (300, 700))
+
+
+def test_segments_use_output_coordinates():
+    # 너비 상한 축소 후 크기(절반)로 요청하면 구간도 절반 좌표
+    segments = find_content_segments(_open([(800, 1000)]), (400, 1000))
+    assert len(segments) == 1
+    assert _covers(segments, (400, 500))
+    assert segments[0][1] <= 560
+
+
+def test_without_numpy_uses_whole_image(monkeypatch):
+    monkeypatch.setattr(whitespace_trim, 'np', None)
+    assert find_content_segments(_open([(300, 500)]), (800, 2000)) is None
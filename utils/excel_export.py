@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+엑셀 결과 파일 저장
+
+기본 모드는 기존과 같이 일반 Workbook에 모든 행을 모아 두었다가 마지막에 저장한다.
+스트리밍 모드(config.py의 EXCEL_STREAMING = True)는 openpyxl write-only Workbook을 사용하여
+상품이 끝날 때마다 행을 임시 파일로 흘려보내므로 상품 수가 많아도 메모리가 늘지 않는다.
+두 모드 모두 첫 행은 같은 헤더, 시트 이름은 'Sheet'로 같은 파일 구조를 만든다.
+"""
+
+import os
+
+from openpyxl import Workbook
+
+
+class ExcelExporter:
+    """헤더 + 상품 행을 .xlsx 파일로 저장 (일반/스트리밍 모드)"""
+
+    def __init__(self, path, headers, streaming=False):
+        self.path = path
+        self.headers = list(headers)
+        self.streaming = streaming
+        self.row_count = 0
+        self.closed = False
+        if streaming:
+            self.workbook = Workbook(write_only=True)
+            self.sheet = self.workbook.create_sheet('Sheet')
+        else:
+            self.workbook = Workbook()
+            self.sheet = self.workbook.active
+        self.sheet.append(self.headers)
+
+    def append(self, row):
+        """상품 행 추가"""
+        self.sheet.append(row)
+        self.row_count += 1
+
+    def close(self):
+        """파일 저장 (write-only Workbook은 한 번만 저장할 수 있으므로 두 모드 모두 한 번만 저장)"""
+        if self.closed:
+            return self.path
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.workbook.save(self.path)
+        self.closed = True
+        mode = "스트리밍" if self.streaming else "일반"
+        print(f"[EXCEL] 엑셀 파일 저장 완료 ({mode}, {self.row_count}행): {self.path}")
+        return self.path
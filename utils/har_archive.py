@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+HAR 기록/재생 (오프라인 재현 실행)
+
+실제 공급사 페이지를 한 번 기록해 두고, 이후에는 네트워크 없이 같은 응답으로
+선택자 탐지/추출/이미지 처리를 반복 실행하여 성능을 비교하기 위한 기능.
+
+- 브라우저(Playwright) 트래픽: record_har_path로 기록, context.route_from_har로 재생
+- requests 트래픽(이미지 검증/다운로드): 세션에 어댑터를 붙여 같은 형식(HAR)으로 기록/재생
+  (재생 시 기록에 없는 requests 요청은 브라우저 기록에서 찾고, 둘 다 없으면 404)
+
+config.py에 정의한 경우만 사용:
+- HAR_MODE = 'record'   실행하면서 기록
+- HAR_MODE = 'replay'   기록된 응답으로 실행 (네트워크 사용 안 함)
+- HAR_DIR = '...'       기록 폴더 (기본: images/_har/{SITE_NAME}/)
+"""
+
+import base64
+import hashlib
+import io
+import json
+import mimetypes
+import os
+import threading
+import zipfile
+from datetime import datetime, timezone
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from utils.options import get_option
+
+BROWSER_ARCHIVE = 'browser.har.zip'
+REQUESTS_ARCHIVE = 'requests.har.zip'
+# 본문은 압축을 푼 상태로 저장하므로 재생 시 전송 관련 헤더는 제외 (Content-Length는 본문 길이로 다시 설정)
+SKIPPED_HEADERS = {'content-encoding', 'transfer-encoding', 'connection'}
+
+
+class HarArchive:
+    """HAR 파일(.har 또는 Playwright 형식 .zip)의 응답 조회
+
+    응답 본문은 조회할 때 읽음 (기록 전체를 메모리에 올리지 않고, zip 파일도 열어 두지 않음)
+    """
+
+    def __init__(self, paths):
+        self.entries = {}  # (method, url) -> (status, headers, size, 본문 위치)
+        self.loaded = []
+        for path in paths:
+            if os.path.exists(path):
+                count = self._load(path)
+                self.loaded.append((path, count))
+
+    def _load(self, path):
+        if zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as archive:
+                har_name = next(name for name in archive.namelist() if name.endswith('.har'))
+                har = json.loads(archive.read(har_name).decode('utf-8'))
+                file_sizes = {info.filename: info.file_size for info in archive.infolist()}
+
+            def file_source(name):
+                return ('zip', path, name), file_sizes.get(name, 0)
+        else:
+            with open(path, encoding='utf-8') as f:
+                har = json.load(f)
+            base_dir = os.path.dirname(path)
+
+            def file_source(name):
+                file_path = os.path.join(base_dir, name)
+                return ('file', file_path, None), os.path.getsize(file_path)
+
+        count = 0
+        for entry in har.get('log', {}).get('entries', []):
+            request, response = entry.get('request', {}), entry.get('response', {})
+            key = (request.get('method', 'GET').upper(), request.get('url'))
+            if key in self.entries or not key[1] or response.get('status', 0) <= 0:
+                continue  # 같은 URL은 먼저 기록된 응답 사용, 중단된 요청 제외
+            content = response.get('content', {})
+            if content.get('_file'):
+                source, size = file_source(content['_file'])
+            else:
+                if content.get('encoding') == 'base64':
+                    body = base64.b64decode(content.get('text', ''))
+                else:
+                    body = content.get('text', '').encode('utf-8')
+                source, size = ('inline', body, None), len(body)
+            headers = [(h['name'], h['value']) for h in response.get('headers', [])
+                       if h['name'].lower() not in SKIPPED_HEADERS]
+            self.entries[key] = (response['status'], headers, size, source)
+            count += 1
+        return count
+
+    @staticmethod
+    def _read_body(source):
+        kind, location, name = source
+        if kind == 'inline':
+            return location
+        if kind == 'zip':
+            with zipfile.ZipFile(location) as archive:
+                return archive.read(name)
+        with open(location, 'rb') as f:
+            return f.read()
+
+    def lookup(self, method, url):
+        """(status, headers, size, body) 또는 None
+
+        HEAD는 본문 길이를 알 수 있는 GET 기록 우선, 본문은 읽지 않음 (b'')
+        """
+        method = method.upper()
+        if method == 'HEAD':
+            found = self.entries.get(('GET', url)) or self.entries.get(('HEAD', url))
+        else:
+            found = self.entries.get((method, url))
+        if found is None:
+            return None
+        status, headers, size, source = found
+        body = b'' if method == 'HEAD' else self._read_body(source)
+        return status, headers, size, body
+
+
+class HarReplayAdapter(BaseAdapter):
+    """requests 세션용 재생 어댑터 (네트워크 대신 기록된 응답 반환)"""
+
+    def __init__(self, archive):
+        super().__init__()
+        self.archive = archive
+        self.hits = 0
+        self.misses = 0
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        found = self.archive.lookup(request.method, request.url)
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        if found is None:
+            self.misses += 1
+            status, headers, size, body = 404, [('X-Har-Replay', 'miss')], 0, b''
+        else:
+            self.hits += 1
+            status, headers, size, body = found
+        response.status_code = status
+        response.reason = 'OK' if status == 200 else ''
+        response.headers = CaseInsensitiveDict(headers)
+        if size or 'Content-Length' not in response.headers:
+            response.headers['Content-Length'] = str(size)  # HEAD 기록은 원래 길이 유지
+        response.encoding = get_encoding_from_headers(response.headers)
+        # 본문은 raw로 제공 (stream=True 요청의 iter_content/close도 실제 응답처럼 동작)
+        response.raw = io.BytesIO(body)
+        return response
+
+    def close(self):
+        pass
+
+
+class HarRecordAdapter(HTTPAdapter):
+    """requests 세션용 기록 어댑터 (실제 요청 후 응답을 HAR 항목으로 보관)"""
+
+    def __init__(self, recorder, **kwargs):
+        super().__init__(**kwargs)
+        self.recorder = recorder
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        body = b'' if request.method.upper() == 'HEAD' else response.content  # 스트리밍 응답도 본문 전체 읽음
+        self.recorder.add(request.method, request.url, response.status_code, response.headers.items(), body)
+        return response
+
+
+class HarRecorder:
+    """HAR 항목 수집 후 Playwright와 같은 zip 형식(har.har + 본문 파일)으로 저장"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = {}
+
+    def add(self, method, url, status, headers, body):
+        key = (method.upper(), url)
+        with self.lock:
+            if key not in self.entries:
+                self.entries[key] = (status, list(headers), body, datetime.now(timezone.utc).isoformat())
+
+    def save(self):
+        with self.lock:
+            entries = list(self.entries.items())
+        har_entries = []
+        written_files = set()
+        with zipfile.ZipFile(self.path, 'w', zipfile.ZIP_STORED) as archive:
+            for (method, url), (status, headers, body, started) in entries:
+                mime_type = dict((name.lower(), value) for name, value in headers).get('content-type', '')
+                content = {'size': len(body), 'mimeType': mime_type}
+                if body:
+                    extension = mimetypes.guess_extension(mime_type.split(';')[0].strip()) or '.dat'
+                    file_name = hashlib.sha1(body).hexdigest() + extension
+                    if file_name not in written_files:
+                        archive.writestr(file_name, body)
+                        written_files.add(file_name)
+                    content['_file'] = file_name
+                har_entries.append({
+                    'startedDateTime': started,
+                    'time': 0,
+                    'request': {'method': method, 'url': url, 'httpVersion': 'HTTP/1.1', 'headers': [],
+                                'queryString': [], 'cookies': [], 'headersSize': -1, 'bodySize': 0},
+                    'response': {'status': status, 'statusText': '', 'httpVersion': 'HTTP/1.1',
+                                 'headers': [{'name': name, 'value': value} for name, value in headers],
+                                 'cookies': [], 'content': content, 'redirectURL': '',
+                                 'headersSize': -1, 'bodySize': len(body)},
+                    'cache': {}, 'timings': {'send': 0, 'wait': 0, 'receive': 0},
+                })
+            har = {'log': {'version': '1.2', 'creator': {'name': 'croller', 'version': '1'}, 'entries': har_entries}}
+            archive.writestr('har.har', json.dumps(har, ensure_ascii=False))
+        return len(har_entries)
+
+
+class HarSession:
+    """브라우저 컨텍스트와 requests 세션에 기록/재생 적용"""
+
+    def __init__(self, mode, directory):
+        self.mode = mode
+        self.directory = directory
+        self.browser_archive = os.path.join(directory, BROWSER_ARCHIVE)
+        self.requests_archive = os.path.join(directory, REQUESTS_ARCHIVE)
+        self.recorder = None
+        self.archive = None
+        self.adapters = []
+        if mode == 'record':
+            os.makedirs(directory, exist_ok=True)
+            self.recorder = HarRecorder(self.requests_archive)
+            print(f"[HAR] 기록 모드: {directory}")
+        else:
+            self.archive = HarArchive([self.requests_archive, self.browser_archive])
+            if not os.path.exists(self.browser_archive):
+                print(f"[WARNING] 브라우저 기록이 없습니다: {self.browser_archive}")
+            for path, count in self.archive.loaded:
+                print(f"[HAR] 재생 모드: {path} ({count}개 응답)")
+
+    def context_options(self):
+        """browser.new_context에 추가할 인자"""
+        if self.mode == 'record':
+            return {'record_har_path': self.browser_archive, 'record_har_content': 'attach'}
+        return {}
+
+    async def attach(self, context):
+        """재생 모드: 브라우저 요청을 기록된 응답으로 처리 (기록에 없으면 차단)"""
+        if self.mode == 'replay' and os.path.exists(self.browser_archive):
+            await context.route_from_har(self.browser_archive, not_found='abort')
+
+    def mount(self, session):
+        """requests 세션의 http/https 요청에 기록/재생 어댑터 적용"""
+        adapter = HarRecordAdapter(self.recorder) if self.mode == 'record' else HarReplayAdapter(self.archive)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        self.adapters.append(adapter)
+        return session
+
+    def close(self):
+        """기록 모드: requests 기록 저장 / 재생 모드: 기록에 없던 요청 수 보고"""
+        if self.recorder is not None:
+            count = self.recorder.save()
+            print(f"[HAR] requests 응답 {count}개 기록: {self.requests_archive}")
+            self.recorder = None
+        elif self.mode == 'replay':
+            hits = sum(adapter.hits for adapter in self.adapters)
+            misses = sum(adapter.misses for adapter in self.adapters)
+            print(f"[HAR] requests 재생: 기록 사용 {hits}회, 기록 없음(404) {misses}회")
+
+
+def create_har_session(base_path, site):
+    """config.py의 HAR_MODE가 'record'/'replay'일 때만 HarSession 생성"""
+    mode = get_option('HAR_MODE')
+    if not mode:
+        return None
+    mode = str(mode).lower()
+    if mode not in ('record', 'replay'):
+        print(f"[WARNING] 알 수 없는 HAR_MODE 무시: {mode}")
+        return None
+    directory = get_option('HAR_DIR') or os.path.join(os.path.dirname(base_path), '_har', site)
+    return HarSession(mode, directory)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+상세이미지 지각 해시(dHash) 인덱스
+
+여러 상품에 반복해서 붙는 공통 이미지(안내 배너, 로딩 gif, 배송 안내 등)를
+사이트 단위로 학습하고, 다운로드/결합/분할 전에 상세이미지 목록에서 제외한다.
+"""
+
+import io
+import json
+import os
+from collections import OrderedDict
+from threading import Lock
+
+from PIL import Image
+
+
+def compute_dhash(img, hash_size=8):
+    """이미지 차이 해시(dHash) 계산 - 64비트 정수"""
+    gray = img.convert('L').resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR)
+    pixels = gray.tobytes()  # L 모드: 픽셀당 1바이트
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (1 if pixels[offset + col] > pixels[offset + col + 1] else 0)
+    return value
+
+
+def dhash_from_bytes(data, hash_size=8):
+    """이미지 바이트에서 dHash 계산 (JPEG은 축소 디코딩으로 빠르게 처리)"""
+    with Image.open(io.BytesIO(data)) as img:
+        # 해시는 9x8 픽셀만 필요하므로 원본 해상도로 디코딩할 필요가 없음
+        img.draft('L', (hash_size * 8, hash_size * 8))
+        return compute_dhash(img, hash_size)
+
+
+def hamming_distance(a, b):
+    """두 해시의 비트 차이 개수"""
+    return bin(a ^ b).count('1')
+
+
+class PerceptualHashIndex:
+    """상품 간 반복 이미지 학습 인덱스 (해시 -> 등장한 상품 집합)
+
+    공통 이미지로 학습된 해시는 모두 보관하고, 아직 학습 전인 후보 해시와 URL -> 해시는
+    최근 사용 순으로 max_hashes / max_urls개까지만 보관한다 (저장 파일과 비교 대상이 계속
+    늘지 않도록). 다운로드 스레드의 observe()와 이벤트 루프의 조회가 동시에 일어나므로
+    모든 조회/갱신은 self.lock 안에서 한다.
+    """
+
+    def __init__(self, min_products=3, max_distance=4, index_path=None, max_hashes=2000, max_urls=5000):
+        self.min_products = min_products  # 이 개수 이상의 상품에서 등장하면 공통 이미지로 판단
+        self.max_distance = max_distance  # 동일 이미지로 볼 해밍 거리 (재압축/리사이즈 허용)
+        self.index_path = index_path
+        self.max_hashes = max_hashes
+        self.max_urls = max_urls
+        self.hash_products = OrderedDict()  # 학습 전 후보 dHash -> 등장한 상품 키 집합 (오래된 순)
+        self.url_hashes = OrderedDict()  # URL -> dHash (같은 URL 재다운로드 방지, 오래된 순)
+        self.boilerplate_hashes = set()
+        self.lock = Lock()
+        self.dropped_count = 0
+        if index_path:
+            self.load()
+
+    def _find_similar(self, dhash, candidates):
+        """해밍 거리 기준으로 가장 먼저 일치하는 기존 해시 반환 (self.lock 안에서 호출)"""
+        if dhash in candidates:
+            return dhash
+        for known in candidates:
+            if hamming_distance(dhash, known) <= self.max_distance:
+                return known
+        return None
+
+    @staticmethod
+    def _trim(entries, limit):
+        """오래된 항목부터 제거하여 limit개 유지"""
+        while len(entries) > limit:
+            entries.popitem(last=False)
+
+    def is_boilerplate_hash(self, dhash):
+        """학습된 공통 이미지 해시인지 확인"""
+        with self.lock:
+            return self._find_similar(dhash, self.boilerplate_hashes) is not None
+
+    def is_boilerplate_url(self, url):
+        """이미 해시가 알려진 URL이 공통 이미지인지 확인 (네트워크 없이 조회)"""
+        with self.lock:
+            dhash = self.url_hashes.get(url)
+            return dhash is not None and self._find_similar(dhash, self.boilerplate_hashes) is not None
+
+    def observe(self, url, data, product_key):
+        """다운로드한 이미지를 상품 키와 함께 기록하고 공통 이미지 여부 반환"""
+        try:
+            dhash = dhash_from_bytes(data)
+        except Exception as e:
+            print(f"[WARNING] 이미지 해시 계산 실패: {url} - {e}")
+            return False
+
+        with self.lock:
+            self.url_hashes[url] = dhash
+            self.url_hashes.move_to_end(url)
+            self._trim(self.url_hashes, self.max_urls)
+            if self._find_similar(dhash, self.boilerplate_hashes) is not None:
+                self.dropped_count += 1
+                return True
+
+            key = self._find_similar(dhash, self.hash_products)
+            if key is None:
+                key = dhash
+            products = self.hash_products.setdefault(key, set())
+            self.hash_products.move_to_end(key)
+            products.add(product_key)
+            if len(products) >= self.min_products:
+                # 공통 이미지로 학습되면 상품 목록은 더 필요 없음
+                del self.hash_products[key]
+                self.boilerplate_hashes.add(key)
+                self.dropped_count += 1
+                print(f"[DEDUP] 공통 이미지 학습 ({len(products)}개 상품에서 반복): {url}")
+                return True
+            self._trim(self.hash_products, self.max_hashes)
+        return False
+
+    def filter_urls(self, urls):
+        """학습된 공통 이미지 URL을 목록에서 제외"""
+        kept = []
+        for url in urls:
+            if self.is_boilerplate_url(url):
+                self.dropped_count += 1
+                print(f"[DEDUP] 공통 이미지 제외: {url}")
+                continue
+            kept.append(url)
+        return kept
+
+    def load(self):
+        """저장된 사이트별 인덱스 불러오기"""
+        if not self.index_path or not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            self.boilerplate_hashes = {int(h) for h in saved.get('boilerplate_hashes', [])}
+            self.hash_products = OrderedDict(
+                (int(h), set(products)) for h, products in saved.get('hash_products', {}).items()
+                if int(h) not in self.boilerplate_hashes
+            )
+            self.url_hashes = OrderedDict((url, int(h)) for url, h in saved.get('url_hashes', {}).items())
+            self._trim(self.hash_products, self.max_hashes)
+            self._trim(self.url_hashes, self.max_urls)
+            print(f"[DEDUP] 공통 이미지 인덱스 로드: {len(self.boilerplate_hashes)}개 학습됨")
+        except Exception as e:
+            print(f"[WARNING] 공통 이미지 인덱스 로드 실패: {e}")
+
+    def save(self):
+        """사이트별 인덱스 저장 (다음 실행에서 첫 상품부터 제외)"""
+        if not self.index_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            with self.lock:
+                saved = {
+                    'hash_products': {str(h): sorted(products) for h, products in self.hash_products.items()},
+                    'url_hashes': {url: str(h) for url, h in self.url_hashes.items()},
+                    'boilerplate_hashes': [str(h) for h in self.boilerplate_hashes]
+                }
+            with open(self.index_path, 'w', encoding='utf-8') as f:
+                json.dump(saved, f, ensure_ascii=False)
+            print(f"[DEDUP] 공통 이미지 인덱스 저장: {self.index_path} (이번 실행 제외 {self.dropped_count}개)")
+        except Exception as e:
+            print(f"[WARNING] 공통 이미지 인덱스 저장 실패: {e}")
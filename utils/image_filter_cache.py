@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+거부된 상세이미지 URL 캐시 및 경로 패턴 학습
+
+로딩 스피너, 안내 배너, 300px 미만 아이콘처럼 매 상품마다 반복해서 거부되는
+이미지를 기억해 두고, 네트워크 요청 전에 딕셔너리 조회만으로 제외한다.
+같은 경로(디렉터리)의 이미지가 계속 거부되면 그 경로 자체를 학습한다.
+
+학습된 경로도 URL 일부(probe_interval개 중 1개꼴)는 계속 실제 검증하여, 통과 이미지가
+나오면 학습을 해제한다 (썸네일과 상세이미지가 같은 CDN 경로인 사이트 보호).
+거부 URL과 학습 경로는 ttl_days가 지나면 버리고 다시 검증/학습하며, 거부 URL은
+max_urls개까지만 보관한다 (오래된 것부터 삭제).
+"""
+
+import json
+import os
+import time
+import zlib
+from threading import Lock
+from urllib.parse import urlsplit
+
+CACHE_VERSION = 1
+
+
+def url_path_prefix(url):
+    """URL의 디렉터리 경로 (호스트 포함, 파일명/쿼리 제외)"""
+    parts = urlsplit(url)
+    directory = parts.path.rsplit('/', 1)[0] + '/'
+    return f"{parts.netloc}{directory}"
+
+
+class RejectedImageCache:
+    """거부 URL 네거티브 캐시 + 사이트별 거부 경로 학습"""
+
+    def __init__(self, min_rejections=8, index_path=None, probe_interval=10, ttl_days=7, max_urls=5000):
+        self.min_rejections = min_rejections  # 이 횟수 이상 거부되고 통과가 없으면 경로 학습
+        self.index_path = index_path
+        self.probe_interval = probe_interval  # 학습된 경로의 URL 중 이 개수당 1개꼴로 계속 검증
+        self.ttl = ttl_days * 86400
+        self.max_urls = max_urls
+        self.rejected = {}  # URL -> [거부 사유, 거부 시각] (삽입 순서 = 오래된 순)
+        self.prefix_stats = {}  # 경로 -> [거부 횟수, 통과 횟수]
+        self.learned_prefixes = {}  # 경로 -> 학습 시각 (epoch 초)
+        self.lock = Lock()
+        self.skipped_count = 0
+        if index_path:
+            self.load()
+
+    def _is_probe_sample(self, url):
+        """학습된 경로에서도 실제 검증할 URL인지 (URL별로 고정되어 같은 URL은 항상 같은 결과)"""
+        return self.probe_interval > 0 and zlib.crc32(url.encode('utf-8')) % self.probe_interval == 0
+
+    def _is_expired(self, recorded_at, now=None):
+        return (now or time.time()) - recorded_at > self.ttl
+
+    def check(self, url):
+        """이미 거부된 URL 또는 학습된 거부 경로면 사유 반환 (아니면 None, 만료된 기록은 무시)"""
+        reason = None
+        entry = self.rejected.get(url)
+        if entry is not None and not self._is_expired(entry[1]):
+            reason = entry[0]
+        if reason is None and self.learned_prefixes:
+            learned_at = self.learned_prefixes.get(url_path_prefix(url))
+            if learned_at is not None and not self._is_expired(learned_at) and not self._is_probe_sample(url):
+                reason = '학습된 거부 경로'
+        if reason is not None:
+            self.skipped_count += 1
+        return reason
+
+    def record_rejected(self, url, reason='검증 실패'):
+        """거부 결과 기록 및 경로 학습"""
+        prefix = url_path_prefix(url)
+        with self.lock:
+            entry = self.rejected.pop(url, None)
+            self.rejected[url] = [reason, time.time()]
+            while len(self.rejected) > self.max_urls:
+                del self.rejected[next(iter(self.rejected))]
+            if entry is not None and not self._is_expired(entry[1]):
+                return
+            stats = self.prefix_stats.setdefault(prefix, [0, 0])
+            stats[0] += 1
+            if stats[0] >= self.min_rejections and stats[1] == 0 and prefix not in self.learned_prefixes:
+                self.learned_prefixes[prefix] = time.time()
+                print(f"[FILTER] 반복 거부 경로 학습 ({stats[0]}회): {prefix}")
+
+    def record_accepted(self, url):
+        """통과 결과 기록 (통과 이미지가 있는 경로는 학습 대상에서 제외)"""
+        prefix = url_path_prefix(url)
+        with self.lock:
+            stats = self.prefix_stats.setdefault(prefix, [0, 0])
+            stats[1] += 1
+            if prefix in self.learned_prefixes:
+                del self.learned_prefixes[prefix]
+                print(f"[FILTER] 통과 이미지 발견으로 거부 경로 학습 해제: {prefix}")
+
+    def load(self):
+        """저장된 사이트별 거부 캐시 불러오기"""
+        if not self.index_path or not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved.get('version') != CACHE_VERSION:
+                print(f"[FILTER] 거부 이미지 캐시 형식이 달라 새로 시작: {self.index_path}")
+                return
+            now = time.time()
+            rejected = [(url, entry) for url, entry in saved.get('rejected', {}).items()
+                        if not self._is_expired(entry[1], now)]
+            self.rejected = dict(rejected[-self.max_urls:]) if self.max_urls > 0 else {}
+            self.prefix_stats = saved.get('prefix_stats', {})
+            self.learned_prefixes = dict(saved.get('learned_prefixes', {}))
+            expired = [prefix for prefix, learned_at in self.learned_prefixes.items()
+                       if self._is_expired(learned_at, now)]
+            for prefix in expired:
+                del self.learned_prefixes[prefix]
+                self.prefix_stats.pop(prefix, None)  # 만료된 경로는 거부 횟수도 새로 셈
+            print(f"[FILTER] 거부 이미지 캐시 로드: URL {len(self.rejected)}개, 경로 {len(self.learned_prefixes)}개")
+        except Exception as e:
+            print(f"[WARNING] 거부 이미지 캐시 로드 실패: {e}")
+
+    def save(self):
+        """사이트별 거부 캐시 저장"""
+        if not self.index_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            with self.lock:
+                saved = {
+                    'version': CACHE_VERSION,
+                    'rejected': dict(self.rejected),
+                    'prefix_stats': dict(self.prefix_stats),
+                    'learned_prefixes': dict(self.learned_prefixes)
+                }
+            with open(self.index_path, 'w', encoding='utf-8') as f:
+                json.dump(saved, f, ensure_ascii=False)
+            print(f"[FILTER] 거부 이미지 캐시 저장: {self.index_path} (이번 실행 조회 생략 {self.skipped_count}회)")
+        except Exception as e:
+            print(f"[WARNING] 거부 이미지 캐시 저장 실패: {e}")
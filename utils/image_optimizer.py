@@ -1,29 +1,723 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import asyncio
+import io
+import logging
 import requests
 import os
 import time
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw, ImageFont, features
+from utils.options import get_option
+from utils.perf_trace import PerfTracer
+from utils.source_store import SourceImageStore
+from utils import whitespace_trim
+
+logger = logging.getLogger(__name__)
+
+
+# ===================== 폰트 캐시 =====================
+# 워커 프로세스마다 한 번만 폰트 파일을 읽고, 같은 (폰트, 크기, 텍스트) 측정은 재사용한다.
+_FONT_CACHE = {}
+_FAILED_FONTS = {}
+_TEXT_WIDTH_CACHE = {}
+_TEXT_WIDTH_CACHE_LIMIT = 10000
+
+
+def load_font(font_path, font_size):
+    """(경로, 크기)별 TrueType 폰트 캐시 (없는 폰트 파일도 기억하여 재시도하지 않음)"""
+    key = (font_path, font_size)
+    font = _FONT_CACHE.get(key)
+    if font is not None:
+        return font
+    if font_path in _FAILED_FONTS:
+        raise OSError(_FAILED_FONTS[font_path])
+    try:
+        font = ImageFont.truetype(font_path, font_size)
+    except OSError as e:
+        _FAILED_FONTS[font_path] = f"{font_path}: {e}"
+        raise
+    _FONT_CACHE[key] = font
+    return font
+
+
+def measure_text_width(draw, text, font, font_key=None):
+    """텍스트 너비 측정 (font_key가 있으면 결과 캐시)"""
+    cache_key = (font_key, text) if font_key is not None else None
+    if cache_key is not None and cache_key in _TEXT_WIDTH_CACHE:
+        return _TEXT_WIDTH_CACHE[cache_key]
+    try:
+        bbox = draw.textbbox((0, 0), text, font=font)
+        text_width = bbox[2] - bbox[0]
+    except AttributeError:
+        text_width, _ = draw.textsize(text, font=font)
+    if cache_key is not None:
+        if len(_TEXT_WIDTH_CACHE) >= _TEXT_WIDTH_CACHE_LIMIT:
+            _TEXT_WIDTH_CACHE.clear()
+        _TEXT_WIDTH_CACHE[cache_key] = text_width
+    return text_width
+
+
+def get_fitting_font(draw, text, max_width, font_path, max_font_size=80, min_font_size=32):
+    """상품명 길이에 따라 글자 크기를 동적으로 조정
+    
+    텍스트 너비는 글자 크기에 따라 증가하므로 2pt 단위 후보 중 max_width에 들어가는
+    가장 큰 크기를 이진 탐색으로 찾는다 (최대 6회 측정).
+    """
+    sizes = list(range(max_font_size, min_font_size - 1, -2))
+    low, high = 0, len(sizes) - 1
+    best = None
+    while low <= high:
+        middle = (low + high) // 2
+        font_size = sizes[middle]
+        font = load_font(font_path, font_size)
+        if measure_text_width(draw, text, font, (font_path, font_size)) <= max_width:
+            best = font
+            high = middle - 1  # 더 큰 크기 시도
+        else:
+            low = middle + 1
+    if best is not None:
+        return best
+    return load_font(font_path, min_font_size)
+
+
+# ===================== 썸네일 템플릿 =====================
+# 배경, 하단 회색 영역, S2B 배지(텍스트 포함)는 상품마다 같으므로 프로세스당 한 번만 그린다.
+# 상품 이미지(최대 400x400, 중앙 상단)와 상품명은 배지/회색 영역과 겹치지 않아 결과는 동일하다.
+# 배지 없는 템플릿은 썸네일 추가 크기(badge=False)에 사용한다.
+_THUMBNAIL_TEMPLATES = {}  # 배지 포함 여부 -> 템플릿
+BADGE_BOX = (530, 0, 650, 120)  # S2B 배지 영역 (파란색 80px + 빨간색 40px)
+
+
+def _render_thumbnail_template(badge=True):
+    """650x650 썸네일 템플릿 (흰색 캔버스 + 회색 상품명 영역 + S2B REGISTERED 배지)"""
+    # 650x650 흰색 캔버스 생성
+    canvas = Image.new('RGB', (650, 650), 'white')
+    
+    # 회색 배경 (하단 상품명 영역)
+    gray_background = Image.new('RGB', (650, 100), (56, 56, 56))
+    canvas.paste(gray_background, (0, 550))
+    if not badge:
+        return canvas
+    
+    # S2B REGISTERED 배지 (우측 상단 모서리에 딱 붙이기)
+    blue_background = Image.new('RGB', (120, 80), (0, 82, 204))  # 파란색 박스
+    canvas.paste(blue_background, (530, 0))  # 650-120=530, Y=0 (모서리)
+    red_badge = Image.new('RGB', (120, 40), (255, 61, 70))  # 빨간색 박스
+    canvas.paste(red_badge, (530, 80))  # 파란색 박스 바로 아래
+    
+    draw = ImageDraw.Draw(canvas)
+    
+    # S2B 배지 텍스트
+    try:
+        s2b_font = load_font("C:/Windows/Fonts/arialbd.ttf", 60)
+        reg_font = load_font("C:/Windows/Fonts/arialbd.ttf", 16)
+    except:
+        try:
+            s2b_font = load_font("C:/Windows/Fonts/Arial.ttf", 60)
+            reg_font = load_font("C:/Windows/Fonts/Arial.ttf", 16)
+        except:
+            s2b_font = ImageFont.load_default()
+            reg_font = ImageFont.load_default()
+    
+    # "S2B" 텍스트 (파란색 영역)
+    s2b_text = "S2B"
+    try:
+        bbox = draw.textbbox((0, 0), s2b_text, font=s2b_font)
+        s2b_width = bbox[2] - bbox[0]
+    except AttributeError:
+        s2b_width, _ = draw.textsize(s2b_text, font=s2b_font)
+    
+    s2b_x = 530 + (120 - s2b_width) // 2  # 새로운 배지 위치(530)에 맞춰 조정
+    s2b_y = 20  # 파란색 박스(80px) 중앙에 맞춤
+    draw.text((s2b_x, s2b_y), s2b_text, font=s2b_font, fill="white")
+    
+    # "REGISTERED" 텍스트 (빨간색 영역) - 새로운 배지 위치에 맞춤
+    reg_text = "REGISTERED"
+    try:
+        bbox = draw.textbbox((0, 0), reg_text, font=reg_font)
+        reg_width = bbox[2] - bbox[0]
+    except AttributeError:
+        reg_width, _ = draw.textsize(reg_text, font=reg_font)
+    
+    reg_x = 530 + (120 - reg_width) // 2  # 새로운 배지 위치(530)에 맞춰 조정
+    reg_y = 95  # 빨간색 배경 위에 (80+15=95)
+    draw.text((reg_x, reg_y), reg_text, font=reg_font, fill="white")
+    
+    return canvas
+
+
+def get_thumbnail_template(badge=True):
+    """캐시된 썸네일 템플릿 반환 (호출 측에서 copy() 후 사용)"""
+    template = _THUMBNAIL_TEMPLATES.get(badge)
+    if template is None:
+        template = _THUMBNAIL_TEMPLATES[badge] = _render_thumbnail_template(badge)
+    return template
+
+
+def normalize_thumbnail_variants(variants):
+    """썸네일 추가 크기 설정 정리
+    
+    variants: [{'size': 300, 'name': 'm', 'badge': False, 'format': 'webp', 'quality': 90}, ...]
+    (숫자만 주면 크기로 사용, name 기본값은 크기, badge 기본값 True, 크기는 650 이하)
+    """
+    normalized = []
+    for variant in variants or []:
+        if isinstance(variant, int):
+            variant = {'size': variant}
+        try:
+            size = int(variant.get('size', 0))
+        except (TypeError, ValueError):
+            size = 0
+        if not 0 < size <= 650:
+            print(f"[WARNING] 썸네일 추가 크기 설정 무시 (1~650px만 가능): {variant}")
+            continue
+        normalized.append({
+            'name': str(variant.get('name', size)),
+            'size': size,
+            'badge': bool(variant.get('badge', True)),
+            'format': variant.get('format'),
+            'quality': int(variant.get('quality', 95)),
+        })
+    return normalized
+
+
+def _save_thumbnail_variants(canvas, thumbnail_path, variants, encoder=None):
+    """완성된 650x650 썸네일에서 추가 크기 저장 ({n}_cr_{name}.{확장자})
+    
+    배지 포함/제외별로 큰 크기부터 이전 결과를 다시 줄여 나간다 (원본 재디코딩 없음).
+    반환값: (경로 목록, 저장 용량, 기존 baseline JPEG 기준 용량)
+    """
+    base, _ = os.path.splitext(thumbnail_path)
+    paths = []
+    written_total = 0
+    baseline_total = 0
+    for badge in (True, False):
+        group = sorted((v for v in variants if v['badge'] == badge), key=lambda v: v['size'], reverse=True)
+        if not group:
+            continue
+        current = canvas
+        if not badge:
+            # 배지 영역만 배지 없는 템플릿으로 덮음 (상품 이미지/상품명과 겹치지 않음)
+            current = canvas.copy()
+            current.paste(get_thumbnail_template(False).crop(BADGE_BOX), BADGE_BOX[:2])
+        for variant in group:
+            if current.width != variant['size']:
+                current = current.resize((variant['size'], variant['size']), Image.Resampling.LANCZOS)
+            variant_encoder = dict(encoder or {}, format=variant['format']) if variant['format'] else encoder
+            path = f"{base}_{variant['name']}.{output_extension(variant_encoder)}"
+            written_bytes, baseline_bytes = encode_image(current, path, variant['quality'], variant_encoder)
+            written_total += written_bytes
+            baseline_total += baseline_bytes
+            paths.append(path)
+    if paths:
+        print(f"[THUMB] 썸네일 추가 크기 {len(paths)}개 생성: {', '.join(v['name'] for v in variants)}")
+    return paths, written_total, baseline_total
+
+
+# ===================== 축소 디코딩 =====================
+# JPEG는 DCT 단계에서 1/2, 1/4, 1/8 크기로 바로 디코딩할 수 있다(draft).
+# Pillow의 thumbnail()도 draft를 쓰지만 가로세로 상자 기준이라 가로/세로로 긴 사진은
+# 원본 해상도로 디코딩되므로, 실제 결과 크기(비율 유지) 기준으로 미리 draft를 지정한다.
+
+def draft_for_thumbnail(img, max_size, reducing_gap=2.0):
+    """thumbnail(max_size) 결과 크기의 reducing_gap배 이상으로 축소 디코딩 설정 (JPEG만 적용)"""
+    if img.format != 'JPEG':
+        return
+    max_width, max_height = max_size
+    width, height = img.size
+    if width <= max_width and height <= max_height:
+        return
+    scale = min(max_width / width, max_height / height)
+    # reducing_gap=2.0은 thumbnail() 기본값과 같아 LANCZOS 결과 품질이 유지됨
+    target = (max(1, int(width * scale * reducing_gap)), max(1, int(height * scale * reducing_gap)))
+    img.draft('RGB', target)
+
+
+# ===================== 렌더링 작업 (프로세스 풀에서 실행) =====================
+# 아래 함수들은 ImageRenderPool 워커 프로세스에서 호출되므로 모듈 최상위에 두고
+# config.py를 import하지 않는다 (경로 등 필요한 값은 모두 인자로 전달).
+# 다운로드한 바이트는 임시 파일 없이 메모리에서 바로 디코딩한다.
+
+# 상세이미지 메모리 상한 (워커 1개 최대 메모리 ~= 원본 1장 + 조각 1장, RGB 3바이트/픽셀)
+DEFAULT_PIXEL_LIMITS = {
+    'max_image_pixels': 40000000,  # 원본 1장 상한 (헤더 기준, 초과 시 디코딩하지 않고 제외)
+    'max_width': 1500,  # 이보다 넓은 원본은 이 너비로 축소 (일반 상세이미지 860~1000px은 그대로)
+    'max_product_pixels': 150000000,  # 상품 1개 결합 기준 상한 (최대 너비 x 전체 높이, 초과분은 제외)
+}
+
+
+def apply_pixel_limits(limits=None):
+    """기본값에 설정값을 합친 상한 반환 및 Pillow 압축 폭탄 검사 기준 설정"""
+    merged = dict(DEFAULT_PIXEL_LIMITS)
+    if limits:
+        merged.update({key: value for key, value in limits.items() if value is not None})
+    Image.MAX_IMAGE_PIXELS = merged['max_image_pixels']
+    return merged
+
+
+# 결과 이미지 인코딩 설정 (기본값은 기존과 동일한 baseline JPEG)
+DEFAULT_ENCODER = {
+    'format': 'JPEG',  # 'JPEG' 또는 'WEBP'
+    'optimize': False,  # JPEG 허프만 테이블 최적화 (화질 동일, 용량 감소)
+    'progressive': False,  # 프로그레시브 JPEG
+    'webp_method': 4,  # WebP 압축 노력 (0~6, 클수록 느리고 작음)
+    'slice_target_bytes': None,  # 상세 조각 1장 목표 용량 (넘으면 화질을 낮춰 맞춤)
+    'min_quality': 50,  # 목표 용량 탐색 시 최저 화질
+    'report_baseline': False,  # 절감량 보고용으로 기존 baseline JPEG를 한 번 더 인코딩 (인코딩 시간 약 2배)
+}
+OUTPUT_EXTENSIONS = {'JPEG': 'jpg', 'WEBP': 'webp'}
+WEBP_MAX_DIMENSION = 16383  # WebP로 저장할 수 있는 한 변 최대 길이
+
+
+def resolve_encoder(encoder=None):
+    """기본값에 설정값을 합친 인코딩 설정 반환 (WebP 미지원 Pillow는 JPEG로 대체)"""
+    merged = dict(DEFAULT_ENCODER)
+    if encoder:
+        merged.update({key: value for key, value in encoder.items() if value is not None})
+    merged['format'] = str(merged['format']).upper()
+    if merged['format'] not in OUTPUT_EXTENSIONS:
+        print(f"[WARNING] 지원하지 않는 이미지 형식 {merged['format']}, JPEG로 저장")
+        merged['format'] = 'JPEG'
+    if merged['format'] == 'WEBP' and not features.check('webp'):
+        print(f"[WARNING] Pillow WebP 미지원, JPEG로 저장")
+        merged['format'] = 'JPEG'
+    return merged
+
+
+def output_extension(encoder=None):
+    """결과 파일 확장자 (jpg 또는 webp)"""
+    return OUTPUT_EXTENSIONS[resolve_encoder(encoder)['format']]
+
+
+def encode_image(img, path, quality, encoder=None, target_bytes=None):
+    """설정에 맞게 인코딩하여 저장, (저장 용량, 기존 baseline JPEG 기준 용량) 반환
+    
+    target_bytes가 있으면 그 용량 이하가 되는 가장 높은 화질을 이진 탐색으로 찾는다.
+    기준 용량은 report_baseline일 때만 따로 인코딩하고, 아니면 저장 용량과 같다.
+    WebP 한계(16383px)보다 긴 이미지(아주 긴 상세이미지의 조각 등)는 같은 경로에 JPEG로 저장한다.
+    (파일명과 상세설명 URL은 그대로 두고, 브라우저는 내용으로 형식을 판별하므로 그대로 표시됨)
+    """
+    encoder = resolve_encoder(encoder)
+    image_format = encoder['format']
+    if image_format == 'WEBP' and max(img.size) > WEBP_MAX_DIMENSION:
+        print(f"[WARNING] WebP 최대 크기 초과 ({img.width}x{img.height}), JPEG로 저장: {path}")
+        image_format = 'JPEG'
+    
+    def encode(image_quality):
+        buffer = io.BytesIO()
+        if image_format == 'WEBP':
+            img.save(buffer, 'WEBP', quality=image_quality, method=encoder['webp_method'])
+        else:
+            img.save(buffer, 'JPEG', quality=image_quality,
+                     optimize=encoder['optimize'], progressive=encoder['progressive'])
+        return buffer.getvalue()
+    
+    data = encode(quality)
+    if target_bytes and len(data) > target_bytes:
+        low, high = encoder['min_quality'], quality - 1
+        best = None
+        while low <= high:
+            middle = (low + high) // 2
+            candidate = encode(middle)
+            if len(candidate) <= target_bytes:
+                best = candidate
+                low = middle + 1  # 더 높은 화질 시도
+            else:
+                high = middle - 1
+        data = best if best is not None else encode(encoder['min_quality'])
+    
+    with open(path, 'wb') as f:
+        f.write(data)
+    
+    # 절감량 보고용 기존 방식 용량 (report_baseline일 때만 추가 인코딩)
+    baseline_bytes = len(data)
+    if encoder['report_baseline'] and (image_format != 'JPEG' or encoder['optimize'] or encoder['progressive'] or target_bytes):
+        buffer = io.BytesIO()
+        img.save(buffer, 'JPEG', quality=quality)
+        baseline_bytes = buffer.tell()
+    return len(data), baseline_bytes
+
+
+def open_image(source):
+    """이미지 바이트 또는 파일 경로 열기"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return Image.open(io.BytesIO(source))
+    return Image.open(source)
+
+
+def render_thumbnail(image_source, product_name, thumbnail_path, encoder=None, variants=None):
+    """원본 이미지(바이트 또는 경로)로 650x650 썸네일(상품명 + S2B 배지)을 만들어 thumbnail_path에 저장
+    
+    variants가 있으면 같은 결과에서 추가 크기도 저장한다 (normalize_thumbnail_variants 형식).
+    반환값: (추가 크기 경로 목록, 저장 용량, 기존 baseline JPEG 기준 용량)
+    """
+    # 650x650 캔버스에 상품명 텍스트와 S2B 배지 포함한 썸네일 생성
+    try:
+        # 원본 이미지 열기
+        with open_image(image_source) as original_img:
+            # 배경/상품명 영역/S2B 배지가 그려진 템플릿 복사
+            canvas = get_thumbnail_template().copy()
+            
+            # 원본 이미지 크기 조정 (최대 400x400, 비율 유지, JPEG는 축소 디코딩)
+            draft_for_thumbnail(original_img, (400, 400))
+            original_img.thumbnail((400, 400), Image.Resampling.LANCZOS)
+            
+            # 상품 이미지를 중앙 상단에 배치
+            img_x = (650 - original_img.width) // 2
+            img_y = (550 - original_img.height) // 2
+            canvas.paste(original_img, (img_x, img_y))
+            
+            draw = ImageDraw.Draw(canvas)
+            
+            # 상품명 텍스트 처리
+            display_name = product_name[:13] + "..." if len(product_name) > 13 else product_name
+            display_name = display_name.replace("-", "")
+            
+            # 동적 폰트 크기 조정
+            max_text_width = 600  # 650px 캔버스에서 좌우 25px 여백
+            font_path = "C:/Windows/Fonts/NanumGothicExtraBold.ttf"
+            
+            try:
+                name_font = get_fitting_font(draw, display_name, max_text_width, font_path, 80, 32)
+                logger.debug("[FONT] 적용된 폰트 크기: %spt for '%s'", name_font.size, display_name)
+            except:
+                try:
+                    font_path = "C:/Windows/Fonts/malgun.ttf"
+                    name_font = get_fitting_font(draw, display_name, max_text_width, font_path, 80, 32)
+                    logger.debug("[FONT] 말굼 폰트 적용: %spt", name_font.size)
+                except:
+                    name_font = ImageFont.load_default()
+                    logger.debug("[FONT] 기본 폰트 사용")
+            
+            # 상품명 텍스트 그리기 (하단 회색 영역 중앙)
+            try:
+                bbox = draw.textbbox((0, 0), display_name, font=name_font)
+                text_width = bbox[2] - bbox[0]
+                text_height = bbox[3] - bbox[1]
+            except AttributeError:
+                text_width, text_height = draw.textsize(display_name, font=name_font)
+            
+            text_x = (650 - text_width) // 2
+            text_y = 560  # 회색 영역(550~650) 상단에서 10px 아래
+            draw.text((text_x, text_y), display_name, font=name_font, fill="white", stroke_fill="black", stroke_width=2)
+            
+            # 최종 이미지 저장
+            written_bytes, baseline_bytes = encode_image(canvas, thumbnail_path, 95, encoder)
+        
+        print(f"[THUMB] 썸네일 생성 완료: 650x650 (상품명 + S2B 배지)")
+        variant_paths = []
+        if variants:
+            variant_paths, variant_bytes, variant_baseline = _save_thumbnail_variants(canvas, thumbnail_path, variants, encoder)
+            written_bytes += variant_bytes
+            baseline_bytes += variant_baseline
+        return variant_paths, written_bytes, baseline_bytes
+    
+    except Exception as resize_error:
+        print(f"[WARNING] 썸네일 처리 실패: {resize_error}")
+        # 실패 시 기본 방식으로 폴백
+        try:
+            with open_image(image_source) as original_img:
+                canvas = Image.new('RGB', (650, 650), 'white')
+                draft_for_thumbnail(original_img, (600, 600))
+                original_img.thumbnail((600, 600), Image.Resampling.LANCZOS)
+                x = (650 - original_img.width) // 2
+                y = (650 - original_img.height) // 2
+                canvas.paste(original_img, (x, y))
+                written_bytes, baseline_bytes = encode_image(canvas, thumbnail_path, 90, encoder)
+                print(f"[THUMB] 기본 썸네일 생성 완료: 650x650")
+                return [], written_bytes, baseline_bytes
+        except Exception as fallback_error:
+            print(f"[ERROR] 썸네일 폴백 처리도 실패: {fallback_error}")
+            # 기존처럼 다운로드한 원본이라도 남겨 둠 (엑셀 이미지 경로 유지)
+            if isinstance(image_source, (bytes, bytearray, memoryview)):
+                with open(thumbnail_path, 'wb') as f:
+                    f.write(image_source)
+                return [], len(image_source), len(image_source)
+            return [], 0, 0
+
+
+def render_thumbnail_job(image_bytes, image_counter, product_name, cr_path, limits=None, encoder=None, variants=None):
+    """썸네일 렌더링 작업: 원본 바이트로 썸네일 생성, 결과 경로 반환"""
+    start = time.time()
+    try:
+        apply_pixel_limits(limits)
+        
+        # 썸네일 파일명 및 경로 설정
+        thumbnail_filename = f"{image_counter}_cr.{output_extension(encoder)}"
+        thumbnail_path = f"{cr_path}/{thumbnail_filename}"
+        
+        variant_paths, written_bytes, baseline_bytes = render_thumbnail(image_bytes, product_name, thumbnail_path, encoder, variants)
+        print(f"[THUMB] 썸네일 저장 성공: {thumbnail_path}")
+        return {'success': True, 'paths': [thumbnail_path] + variant_paths, 'elapsed': time.time() - start,
+                'bytes': written_bytes, 'baseline_bytes': baseline_bytes}
+    
+    except Exception as e:
+        print(f"[ERROR] 썸네일 처리 실패: {e}")
+        return {'success': False, 'paths': [], 'elapsed': time.time() - start}
+
+
+def render_detail_job(sources, image_counter, output_path, limits=None, encoder=None, trim=None):
+    """상세이미지 렌더링 작업: 원본 바이트 목록을 세로로 이어 10등분 저장, 결과 경로 반환
+    
+    sources: [(원래 순번, 이미지 바이트), ...]
+    limits: 픽셀 상한 (DEFAULT_PIXEL_LIMITS 키, 없으면 기본값)
+    encoder: 인코딩 설정 (DEFAULT_ENCODER 키, 없으면 기본값)
+    trim: 여백 제거 설정 (whitespace_trim.DEFAULT_TRIM_OPTIONS 키, None이면 여백 제거 안 함)
+    """
+    start = time.time()
+    try:
+        limits = apply_pixel_limits(limits)
+        if trim is not None and not whitespace_trim.is_available():
+            print(f"[WARNING] NumPy가 없어 상세이미지 여백 제거를 건너뜀")
+            trim = None
+        valid_sources = []  # [(이미지 바이트, 출력 너비, 출력 높이, 내용 구간), ...]
+        combined_width = 0
+        combined_height = 0
+        
+        for idx, image_bytes in sources:
+            try:
+                # 크기 확인은 헤더만 읽음 (전체 디코딩은 조각 렌더링 시 한 번만)
+                with open_image(image_bytes) as img:
+                    width, height = img.size
+                logger.debug("[DETAIL] 이미지 크기: %sx%s", width, height)
+                
+                if width < 660:  # 유효한 해상도만 사용
+                    print(f"[WARNING] 이미지 너비 부족: {width}px < 660px")
+                    continue
+                
+                if width * height > limits['max_image_pixels']:
+                    print(f"[WARNING] 이미지 픽셀 수 초과로 제외: {width}x{height} > {limits['max_image_pixels']}px")
+                    continue
+                
+                # 너무 넓은 원본은 출력 너비로 축소 (높이는 비율 유지)
+                if width > limits['max_width']:
+                    scaled_height = max(1, round(height * limits['max_width'] / width))
+                    logger.debug("[DETAIL] 너비 상한 축소: %sx%s -> %sx%s", width, height, limits['max_width'], scaled_height)
+                    width, height = limits['max_width'], scaled_height
+                
+                # 위/아래 여백과 긴 빈 구간 제거 (JPEG는 축소 디코딩으로 분석, 빈 이미지는 제외)
+                segments = [(0, height)]
+                if trim is not None:
+                    with open_image(image_bytes) as img:
+                        found = whitespace_trim.find_content_segments(img, (width, height), trim)
+                    if found == []:
+                        logger.debug("[DETAIL] 빈 이미지 제외: %s번째", idx+1)
+                        continue
+                    if found is not None:
+                        segments = found
+                        kept = sum(bottom - top for top, bottom in segments)
+                        if kept < height:
+                            logger.debug("[DETAIL] 여백 제거: 높이 %spx -> %spx", height, kept)
+                kept_height = sum(bottom - top for top, bottom in segments)
+                
+                # 상품 전체 상한을 넘기면 이후 이미지는 제외 (순서 유지)
+                if max(combined_width, width) * (combined_height + kept_height) > limits['max_product_pixels']:
+                    print(f"[WARNING] 상품 상세이미지 픽셀 상한 도달, 이후 이미지 제외 ({idx+1}번째부터)")
+                    break
+                combined_width = max(combined_width, width)
+                combined_height += kept_height
+                
+                valid_sources.append((image_bytes, width, height, segments))
+                logger.debug("[DETAIL] 유효한 이미지: %spx >= 660px", width)
+            
+            except Exception as img_error:
+                print(f"[ERROR] 이미지 {idx+1} 처리 실패: {img_error}")
+                continue
+        
+        result = _stream_slices(valid_sources, image_counter, output_path, encoder=encoder)
+        result['elapsed'] = time.time() - start
+        return result
+    
+    except Exception as e:
+        print(f"[ERROR] 상세이미지 처리 실패: {e}")
+        return {'success': False, 'paths': [], 'elapsed': time.time() - start}
+
+
+def _decode_rgb(source, size):
+    """원본을 RGB로 디코딩 (헤더 크기와 다르면 size로 축소, JPEG는 축소 디코딩)"""
+    img = open_image(source)
+    if img.size != size:
+        img.draft('RGB', size)
+        try:
+            return img.convert("RGB").resize(size, Image.Resampling.LANCZOS)
+        finally:
+            img.close()
+    # RGB 원본은 디코딩 결과를 그대로 사용 (convert 복사 생략)
+    img.load()
+    if img.mode == "RGB":
+        return img
+    try:
+        return img.convert("RGB")
+    finally:
+        img.close()
+
+
+def _stream_slices(valid_sources, image_counter, output_path, slice_count=10, encoder=None):
+    """원본들을 세로로 이은 가상 이미지를 10등분하여 조각별로 직접 렌더링
+    
+    결합 이미지를 만들지 않고 조각 경계를 원본 높이로 계산한 뒤, 각 조각에 겹치는
+    원본 영역만 붙여 넣는다. 동시에 메모리에 있는 것은 조각 1개와 원본 1개뿐이다.
+    (결과는 기존 방식: 너비는 가장 큰 원본 기준, 왼쪽 정렬, 빈 곳은 흰색, 나머지 행은 버림)
+    
+    valid_sources: [(이미지 바이트, 너비, 높이, [(내용 시작, 내용 끝), ...]), ...]
+    여기서는 원본마다 한 번 디코딩해 내용 구간만 붙여 넣는다. 여백 제거를 켜면 구간 분석을 위해
+    한 번 더 디코딩하는데, JPEG는 1/8 축소 디코딩이라 가볍지만 PNG/GIF 등은 전체 해상도로
+    디코딩하므로 원본당 두 번 디코딩하게 된다 (원본을 모두 메모리에 들고 있지 않기 위한 선택).
+    """
+    paths = []
+    encoder = resolve_encoder(encoder)
+    extension = OUTPUT_EXTENSIONS[encoder['format']]
+    written_total = 0
+    baseline_total = 0
+    if not valid_sources:
+        print(f"[ERROR] 유효한 상세이미지가 없음")
+        return {'success': False, 'paths': paths}
+    
+    print(f"[DETAIL] 유효한 이미지 {len(valid_sources)}개 결합 시작")
+    
+    # 이어 붙일 구간 목록 [(원본 번호, 원본 내 시작, 원본 내 끝), ...]
+    pieces = [(source_index, top, bottom)
+              for source_index, (_, _, _, segments) in enumerate(valid_sources)
+              for top, bottom in segments]
+    
+    width = max(source[1] for source in valid_sources)
+    height = sum(bottom - top for _, top, bottom in pieces)
+    slice_height = height // slice_count  # 이미지 하나의 높이
+    
+    logger.debug("[DETAIL] 결합 이미지 크기: %sx%s, 조각 높이: %s", width, height, slice_height)
+    if slice_height <= 0:
+        print(f"[ERROR] 이미지 결합 실패: 높이 부족 ({height}px)")
+        return {'success': False, 'paths': paths}
+    
+    # 각 구간의 세로 시작 위치 (결합 이미지 기준)
+    offsets = []
+    top = 0
+    for _, piece_top, piece_bottom in pieces:
+        offsets.append(top)
+        top += piece_bottom - piece_top
+    
+    current_index = None
+    current_img = None
+    piece_index = 0
+    try:
+        for i in range(slice_count):
+            slice_top = slice_height * i
+            slice_bottom = slice_top + slice_height
+            cropped_img = Image.new("RGB", (width, slice_height), "white")
+            
+            # 이 조각과 겹치는 구간들을 순서대로 붙여 넣기
+            while piece_index < len(pieces):
+                source_index, piece_top, piece_bottom = pieces[piece_index]
+                combined_top = offsets[piece_index]
+                combined_bottom = combined_top + piece_bottom - piece_top
+                if combined_top >= slice_bottom:
+                    break
+                
+                if current_index != source_index:
+                    if current_img is not None:
+                        current_img.close()
+                    current_img = None
+                    current_index = source_index
+                    source, source_width, source_height, _ = valid_sources[source_index]
+                    try:
+                        current_img = _decode_rgb(source, (source_width, source_height))
+                    except Exception as img_error:
+                        print(f"[ERROR] 상세이미지 디코딩 실패 (흰색으로 대체): {img_error}")
+                
+                overlap_top = max(slice_top, combined_top)
+                overlap_bottom = min(slice_bottom, combined_bottom)
+                if current_img is not None and overlap_bottom > overlap_top:
+                    crop_top = piece_top + overlap_top - combined_top
+                    crop_bottom = piece_top + overlap_bottom - combined_top
+                    region = current_img.crop((0, crop_top, current_img.width, crop_bottom))
+                    cropped_img.paste(region, (0, overlap_top - slice_top))
+                    region.close()
+                
+                if combined_bottom > slice_bottom:
+                    break  # 이 구간은 다음 조각에도 걸침
+                piece_index += 1
+            
+            # 파일명: 기존 main.py 방식과 동일 (001_001.jpg, 001_002.jpg ...)
+            detail_filename = f"{image_counter:03}_{i + 1:03}.{extension}"
+            detail_path = f"{output_path}/{detail_filename}"
+            
+            # 잘린 이미지 저장
+            written_bytes, baseline_bytes = encode_image(cropped_img, detail_path, 90, encoder, encoder['slice_target_bytes'])
+            written_total += written_bytes
+            baseline_total += baseline_bytes
+            logger.debug("[DETAIL] 조각 %s 저장: %s", i+1, detail_path)
+            paths.append(detail_path)
+            
+            cropped_img.close()
+    finally:
+        if current_img is not None:
+            current_img.close()
+    
+    print(f"[DETAIL] 상세이미지 처리 완료: {slice_count}개 조각 생성")
+    return {'success': True, 'paths': paths, 'bytes': written_total, 'baseline_bytes': baseline_total}
 
 
 class ImageDownloadOptimizer:
-    def __init__(self, max_workers=5):
+    def __init__(self, max_workers=5, hash_index=None, response_cache=None, perf=None):
         self.max_workers = max_workers
+        self.hash_index = hash_index  # 공통 이미지 제외용 PerceptualHashIndex (선택)
+        self.response_cache = response_cache  # 브라우저 응답 이미지 캐시 ImageResponseCache (선택)
+        self.perf = perf or PerfTracer()  # 단계 시간 측정 (없으면 요약용 메모리 기록만)
         self.session = requests.Session()
         
         # config.py 표준 경로 설정 (절대 변경 금지)
         from datetime import datetime
-        from config import code, tdate, base_path, thumbnail_path, output_path
+        from config import code, tdate, base_path, thumbnail_path, output_path, product_base_url
         
         # config.py에서 정의된 경로 사용
         self.base_path = base_path
         self.cr_path = thumbnail_path  # config.py의 thumbnail_path
         self.output_path = output_path  # config.py의 output_path
         
+        # 이미지 요청 Referer (config.py의 상품 페이지 베이스 URL)
+        self.referer = product_base_url
+        
+        # 렌더링 워커 메모리 상한 (config.py에 정의된 경우만 사용, 없으면 DEFAULT_PIXEL_LIMITS)
+        self.pixel_limits = {
+            'max_image_pixels': get_option('DETAIL_MAX_IMAGE_PIXELS'),
+            'max_width': get_option('DETAIL_MAX_WIDTH'),
+            'max_product_pixels': get_option('DETAIL_MAX_PRODUCT_PIXELS'),
+        }
+        
+        # 결과 이미지 인코딩 설정 (config.py에 정의된 경우만 사용, 없으면 기존 JPEG)
+        self.encoder = resolve_encoder({
+            'format': get_option('IMAGE_OUTPUT_FORMAT'),
+            'optimize': get_option('JPEG_OPTIMIZE'),
+            'progressive': get_option('JPEG_PROGRESSIVE'),
+            'webp_method': get_option('WEBP_METHOD'),
+            'slice_target_bytes': get_option('SLICE_TARGET_BYTES'),
+            'min_quality': get_option('SLICE_MIN_QUALITY'),
+            'report_baseline': get_option('ENCODE_REPORT_BASELINE'),
+        })
+        self.output_extension = OUTPUT_EXTENSIONS[self.encoder['format']]
+        self.thumbnail_variants = normalize_thumbnail_variants(get_option('THUMBNAIL_VARIANTS', []))
+        
+        # 상세이미지 여백 제거 (TRIM_DETAIL_WHITESPACE = True일 때만, 기본값은 기존 결과 유지)
+        self.trim_options = None
+        if get_option('TRIM_DETAIL_WHITESPACE', False):
+            self.trim_options = {
+                key: value for key, value in {
+                    'white_level': get_option('TRIM_WHITE_LEVEL'),
+                    'tolerance': get_option('TRIM_TOLERANCE'),
+                    'min_gap': get_option('TRIM_MIN_GAP'),
+                    'keep_gap': get_option('TRIM_KEEP_GAP'),
+                }.items() if value is not None
+            }
+        self.encoded_bytes = 0
+        self.baseline_bytes = 0
+        
+        # 재렌더링(rebuild_images.py)용 원본 보관 (원본을 다시 디스크에 쓰므로 KEEP_SOURCE_IMAGES = True일 때만)
+        self.source_store = SourceImageStore(base_path) if get_option('KEEP_SOURCE_IMAGES', False) else None
+        
         print(f"[INIT] config.py 표준 경로 사용: {self.base_path}")
         
-        # 키드짐 사이트에 특화된 헤더 설정
+        # 브라우저와 유사한 기본 헤더 설정
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -37,23 +731,25 @@ class ImageDownloadOptimizer:
             'Sec-Fetch-Site': 'none'
         })
 
+    def _fetch_image_bytes(self, url):
+        """이미지 바이트 가져오기 (브라우저 응답 캐시 우선, 없으면 다운로드)"""
+        if self.response_cache is not None:
+            body = self.response_cache.get(url)
+            if body is not None:
+                logger.debug("[CACHE] 브라우저 응답 재사용: %s", url)
+                return body
+        
+        headers = {
+            'Referer': self.referer,
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        }
+        response = self.session.get(url, headers=headers, timeout=30)
+        response.raise_for_status()
+        return response.content
+
     def get_fitting_font(self, draw, text, max_width, font_path, max_font_size=80, min_font_size=32):
         """상품명 길이에 따라 글자 크기를 동적으로 조정"""
-        font_size = max_font_size
-        while font_size >= min_font_size:
-            try:
-                font = ImageFont.truetype(font_path, font_size)
-                try:
-                    bbox = draw.textbbox((0, 0), text, font=font)
-                    text_width = bbox[2] - bbox[0]
-                except AttributeError:
-                    text_width, _ = draw.textsize(text, font=font)
-                if text_width <= max_width:
-                    return font
-            except Exception as e:
-                print(f"[WARNING] 폰트 사이즈 {font_size}에서 오류: {e}")
-            font_size -= 2
-        return ImageFont.truetype(font_path, min_font_size)
+        return get_fitting_font(draw, text, max_width, font_path, max_font_size, min_font_size)
 
     def download_and_process_thumbnail(self, thumbnail_url, image_counter, product_name):
         """썸네일 다운로드 및 처리"""
@@ -63,147 +759,47 @@ class ImageDownloadOptimizer:
             
             print(f"[THUMB] 썸네일 다운로드 시작: {thumbnail_url}")
             
-            # 이미지 다운로드
-            headers = {
-                'Referer': 'https://kidgymb2b.co.kr/',
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = self.session.get(thumbnail_url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            # 썸네일 파일명 및 경로 설정
-            thumbnail_filename = f"{image_counter}_cr.jpg"
-            thumbnail_path = f"{self.cr_path}/{thumbnail_filename}"
-            
-            # 이미지 저장
-            with open(thumbnail_path, 'wb') as f:
-                f.write(response.content)
-            
-            print(f"[THUMB] 썸네일 저장 성공: {thumbnail_path}")
+            # 이미지 다운로드 (브라우저 응답 캐시 우선)
+            with self.perf.span('download', kind='thumbnail'):
+                image_bytes = self._fetch_image_bytes(thumbnail_url)
+            self._keep_thumbnail_source(image_counter, product_name, image_bytes)
             
-            # 650x650 캔버스에 상품명 텍스트와 S2B 배지 포함한 썸네일 생성
+            with self.perf.span('thumbnail_render', image_counter=image_counter) as span:
+                result = render_thumbnail_job(image_bytes, image_counter, product_name, self.cr_path, self.pixel_limits, self.encoder, self.thumbnail_variants)
+                span['worker_ms'] = round(result.get('elapsed', 0) * 1000, 1)
+            self._record_encoding(result)
+            return result['success']
+        
+        except Exception as e:
+            print(f"[ERROR] 썸네일 처리 실패: {e}")
+            return False
+
+    def download_detail_sources(self, detail_img_urls, product_name):
+        """상세이미지 원본 다운로드 (공통 이미지 제외), [(순번, 바이트), ...] 반환"""
+        sources = []
+        for idx, img_url in enumerate(detail_img_urls):
             try:
-                # PIL 라이브러리 로드됨
+                # 학습된 공통 이미지는 다운로드하지 않음
+                if self.hash_index is not None and self.hash_index.is_boilerplate_url(img_url):
+                    logger.debug("[DEDUP] 공통 이미지 다운로드 생략: %s", img_url)
+                    continue
                 
-                # 원본 이미지 열기
-                with Image.open(thumbnail_path) as original_img:
-                    # 650x650 흰색 캔버스 생성
-                    canvas = Image.new('RGB', (650, 650), 'white')
-                    
-                    # 회색 배경 (하단 상품명 영역)
-                    gray_background = Image.new('RGB', (650, 100), (56, 56, 56))
-                    canvas.paste(gray_background, (0, 550))
-                    
-                    # 원본 이미지 크기 조정 (최대 400x400, 비율 유지)
-                    original_img.thumbnail((400, 400), Image.Resampling.LANCZOS)
-                    
-                    # 상품 이미지를 중앙 상단에 배치
-                    img_x = (650 - original_img.width) // 2
-                    img_y = (550 - original_img.height) // 2
-                    canvas.paste(original_img, (img_x, img_y))
-                    
-                    # S2B REGISTERED 배지 (우측 상단 모서리에 딱 붙이기)
-                    blue_background = Image.new('RGB', (120, 80), (0, 82, 204))  # 파란색 박스
-                    canvas.paste(blue_background, (530, 0))  # 650-120=530, Y=0 (모서리)
-                    red_badge = Image.new('RGB', (120, 40), (255, 61, 70))  # 빨간색 박스
-                    canvas.paste(red_badge, (530, 80))  # 파란색 박스 바로 아래
-                    
-                    draw = ImageDraw.Draw(canvas)
-                    
-                    # 상품명 텍스트 처리
-                    display_name = product_name[:13] + "..." if len(product_name) > 13 else product_name
-                    display_name = display_name.replace("-", "")
-                    
-                    # 동적 폰트 크기 조정
-                    max_text_width = 600  # 650px 캔버스에서 좌우 25px 여백
-                    font_path = "C:/Windows/Fonts/NanumGothicExtraBold.ttf"
-                    
-                    try:
-                        name_font = self.get_fitting_font(draw, display_name, max_text_width, font_path, 80, 32)
-                        print(f"[FONT] 적용된 폰트 크기: {name_font.size}pt for '{display_name}'")
-                    except:
-                        try:
-                            font_path = "C:/Windows/Fonts/malgun.ttf"
-                            name_font = self.get_fitting_font(draw, display_name, max_text_width, font_path, 80, 32)
-                            print(f"[FONT] 말굼 폰트 적용: {name_font.size}pt")
-                        except:
-                            name_font = ImageFont.load_default()
-                            print(f"[FONT] 기본 폰트 사용")
-                    
-                    # 상품명 텍스트 그리기 (하단 회색 영역 중앙)
-                    try:
-                        bbox = draw.textbbox((0, 0), display_name, font=name_font)
-                        text_width = bbox[2] - bbox[0]
-                        text_height = bbox[3] - bbox[1]
-                    except AttributeError:
-                        text_width, text_height = draw.textsize(display_name, font=name_font)
-                    
-                    text_x = (650 - text_width) // 2
-                    text_y = 560  # 회색 영역(550~650) 상단에서 10px 아래
-                    draw.text((text_x, text_y), display_name, font=name_font, fill="white", stroke_fill="black", stroke_width=2)
-                    
-                    # S2B 배지 텍스트
-                    try:
-                        s2b_font = ImageFont.truetype("C:/Windows/Fonts/arialbd.ttf", 60)
-                        reg_font = ImageFont.truetype("C:/Windows/Fonts/arialbd.ttf", 16)
-                    except:
-                        try:
-                            s2b_font = ImageFont.truetype("C:/Windows/Fonts/Arial.ttf", 60)
-                            reg_font = ImageFont.truetype("C:/Windows/Fonts/Arial.ttf", 16)
-                        except:
-                            s2b_font = ImageFont.load_default()
-                            reg_font = ImageFont.load_default()
-                    
-                    # "S2B" 텍스트 (파란색 영역)
-                    s2b_text = "S2B"
-                    try:
-                        bbox = draw.textbbox((0, 0), s2b_text, font=s2b_font)
-                        s2b_width = bbox[2] - bbox[0]
-                    except AttributeError:
-                        s2b_width, _ = draw.textsize(s2b_text, font=s2b_font)
-                    
-                    s2b_x = 530 + (120 - s2b_width) // 2  # 새로운 배지 위치(530)에 맞춰 조정
-                    s2b_y = 20  # 파란색 박스(80px) 중앙에 맞춤
-                    draw.text((s2b_x, s2b_y), s2b_text, font=s2b_font, fill="white")
-                    
-                    # "REGISTERED" 텍스트 (빨간색 영역) - 새로운 배지 위치에 맞춤
-                    reg_text = "REGISTERED"
-                    try:
-                        bbox = draw.textbbox((0, 0), reg_text, font=reg_font)
-                        reg_width = bbox[2] - bbox[0]
-                    except AttributeError:
-                        reg_width, _ = draw.textsize(reg_text, font=reg_font)
-                    
-                    reg_x = 530 + (120 - reg_width) // 2  # 새로운 배지 위치(530)에 맞춰 조정
-                    reg_y = 95  # 빨간색 배경 위에 (80+15=95)
-                    draw.text((reg_x, reg_y), reg_text, font=reg_font, fill="white")
-                    
-                    # 최종 이미지 저장
-                    canvas.save(thumbnail_path, 'JPEG', quality=95)
-                    
-                print(f"[THUMB] 썸네일 생성 완료: 650x650 (상품명 + S2B 배지)")
+                logger.debug("[DETAIL] 이미지 %s 다운로드: %s", idx+1, img_url)
                 
-            except Exception as resize_error:
-                print(f"[WARNING] 썸네일 처리 실패: {resize_error}")
-                # 실패 시 기본 방식으로 폴백
-                try:
-                    with Image.open(thumbnail_path) as original_img:
-                        canvas = Image.new('RGB', (650, 650), 'white')
-                        original_img.thumbnail((600, 600), Image.Resampling.LANCZOS)
-                        x = (650 - original_img.width) // 2
-                        y = (650 - original_img.height) // 2
-                        canvas.paste(original_img, (x, y))
-                        canvas.save(thumbnail_path, 'JPEG', quality=90)
-                        print(f"[THUMB] 기본 썸네일 생성 완료: 650x650")
-                except Exception as fallback_error:
-                    print(f"[ERROR] 썸네일 폴백 처리도 실패: {fallback_error}")
-            
-            return True
+                # 이미지 다운로드 (브라우저 응답 캐시 우선)
+                image_bytes = self._fetch_image_bytes(img_url)
+                
+                # 여러 상품에 반복되는 공통 이미지는 결합/분할 대상에서 제외
+                if self.hash_index is not None and self.hash_index.observe(img_url, image_bytes, product_name):
+                    logger.debug("[DEDUP] 공통 이미지 제외: %s", img_url)
+                    continue
+                
+                sources.append((idx, image_bytes))
             
-        except Exception as e:
-            print(f"[ERROR] 썸네일 처리 실패: {e}")
-            return False
+            except Exception as img_error:
+                print(f"[ERROR] 이미지 {idx+1} 처리 실패: {img_error}")
+                continue
+        return sources
 
     def download_and_process_detail_images(self, detail_img_urls, image_counter, product_name):
         """상세이미지 다운로드 및 처리 (기존 main.py 방식: 결합 후 10등분)"""
@@ -213,105 +809,93 @@ class ImageDownloadOptimizer:
             
             print(f"[DETAIL] 상세이미지 다운로드 시작: {len(detail_img_urls)}개")
             
-            headers = {
-                'Referer': 'https://kidgymb2b.co.kr/',
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            # 1. 모든 상세이미지를 다운로드하고 하나로 결합
-            combined_image = None
-            valid_images = []
-            
-            for idx, img_url in enumerate(detail_img_urls):
-                try:
-                    print(f"[DETAIL] 이미지 {idx+1} 다운로드: {img_url}")
-                    
-                    # 이미지 다운로드
-                    response = self.session.get(img_url, headers=headers, timeout=30)
-                    response.raise_for_status()
-                    
-                    # 임시 파일로 저장
-                    temp_filename = f"temp_detail_{image_counter}_{idx}.jpg"
-                    temp_path = f"{self.output_path}/{temp_filename}"
-                    
-                    with open(temp_path, 'wb') as f:
-                        f.write(response.content)
-                    
-                    # 이미지 열기 및 크기 확인
-                    with Image.open(temp_path) as img:
-                        img = img.convert("RGB")
-                        width, height = img.size
-                        print(f"[DETAIL] 이미지 크기: {width}x{height}")
-                        
-                        if width >= 660:  # 유효한 해상도만 사용
-                            valid_images.append(img.copy())
-                            print(f"[DETAIL] 유효한 이미지: {width}px >= 660px")
-                        else:
-                            print(f"[WARNING] 이미지 너비 부족: {width}px < 660px")
-                    
-                    # 임시 파일 삭제
-                    os.remove(temp_path)
-                    
-                except Exception as img_error:
-                    print(f"[ERROR] 이미지 {idx+1} 처리 실패: {img_error}")
-                    continue
-            
-            if not valid_images:
-                print(f"[ERROR] 유효한 상세이미지가 없음")
-                return False
-            
-            print(f"[DETAIL] 유효한 이미지 {len(valid_images)}개 결합 시작")
-            
-            # 2. 이미지를 세로로 결합 (기존 main.py 방식)
-            combined_image = None
-            for img in valid_images:
-                if combined_image is None:
-                    combined_image = img
-                else:
-                    # 너비를 맞춤 (큰 쪽으로)
-                    combined_width = max(combined_image.width, img.width)
-                    combined_height = combined_image.height + img.height
-                    
-                    # 새로운 결합 이미지 생성
-                    new_combined_image = Image.new("RGB", (combined_width, combined_height), "white")
-                    new_combined_image.paste(combined_image, (0, 0))
-                    new_combined_image.paste(img, (0, combined_image.height))
-                    
-                    combined_image.close()
-                    combined_image = new_combined_image
-            
-            # 3. 결합된 이미지를 10등분해서 저장 (기존 main.py 방식)
-            if combined_image is not None:
-                width, height = combined_image.size
-                slice_height = height // 10  # 이미지 하나의 높이
-                
-                print(f"[DETAIL] 결합 이미지 크기: {width}x{height}, 조각 높이: {slice_height}")
-                
-                for i in range(10):
-                    crop_area = (0, slice_height * i, width, slice_height * (i + 1))  # 이미지 자르는 영역 설정
-                    cropped_img = combined_image.crop(crop_area)  # 이미지 자르기
-                    
-                    # 파일명: 기존 main.py 방식과 동일 (001_001.jpg, 001_002.jpg ...)
-                    detail_filename = f"{image_counter:03}_{i + 1:03}.jpg"
-                    detail_path = f"{self.output_path}/{detail_filename}"
-                    
-                    cropped_img.save(detail_path, 'JPEG', quality=90)  # 잘린 이미지 저장
-                    print(f"[DETAIL] 조각 {i+1} 저장: {detail_path}")
-                    
-                    cropped_img.close()
-                
-                combined_image.close()
-                print(f"[DETAIL] 상세이미지 처리 완료: 10개 조각 생성")
-                return True
-            
-            else:
-                print(f"[ERROR] 이미지 결합 실패")
-                return False
-            
+            with self.perf.span('download', kind='detail', images=len(detail_img_urls)):
+                sources = self.download_detail_sources(detail_img_urls, product_name)
+            self._keep_detail_sources(image_counter, product_name, sources)
+            with self.perf.span('slice_render', image_counter=image_counter) as span:
+                result = render_detail_job(sources, image_counter, self.output_path, self.pixel_limits, self.encoder, self.trim_options)
+                span['worker_ms'] = round(result.get('elapsed', 0) * 1000, 1)
+            self._record_encoding(result)
+            return result['success']
+        
         except Exception as e:
             print(f"[ERROR] 상세이미지 처리 실패: {e}")
             return False
 
+    async def process_product_images_async(self, thumbnail_url, detail_img_urls, image_counter, product_name, render_pool):
+        """썸네일/상세이미지 비동기 처리 (다운로드는 스레드, 렌더링은 프로세스 풀)
+        
+        반환값: (썸네일 성공 여부, 상세이미지 성공 여부)
+        """
+        thumbnail_success = False
+        detail_success = False
+        
+        if thumbnail_url:
+            try:
+                print(f"[THUMB] 썸네일 다운로드 시작: {thumbnail_url}")
+                with self.perf.span('download', kind='thumbnail'):
+                    image_bytes = await asyncio.to_thread(self._fetch_image_bytes, thumbnail_url)
+                await asyncio.to_thread(self._keep_thumbnail_source, image_counter, product_name, image_bytes)
+                # 풀 대기 시간을 포함한 경과 시간과 워커 실제 처리 시간(worker_ms)을 함께 기록
+                with self.perf.span('thumbnail_render', image_counter=image_counter) as span:
+                    result = await render_pool.run(render_thumbnail_job, image_bytes, image_counter, product_name, self.cr_path, self.pixel_limits, self.encoder, self.thumbnail_variants)
+                    span['worker_ms'] = round(result.get('elapsed', 0) * 1000, 1)
+                self._record_encoding(result)
+                thumbnail_success = result['success']
+            except Exception as e:
+                print(f"[ERROR] 썸네일 처리 실패: {e}")
+        
+        if detail_img_urls:
+            try:
+                print(f"[DETAIL] 상세이미지 다운로드 시작: {len(detail_img_urls)}개")
+                with self.perf.span('download', kind='detail', images=len(detail_img_urls)):
+                    sources = await asyncio.to_thread(self.download_detail_sources, detail_img_urls, product_name)
+                await asyncio.to_thread(self._keep_detail_sources, image_counter, product_name, sources)
+                with self.perf.span('slice_render', image_counter=image_counter) as span:
+                    result = await render_pool.run(render_detail_job, sources, image_counter, self.output_path, self.pixel_limits, self.encoder, self.trim_options)
+                    span['worker_ms'] = round(result.get('elapsed', 0) * 1000, 1)
+                self._record_encoding(result)
+                detail_success = result['success']
+            except Exception as e:
+                print(f"[ERROR] 상세이미지 처리 실패: {e}")
+        
+        return thumbnail_success, detail_success
+
+    def _keep_thumbnail_source(self, image_counter, product_name, image_bytes):
+        """썸네일 원본 보관 (실패해도 크롤링은 계속)"""
+        if self.source_store is None:
+            return
+        try:
+            path = self.source_store.save_thumbnail(image_counter, image_bytes)
+            self.source_store.record(image_counter, product_name, thumbnail=path)
+        except Exception as e:
+            print(f"[WARNING] 썸네일 원본 보관 실패: {e}")
+
+    def _keep_detail_sources(self, image_counter, product_name, sources):
+        """상세이미지 원본 보관 (공통 이미지 제외 후 렌더링에 쓰는 목록)"""
+        if self.source_store is None:
+            return
+        try:
+            paths = self.source_store.save_details(image_counter, sources)
+            self.source_store.record(image_counter, product_name, details=paths)
+        except Exception as e:
+            print(f"[WARNING] 상세이미지 원본 보관 실패: {e}")
+
+    def _record_encoding(self, result):
+        """렌더링 결과 용량 누적 (절감량 보고용)"""
+        self.encoded_bytes += result.get('bytes', 0)
+        self.baseline_bytes += result.get('baseline_bytes', 0)
+
+    def report_encoding(self):
+        """결과 이미지 용량 및 기존 baseline JPEG 대비 절감량 출력 (절감량은 report_baseline일 때만)"""
+        if not self.encoder['report_baseline']:
+            print(f"[ENCODE] 결과 이미지 {self.encoder['format']}: {self.encoded_bytes / (1024 * 1024):.1f}MB")
+            return
+        saved = self.baseline_bytes - self.encoded_bytes
+        ratio = saved / self.baseline_bytes * 100 if self.baseline_bytes else 0
+        print(f"[ENCODE] 결과 이미지 {self.encoder['format']}: {self.encoded_bytes / (1024 * 1024):.1f}MB "
+              f"(기존 JPEG 대비 {saved / (1024 * 1024):.1f}MB, {ratio:.1f}% 절감)")
+
     def close(self):
         """리소스 정리"""
         self.session.close()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+로깅 설정
+
+진행 상황은 기존처럼 print로 출력하고, 후보 요소/이미지/조각마다 찍던 진단 메시지는
+logging의 DEBUG 레벨로 기록한다. 기본 레벨은 INFO라 진단 메시지는 출력되지 않으며
+(콘솔 출력이 느린 Windows 터미널에서 상품당 수천 줄을 쓰지 않음) 필요할 때만 켠다.
+
+config.py에 정의한 경우만 사용하는 설정:
+- LOG_LEVEL = 'DEBUG'      진단 메시지 출력 (기본 'INFO')
+- LOG_FILE = 'crawl.log'   콘솔과 함께 파일에도 기록
+- LOG_JSON = True          한 줄에 JSON 하나 (시간, 레벨, 로거, 메시지)
+- LOG_QUEUE = True         QueueHandler로 기록을 넘기고 별도 스레드가 콘솔/파일에 출력
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from datetime import datetime
+
+from utils.options import get_option
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_listener = None
+_output_handlers = []
+_fork_hook_registered = False
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON 형식"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _resolve_level(level):
+    if isinstance(level, int):
+        return level
+    resolved = logging.getLevelName(str(level).upper())
+    return resolved if isinstance(resolved, int) else logging.INFO
+
+
+def _use_output_handlers_in_child():
+    """fork된 렌더링 워커에는 큐 리스너 스레드가 없으므로 출력 핸들러에 직접 기록"""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root.removeHandler(handler)
+            for output_handler in _output_handlers:
+                root.addHandler(output_handler)
+
+
+def setup_logging(level=None, log_file=None, json_format=None, queued=None):
+    """루트 로거 설정 (인자가 None이면 config.py 설정값, 없으면 기본값)"""
+    global _listener, _output_handlers, _fork_hook_registered
+    level = _resolve_level(level if level is not None else get_option('LOG_LEVEL', 'INFO'))
+    log_file = log_file if log_file is not None else get_option('LOG_FILE')
+    json_format = json_format if json_format is not None else get_option('LOG_JSON', False)
+    queued = queued if queued is not None else get_option('LOG_QUEUE', False)
+
+    shutdown_logging()
+    formatter = JsonFormatter() if json_format else logging.Formatter(LOG_FORMAT)
+    _output_handlers = [logging.StreamHandler()]
+    if log_file:
+        _output_handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+    for handler in _output_handlers:
+        handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(level)
+
+    if queued:
+        log_queue = queue.SimpleQueue()
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        _listener = logging.handlers.QueueListener(log_queue, *_output_handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        if not _fork_hook_registered and hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=_use_output_handlers_in_child)
+            _fork_hook_registered = True
+    else:
+        for handler in _output_handlers:
+            root.addHandler(handler)
+
+    # 외부 라이브러리의 연결/디코딩 진단 메시지는 DEBUG에서도 제외
+    for noisy in ('urllib3', 'PIL', 'asyncio'):
+        logging.getLogger(noisy).setLevel(max(level, logging.INFO))
+    return root
+
+
+def shutdown_logging():
+    """큐 리스너 종료 (남은 기록 출력 후 스레드 정리)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
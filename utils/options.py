@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+선택 설정값 조회 도우미
+
+config.py는 사용자 전용 파일이므로 새 기능의 설정 변수를 추가하지 않는다.
+사용자가 config.py에 변수를 직접 정의한 경우에만 그 값을 사용하고,
+없으면 각 기능의 기본값을 사용한다.
+"""
+
+
+def get_option(name, default=None):
+    """config.py에 정의된 선택 설정값 반환 (없으면 기본값)"""
+    try:
+        import config
+    except ImportError:
+        return default
+    return getattr(config, name, default)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+상품 행 출력 대상 (엑셀 / CSV / JSONL / Parquet)
+
+_extract_and_save_product가 만든 86개 컬럼 행을 설정된 모든 출력 대상에 기록한다.
+엑셀(.xlsx)은 항상 만들고, config.py의 OUTPUT_FORMATS에 'csv', 'jsonl', 'parquet'을
+추가하면 같은 행을 다른 형식으로도 저장한다 (예: OUTPUT_FORMATS = ['xlsx', 'parquet']).
+
+모든 출력 대상은 write(row, product) / close() 인터페이스를 따른다.
+- row: 헤더 순서의 값 목록 (헤더보다 짧으면 나머지는 빈 값)
+- product: 행을 만든 상품 정보 (URL, 상품 번호 등, 출력 대상에 따라 사용)
+"""
+
+import csv
+import json
+import os
+
+from utils.excel_export import ExcelExporter
+
+
+class OutputSink:
+    """출력 대상 기본 클래스"""
+
+    extension = None
+
+    def __init__(self, path, headers):
+        self.path = path
+        self.headers = list(headers)
+        self.row_count = 0
+
+    def _padded(self, row):
+        """헤더 개수에 맞춘 값 목록 (기존 행은 마지막 빈 컬럼을 생략하므로 빈 값으로 채움)"""
+        values = list(row)
+        if len(values) < len(self.headers):
+            values.extend([""] * (len(self.headers) - len(values)))
+        return values
+
+    def write(self, row, product=None):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class ExcelSink(OutputSink):
+    """마켓 업로드용 .xlsx (기존 결과 파일)"""
+
+    extension = 'xlsx'
+
+    def __init__(self, path, headers, streaming=False):
+        super().__init__(path, headers)
+        self.exporter = ExcelExporter(path, headers, streaming=streaming)
+
+    def write(self, row, product=None):
+        # 엑셀은 기존과 같이 행을 그대로 기록 (빈 컬럼 채우지 않음)
+        self.exporter.append(row)
+        self.row_count += 1
+
+    def close(self):
+        self.exporter.close()
+
+
+class CsvSink(OutputSink):
+    """UTF-8(BOM) CSV, 엑셀에서 바로 열 수 있음"""
+
+    extension = 'csv'
+
+    def __init__(self, path, headers):
+        super().__init__(path, headers)
+        self.file = open(path, 'w', encoding='utf-8-sig', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.headers)
+
+    def write(self, row, product=None):
+        self.writer.writerow(self._padded(row))
+        self.row_count += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+            print(f"[OUTPUT] CSV 저장 완료 ({self.row_count}행): {self.path}")
+
+
+class JsonlSink(OutputSink):
+    """한 줄에 한 상품 (헤더 -> 값)"""
+
+    extension = 'jsonl'
+
+    def __init__(self, path, headers):
+        super().__init__(path, headers)
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write(self, row, product=None):
+        record = dict(zip(self.headers, self._padded(row)))
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.file.flush()  # 중간에 중단되어도 처리된 상품은 남김
+        self.row_count += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+            print(f"[OUTPUT] JSONL 저장 완료 ({self.row_count}행): {self.path}")
+
+
+class ParquetSink(OutputSink):
+    """컬럼형 Parquet (pyarrow 필요, 모든 컬럼 문자열, batch_size 행마다 row group 기록)"""
+
+    extension = 'parquet'
+
+    def __init__(self, path, headers, batch_size=1000):
+        super().__init__(path, headers)
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        self.schema = pa.schema([(header, pa.string()) for header in self.headers])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.batch_size = batch_size
+        self.columns = [[] for _ in self.headers]
+        self.closed = False
+
+    def write(self, row, product=None):
+        for column, value in zip(self.columns, self._padded(row)):
+            column.append("" if value is None else str(value))
+        self.row_count += 1
+        if len(self.columns[0]) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if not self.columns[0]:
+            return
+        arrays = [self.pa.array(column, type=self.pa.string()) for column in self.columns]
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+        self.columns = [[] for _ in self.headers]
+
+    def close(self):
+        if self.closed:
+            return
+        self._flush()
+        self.writer.close()
+        self.closed = True
+        print(f"[OUTPUT] Parquet 저장 완료 ({self.row_count}행): {self.path}")
+
+
+SINK_TYPES = {
+    'csv': CsvSink,
+    'jsonl': JsonlSink,
+    'parquet': ParquetSink,
+}
+
+
+def create_output_sinks(directory, filename, headers, formats=None, excel_streaming=False):
+    """설정된 형식의 출력 대상 목록 생성 (엑셀은 항상 포함, 만들 수 없는 형식은 경고 후 제외)
+
+    directory/filename.{확장자}로 저장한다.
+    """
+    sinks = [ExcelSink(f"{directory}/{filename}.xlsx", headers, streaming=excel_streaming)]
+    for output_format in formats or []:
+        output_format = str(output_format).lower()
+        if output_format in ('xlsx', 'excel'):
+            continue
+        sink_type = SINK_TYPES.get(output_format)
+        if sink_type is None:
+            print(f"[WARNING] 지원하지 않는 출력 형식 무시: {output_format}")
+            continue
+        try:
+            os.makedirs(directory, exist_ok=True)
+            sinks.append(sink_type(f"{directory}/{filename}.{sink_type.extension}", headers))
+            print(f"[OUTPUT] 추가 출력 형식 사용: {output_format}")
+        except ImportError as e:
+            print(f"[WARNING] {output_format} 출력에 필요한 패키지가 없어 제외: {e}")
+        except Exception as e:
+            print(f"[WARNING] {output_format} 출력 준비 실패: {e}")
+    return sinks
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+상품별 단계 시간 측정 (span)
+
+상품 1개 처리 시간을 단계별로 나누어 기록한다.
+- navigation: 상품 페이지 이동 (page.goto)
+- ready_wait: 로딩 대기 (networkidle, lazy loading 스크롤/대기)
+- extraction: 상품명/가격/옵션/이미지 후보 추출
+- image_validation: 상세이미지 후보 로드/크기 검증
+- download: 이미지 다운로드 (브라우저 응답 캐시 포함)
+- thumbnail_render / slice_render: 썸네일/상세 조각 렌더링 (풀 대기 포함, 워커 시간은 worker_ms)
+- row_write: 출력 대상(엑셀/CSV 등) 행 기록
+- product_total: 상품 1개 전체 (이미지 백그라운드 작업 제외)
+
+각 span은 JSON 한 줄로 파일에 기록하고, 실행이 끝나면 단계별 상품당 시간의 백분위 요약을 출력한다.
+현재 상품 번호는 contextvars로 전달하므로 백그라운드 이미지 작업/스레드에서도 같은 상품으로 기록된다.
+"""
+
+import contextvars
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+STAGES = (
+    'navigation', 'ready_wait', 'extraction', 'image_validation',
+    'download', 'thumbnail_render', 'slice_render', 'row_write', 'product_total',
+)
+
+# 상품 처리 흐름 안에서 실행되는 단계 (이미지 다운로드/렌더링은 풀 사용 시 백그라운드에서 겹쳐 실행)
+FOREGROUND_STAGES = ('navigation', 'ready_wait', 'extraction', 'image_validation', 'row_write')
+
+_current_product = contextvars.ContextVar('perf_product', default=None)
+
+
+def percentile(sorted_values, ratio):
+    """정렬된 값 목록의 백분위 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(ratio * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class PerfTracer:
+    """단계별 span 기록기 (path가 없으면 파일 없이 요약만)"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.file = None
+        self.closed = False  # close() 이후 기록은 요약에만 반영 (파일을 다시 열지 않음)
+        self.lock = threading.Lock()
+        self.durations = {}  # 단계 -> {상품: 누적 초}
+
+    def begin_product(self, product):
+        """이후 기록할 span의 상품 번호 지정 (현재 작업과 여기서 만든 하위 작업에 적용)"""
+        _current_product.set(product)
+
+    def record(self, stage, seconds, product=None, **fields):
+        """span 1개 기록 (같은 상품의 같은 단계는 요약에서 합산)"""
+        if product is None:
+            product = _current_product.get()
+        with self.lock:
+            per_product = self.durations.setdefault(stage, {})
+            per_product[product] = per_product.get(product, 0.0) + seconds
+            if self.path is None or self.closed:
+                return
+            try:
+                if self.file is None:
+                    self.file = open(self.path, 'a', encoding='utf-8', buffering=1)
+                entry = {'ts': round(time.time(), 3), 'product': product, 'stage': stage,
+                         'ms': round(seconds * 1000, 1)}
+                entry.update(fields)
+                self.file.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+            except OSError as e:
+                print(f"[WARNING] 성능 기록 실패, 파일 기록 중단: {e}")
+                self.path = None
+
+    @contextmanager
+    def span(self, stage, **fields):
+        """with 블록 실행 시간을 stage로 기록 (예외가 나도 기록)"""
+        start = time.perf_counter()
+        try:
+            yield fields
+        finally:
+            self.record(stage, time.perf_counter() - start, **fields)
+
+    def summary(self):
+        """단계별 상품당 시간 요약 {단계: {count, p50, p90, p99, max, total}} (초)"""
+        result = {}
+        with self.lock:
+            stages = [stage for stage in STAGES if stage in self.durations]
+            stages += sorted(stage for stage in self.durations if stage not in STAGES)
+            for stage in stages:
+                values = sorted(self.durations[stage].values())
+                result[stage] = {
+                    'count': len(values),
+                    'p50': percentile(values, 0.5),
+                    'p90': percentile(values, 0.9),
+                    'p99': percentile(values, 0.99),
+                    'max': values[-1],
+                    'total': sum(values),
+                }
+        return result
+
+    def report(self):
+        """단계별 요약 출력 (상품당 시간, 전경 단계는 product_total 대비 비율)"""
+        summary = self.summary()
+        if not summary:
+            return summary
+        overall = summary.get('product_total', {}).get('total', 0)
+        print("[PERF] 단계별 상품당 시간 (초): 상품수 / p50 / p90 / p99 / 최대 / 합계")
+        for stage, stats in summary.items():
+            share = ""
+            if overall and stage in FOREGROUND_STAGES:
+                share = f" ({stats['total'] / overall * 100:.0f}%)"
+            elif stage != 'product_total':
+                share = " (백그라운드 포함)"
+            print(f"[PERF]   {stage:<17} {stats['count']:>4} / {stats['p50']:.2f} / {stats['p90']:.2f} / "
+                  f"{stats['p99']:.2f} / {stats['max']:.2f} / {stats['total']:.1f}{share}")
+        if self.path:
+            print(f"[PERF] 단계별 기록: {self.path}")
+        return summary
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            if self.file is not None:
+                self.file.close()
+                self.file = None
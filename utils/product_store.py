@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+로컬 SQLite 상품 저장소
+
+실행마다 따로 만들어지는 {tdate}{code}.xlsx와 달리, 추출한 상품을 (사이트, 상품 고유번호)
+기준으로 하나의 SQLite 파일에 계속 갱신(upsert)한다. 실행이 끝나면
+- 신규/변경 상품만 담은 {tdate}{code}_delta.xlsx (기존 86개 컬럼 형식 그대로)
+- 이번 실행에서 보이지 않은 상품 목록 {tdate}{code}_delisted.csv
+를 만들어 전체 카탈로그 대신 변경분만 올릴 수 있게 한다. (config.py의 PRODUCT_STORE = True로 활성화)
+"""
+
+import csv
+import hashlib
+import json
+import re
+import sqlite3
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qs
+
+from utils.excel_export import ExcelExporter
+from utils.output_sinks import OutputSink
+
+# 상품 번호로 쓰는 쿼리 파라미터 (Cafe24, 고도몰, 영카트, 메이크샵 등)
+PRODUCT_ID_PARAMS = ('product_no', 'goodsNo', 'goods_no', 'it_id', 'branduid', 'prdNo', 'no')
+# Cafe24 SEO 주소: /product/{상품명}/{상품번호}/...
+PRODUCT_PATH_PATTERN = re.compile(r'/product/[^/]+/(\d+)(?:/|$)')
+
+# 실행마다 바뀌는 컬럼 (상품코드, 실행 폴더 기반 이미지 URL 등)은 변경 판단에서 제외
+VOLATILE_COLUMNS = {
+    "업체상품코드", "사용자분류명", "이미지1URL", "이미지2URL", "상세설명", "상품상세13"
+}
+
+
+def canonical_product_id(url):
+    """상품 URL에서 사이트 내 고유 상품 번호 추출 (없으면 쿼리/조각을 뺀 URL)"""
+    parts = urlsplit(url)
+    query = parse_qs(parts.query)
+    for param in PRODUCT_ID_PARAMS:
+        values = query.get(param)
+        if values and values[0]:
+            return values[0]
+    match = PRODUCT_PATH_PATTERN.search(parts.path)
+    if match:
+        return match.group(1)
+    return f"{parts.netloc}{parts.path.rstrip('/')}"
+
+
+class ProductStore:
+    """(site, product_id) 기준 상품 저장소"""
+
+    def __init__(self, db_path, site):
+        self.db_path = db_path
+        self.site = site
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS products (
+                site TEXT NOT NULL,
+                product_id TEXT NOT NULL,
+                url TEXT,
+                product_name TEXT,
+                content_hash TEXT NOT NULL,
+                row_json TEXT NOT NULL,
+                first_seen_run TEXT NOT NULL,
+                last_seen_run TEXT NOT NULL,
+                changed_run TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (site, product_id)
+            )
+        """)
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_products_last_seen ON products (site, last_seen_run)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_products_changed ON products (site, changed_run)"
+        )
+        self.connection.commit()
+
+    @staticmethod
+    def content_hash(headers, row, source_images=None):
+        """실행마다 바뀌는 컬럼을 뺀 행 내용 + 원본 이미지 URL 해시"""
+        stable = [value for header, value in zip(headers, row) if header not in VOLATILE_COLUMNS]
+        payload = json.dumps([stable, source_images or []], ensure_ascii=False, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def upsert(self, run_id, product_id, url, product_name, content_hash, row):
+        """상품 저장, 'new' / 'changed' / 'unchanged' 반환"""
+        now = datetime.now().isoformat(timespec='seconds')
+        row_json = json.dumps(list(row), ensure_ascii=False, default=str)
+        existing = self.connection.execute(
+            "SELECT content_hash FROM products WHERE site = ? AND product_id = ?",
+            (self.site, product_id)
+        ).fetchone()
+        if existing is None:
+            self.connection.execute(
+                "INSERT INTO products (site, product_id, url, product_name, content_hash, row_json, "
+                "first_seen_run, last_seen_run, changed_run, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.site, product_id, url, product_name, content_hash, row_json, run_id, run_id, run_id, now)
+            )
+            return 'new'
+        if existing[0] != content_hash:
+            self.connection.execute(
+                "UPDATE products SET url = ?, product_name = ?, content_hash = ?, row_json = ?, "
+                "last_seen_run = ?, changed_run = ?, updated_at = ? WHERE site = ? AND product_id = ?",
+                (url, product_name, content_hash, row_json, run_id, run_id, now, self.site, product_id)
+            )
+            return 'changed'
+        # 내용이 같아도 이번 실행 행(이미지 URL 등)으로 갱신해 두어야 나중에 다시 내보낼 수 있음
+        self.connection.execute(
+            "UPDATE products SET url = ?, row_json = ?, last_seen_run = ?, updated_at = ? "
+            "WHERE site = ? AND product_id = ?",
+            (url, row_json, run_id, now, self.site, product_id)
+        )
+        return 'unchanged'
+
+    def changed_rows(self, run_id):
+        """이번 실행의 신규/변경 상품 행 (저장 순서)"""
+        cursor = self.connection.execute(
+            "SELECT row_json FROM products WHERE site = ? AND changed_run = ? ORDER BY rowid",
+            (self.site, run_id)
+        )
+        for (row_json,) in cursor:
+            yield json.loads(row_json)
+
+    def unseen_products(self, run_id):
+        """이번 실행에서 보이지 않은 상품 [(상품 번호, URL, 상품명, 마지막 확인 실행), ...]"""
+        return self.connection.execute(
+            "SELECT product_id, url, product_name, last_seen_run FROM products "
+            "WHERE site = ? AND last_seen_run != ? ORDER BY last_seen_run DESC, product_id",
+            (self.site, run_id)
+        ).fetchall()
+
+    def commit(self):
+        self.connection.commit()
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+
+class ProductStoreSink(OutputSink):
+    """출력 대상으로 붙여 쓰는 상품 저장소 (행마다 upsert, 종료 시 변경분 내보내기)"""
+
+    extension = 'sqlite'
+
+    def __init__(self, db_path, site, run_id, headers, export_directory, export_filename, commit_every=20):
+        super().__init__(db_path, headers)
+        self.store = ProductStore(db_path, site)
+        self.run_id = run_id
+        self.export_directory = export_directory
+        self.export_filename = export_filename
+        self.commit_every = commit_every
+        self.counts = {'new': 0, 'changed': 0, 'unchanged': 0}
+        self.closed = False
+
+    def write(self, row, product=None):
+        product = product or {}
+        url = product.get('url', '')
+        data = product.get('data') or {}
+        product_id = canonical_product_id(url) if url else str(product.get('product_code', ''))
+        source_images = [data.get('썸네일', '')] + list(data.get('상세페이지', []))
+        content_hash = ProductStore.content_hash(self.headers, row, source_images)
+        status = self.store.upsert(self.run_id, product_id, url, data.get('상품명', ''), content_hash, row)
+        self.counts[status] += 1
+        self.row_count += 1
+        if self.row_count % self.commit_every == 0:
+            self.store.commit()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.store.commit()
+        try:
+            changed = self.counts['new'] + self.counts['changed']
+            print(f"[STORE] 상품 저장소 갱신: 신규 {self.counts['new']}개, 변경 {self.counts['changed']}개, "
+                  f"동일 {self.counts['unchanged']}개 ({self.path})")
+            if changed:
+                delta = ExcelExporter(f"{self.export_directory}/{self.export_filename}_delta.xlsx",
+                                      self.headers, streaming=True)
+                for row in self.store.changed_rows(self.run_id):
+                    delta.append(row)
+                delta.close()
+            unseen = self.store.unseen_products(self.run_id)
+            if unseen:
+                delisted_path = f"{self.export_directory}/{self.export_filename}_delisted.csv"
+                with open(delisted_path, 'w', encoding='utf-8-sig', newline='') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(["상품번호", "URL", "상품명", "마지막확인실행"])
+                    writer.writerows(unseen)
+                print(f"[STORE] 이번 실행에서 보이지 않은 상품 {len(unseen)}개 (전체 수집 실행일 때 판매 종료 후보): {delisted_path}")
+        finally:
+            self.store.close()
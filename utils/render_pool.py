@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+이미지 렌더링 작업 풀
+
+Pillow 디코딩, LANCZOS 리사이즈, 텍스트 렌더링, JPEG 인코딩 같은 CPU 작업을
+크롤링 이벤트 루프 밖(프로세스 풀)에서 실행하여 다음 상품 페이지 처리와 병렬로 진행한다.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+def _warm_up_worker():
+    """워커 프로세스 사전 생성용 빈 작업"""
+    return os.getpid()
+
+
+class ImageRenderPool:
+    """CPU 코어 수만큼의 렌더링 워커 풀 (asyncio에서 await 가능)
+
+    config.py는 import 시 결과 폴더를 삭제 후 다시 만들기 때문에, 메인 스크립트를
+    다시 import하는 spawn 방식 워커를 쓰면 실행 중인 결과물이 지워진다.
+    따라서 fork를 지원하는 환경에서만 프로세스 풀을 쓰고, 그 외(Windows)에서는
+    스레드 풀로 대체한다. (Pillow는 리사이즈/인코딩 중 GIL을 해제하므로 스레드도 병렬 처리됨)
+
+    config.py를 읽지 않는 스크립트(rebuild_images.py)는 start_method='spawn'으로 모든
+    환경에서 프로세스 풀을 쓸 수 있다. spawn 워커는 로깅 설정을 물려받지 않으므로
+    initializer로 다시 설정한다.
+    """
+
+    def __init__(self, max_workers=None, start_method='fork', initializer=None, initargs=()):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        if start_method in multiprocessing.get_all_start_methods():
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(start_method),
+                initializer=initializer,
+                initargs=initargs
+            )
+            self.mode = 'process'
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='render')
+            self.mode = 'thread'
+        print(f"[RENDER] 이미지 렌더링 풀 생성: {self.mode} x {self.max_workers}")
+
+    def warm_up(self):
+        """브라우저(스레드) 시작 전에 워커 프로세스를 미리 fork"""
+        try:
+            self.executor.submit(_warm_up_worker).result(timeout=30)
+        except Exception as e:
+            print(f"[WARNING] 렌더링 풀 준비 실패: {e}")
+
+    async def run(self, func, *args):
+        """렌더링 작업 실행 후 결과 반환 (이벤트 루프는 대기 중 다른 작업 처리)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    def close(self):
+        """남은 작업 완료 후 풀 종료"""
+        self.executor.shutdown(wait=True)
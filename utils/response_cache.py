@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Playwright 응답 이미지 캐시
+
+브라우저가 상품 페이지를 렌더링하면서 이미 받은 썸네일/상세 이미지 본문을
+page.on('response')로 저장해 두고, 이미지 파이프라인이 같은 이미지를
+requests로 다시 다운로드하지 않도록 한다. (config.py의 CAPTURE_IMAGE_RESPONSES로 활성화)
+
+디스크 보관 폴더는 실행 간에 공유되므로, 시작할 때 기존 파일 용량을 다시 세어 상한을
+적용하고 max_age_seconds보다 오래된 항목은 사용하지 않고 지운다 (사이트에서 바뀐 이미지 방지).
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+class ImageResponseCache:
+    """URL -> 이미지 바이트 LRU 캐시 (메모리 상한 + 선택적 디스크 보관)"""
+
+    def __init__(self, max_memory_bytes=256 * 1024 * 1024, min_bytes=5120,
+                 disk_dir=None, max_disk_bytes=1024 * 1024 * 1024, url_filter=None, max_age_seconds=86400):
+        self.max_memory_bytes = max_memory_bytes
+        self.min_bytes = min_bytes  # 아이콘 등 작은 이미지는 저장하지 않음 (검증 기준 5KB와 동일)
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.url_filter = url_filter  # URL -> bool, 상세/썸네일 후보만 저장
+        self.max_age_seconds = max_age_seconds  # 이보다 오래된 항목은 미적중 처리 (메모리/디스크 공통)
+        self.entries = OrderedDict()  # URL -> (이미지 바이트, 저장 시각)
+        self.memory_bytes = 0
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.disk_bytes = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._trim_disk()  # 이전 실행이 남긴 파일 용량 반영 및 만료 항목 삭제
+
+    def attach(self, page):
+        """페이지의 이미지 응답 수집 시작"""
+        page.on('response', self._on_response)
+        print(f"[CACHE] 이미지 응답 수집 활성화 (메모리 상한 {self.max_memory_bytes // (1024 * 1024)}MB)")
+
+    async def _on_response(self, response):
+        """이미지 응답 본문 저장 (실패해도 크롤링에는 영향 없음)"""
+        try:
+            if response.status != 200 or response.request.resource_type != 'image':
+                return
+            url = response.url
+            if self.url_filter is not None and not self.url_filter(url):
+                return
+            body = await response.body()
+            self.put(url, body)
+        except Exception:
+            # 리다이렉트/페이지 이동으로 본문을 못 읽는 경우는 무시 (requests 다운로드로 처리)
+            return
+
+    def put(self, url, body):
+        """이미지 바이트 저장 (메모리 상한 초과 시 오래된 항목부터 제거)"""
+        if not body or len(body) < self.min_bytes or len(body) > self.max_memory_bytes:
+            return
+        evicted = []
+        with self.lock:
+            old = self.entries.pop(url, None)
+            if old is not None:
+                self.memory_bytes -= len(old[0])
+            self.entries[url] = (body, time.time())
+            self.memory_bytes += len(body)
+            while self.memory_bytes > self.max_memory_bytes and self.entries:
+                old_url, (old_body, stored_at) = self.entries.popitem(last=False)
+                self.memory_bytes -= len(old_body)
+                evicted.append((old_url, old_body, stored_at))
+        for old_url, old_body, stored_at in evicted:
+            self._write_disk(old_url, old_body, stored_at)
+
+    def _is_expired(self, stored_at):
+        return time.time() - stored_at > self.max_age_seconds
+
+    def get(self, url):
+        """캐시된 이미지 바이트 반환 (없으면 None)"""
+        body = None
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is not None:
+                if self._is_expired(entry[1]):
+                    del self.entries[url]
+                    self.memory_bytes -= len(entry[0])
+                else:
+                    body = entry[0]
+                    self.entries.move_to_end(url)
+        if body is None and entry is None:
+            body = self._read_disk(url)
+        if body is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.bytes_saved += len(body)
+        return body
+
+    def _disk_path(self, url):
+        return os.path.join(self.disk_dir, hashlib.sha1(url.encode('utf-8')).hexdigest())
+
+    def _write_disk(self, url, body, stored_at):
+        """메모리에서 밀려난 이미지를 디스크에 보관 (파일 수정 시각 = 처음 저장 시각)"""
+        if not self.disk_dir:
+            return
+        try:
+            path = self._disk_path(url)
+            if os.path.exists(path):
+                self.disk_bytes -= os.path.getsize(path)
+            with open(path, 'wb') as f:
+                f.write(body)
+            os.utime(path, (stored_at, stored_at))
+            self.disk_bytes += len(body)
+            if self.disk_bytes > self.max_disk_bytes:
+                self._trim_disk()
+        except Exception as e:
+            print(f"[WARNING] 응답 캐시 디스크 저장 실패: {e}")
+
+    def _read_disk(self, url):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(url)
+        try:
+            if self._is_expired(os.path.getmtime(path)):
+                size = os.path.getsize(path)
+                os.remove(path)
+                self.disk_bytes -= size
+                return None
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _trim_disk(self):
+        """디스크 보관 용량 다시 계산 후 만료 파일과 상한 초과분 삭제 (오래된 파일부터)"""
+        files = [os.path.join(self.disk_dir, name) for name in os.listdir(self.disk_dir)]
+        files = [(os.path.getmtime(path), os.path.getsize(path), path) for path in files if os.path.isfile(path)]
+        total = sum(size for _, size, _ in files)
+        for modified, size, path in sorted(files):
+            if total <= self.max_disk_bytes and not self._is_expired(modified):
+                break
+            os.remove(path)
+            total -= size
+        self.disk_bytes = total
+
+    def report(self):
+        """캐시 사용 통계 출력"""
+        print(f"[CACHE] 이미지 응답 캐시: 적중 {self.hits}회, 미적중 {self.misses}회, "
+              f"재다운로드 절감 {self.bytes_saved / (1024 * 1024):.1f}MB")
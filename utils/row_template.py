@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+마켓 업로드 행(86개 컬럼) 템플릿
+
+상품마다 행 리스트 전체, 상품코드 접두어, 상세설명 HTML(이미지 10개 연결)을 새로 만들던 것을
+실행 시작 시 한 번만 준비한다. 고정 값과 실행 값(브랜드, 카테고리 등)은 미리 채워 두고
+상품마다 바뀌는 칸만 인덱스로 채운다. 만든 행은 모든 출력 대상(엑셀/CSV/JSONL/저장소)이 함께 쓴다.
+"""
+
+
+class Field:
+    """템플릿에서 값을 채울 칸 (run=True면 실행 시작 시, 아니면 상품마다)"""
+
+    def __init__(self, name, run=False):
+        self.name = name
+        self.run = run
+
+
+# (헤더, 값) - 순서와 값은 기존 main.py row_data와 동일 (상품상세14~24는 기존처럼 생략)
+ROW_LAYOUT = [
+    ("업체상품코드", Field('product_code')),
+    ("모델명", ""),
+    ("브랜드", Field('brandname', run=True)),
+    ("제조사", Field('brandname', run=True)),
+    ("원산지", "국내=서울=강남구"),
+    ("상품명", Field('product_name')),
+    ("홍보문구", ""),
+    ("요약상품명", ""),
+    ("카테고리코드", Field('category', run=True)),
+    ("사용자분류명", Field('user_category', run=True)),  # code + tdate
+    ("한줄메모", ""),
+    ("시중가", ""),
+    ("원가", ""),
+    ("표준공급가", ""),
+    ("판매가", Field('price')),
+    ("배송방법", "선결제"),
+    ("배송비", "3500"),
+    ("구매수량", "0"),
+    ("과세여부", "y"),
+    ("판매수량", "9000"),
+    ("이미지1URL", Field('thumbnail_url')),
+    ("이미지2URL", Field('thumbnail_url')),
+    ("이미지3URL", ""),
+    ("이미지4URL", ""),
+    ("GIF생성", ""),
+    ("이미지6URL", ""),
+    ("이미지7URL", ""),
+    ("이미지8URL", ""),
+    ("이미지9URL", ""),
+    ("이미지10URL", ""),
+    ("추가정보입력사항", ""),
+    ("옵션타입", Field('option_type')),
+    ("옵션구분", Field('option_string')),
+    ("선택옵션", ""),
+    ("입력형옵션", ""),
+    ("추가구매옵션", ""),
+    ("상세설명", Field('detail_description')),
+    ("추가상세설명", ""),
+    ("광고/홍보", ""),
+    ("제조일자", ""),
+    ("유효일자", ""),
+    ("사은품내용", ""),
+    ("키워드", "쿠폰"),
+    ("인증구분", ""),
+    ("인증정보", "c"),
+    ("거래처", ""),
+    ("영어상품명", ""),
+    ("중국어상품명", ""),
+    ("일본어상품명", ""),
+    ("영어상세설명", ""),
+    ("중국어상세설명", ""),
+    ("일본어상세설명", ""),
+    ("상품무게", "25"),
+    ("영어키워드", ""),
+    ("중국어키워드", ""),
+    ("일본어키워드", ""),
+    ("생산지국가", ""),
+    ("전세계배송코드", ""),
+    ("사이즈", ""),
+    ("포장방법", ""),
+    ("상품상세코드", ""),
+    ("상품상세1", "상세설명일괄참조"),
+    ("상품상세2", "상세설명일괄참조"),
+    ("상품상세3", "상세설명일괄참조"),
+    ("상품상세4", "상세설명일괄참조"),
+    ("상품상세5", "상세설명일괄참조"),
+    ("상품상세6", "상세설명일괄참조"),
+    ("상품상세7", "N"),  # 사은품여부
+    ("상품상세8", "상세설명일괄참조"),
+    ("상품상세9", "상세설명일괄참조"),
+    ("상품상세10", "상세설명일괄참조"),
+    ("상품상세11", "상세설명일괄참조"),
+    ("상품상세12", "상세설명일괄참조"),
+    ("상품상세13", Field('thumbnail_url')),  # 마지막에 이미지 URL
+]
+
+OPTION_SUFFIX = "==0=10000=0=0=0="
+
+
+class MarketRowTemplate:
+    """실행당 한 번 컴파일하는 행 템플릿"""
+
+    def __init__(self, headers, brandname, category, code, tdate, now, image_ext='jpg', slice_count=10):
+        layout_headers = [header for header, _ in ROW_LAYOUT]
+        if list(headers[:len(layout_headers)]) != layout_headers:
+            raise ValueError("엑셀 헤더 순서가 행 템플릿과 다릅니다")
+
+        run_values = {
+            'brandname': brandname,
+            'category': category,
+            'user_category': code + tdate,
+        }
+        # 고정 값/실행 값은 미리 채우고 상품별 칸의 위치만 기록
+        self.base_row = []
+        self.slots = {}
+        for position, (_, value) in enumerate(ROW_LAYOUT):
+            if isinstance(value, Field):
+                if value.run:
+                    value = run_values[value.name]
+                else:
+                    self.slots.setdefault(value.name, []).append(position)
+                    value = None
+            self.base_row.append(value)
+
+        # config.py 방식과 동일한 상품코드 접두어 (now 기준, 실행 중 변하지 않음)
+        self.product_code_prefix = str(now)[3:4] + str(now)[5:7] + str(now)[8:10] + code
+
+        image_root = f"http://ai.esmplus.com/tstkimtt/{tdate}{code}"
+        self.thumbnail_url_format = f"{image_root}/cr/{{}}_cr.{image_ext}"
+        # 상세설명 HTML: 상품 번호(3자리)만 바뀌므로 나머지는 미리 연결
+        parts = ["<center> <img src='http://gi.esmplus.com/tstkimtt/head.jpg' /><br>"]
+        for i in range(1, slice_count + 1):
+            parts.append(f"<img src='{image_root}/output/{{counter}}_{i:03}.{image_ext}' /><br />")
+        parts.append("<img src='http://gi.esmplus.com/tstkimtt/deliver.jpg' /></center>")
+        self.detail_description_format = "".join(parts)
+
+    def product_code(self, image_counter):
+        return self.product_code_prefix + str(image_counter)
+
+    def thumbnail_url(self, image_counter):
+        return self.thumbnail_url_format.format(image_counter)
+
+    def detail_description(self, image_counter):
+        return self.detail_description_format.format(counter=f"{image_counter:03}")
+
+    @staticmethod
+    def option_string(options):
+        """선택옵션 문자열 (옵션이 1개뿐이면 빈 값, 기존 규칙과 동일)"""
+        if not options:
+            return ""
+        option_string = "[필수선택]\n" + "\n".join(f"{option_name}{OPTION_SUFFIX}" for option_name in options)
+        if option_string.count("10000") == 1:
+            return ""
+        return option_string
+
+    def build(self, image_counter, product_name, price, options=None):
+        """상품 1개의 행 생성"""
+        option_string = self.option_string(options)
+        values = {
+            'product_code': self.product_code(image_counter),
+            'product_name': product_name,
+            'price': price,
+            'thumbnail_url': self.thumbnail_url(image_counter),
+            'option_type': "" if option_string == "" else "SM",
+            'option_string': option_string,
+            'detail_description': self.detail_description(image_counter),
+        }
+        row = self.base_row.copy()
+        for name, positions in self.slots.items():
+            value = values[name]
+            for position in positions:
+                row[position] = value
+        return row
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+크롤링 실행 프로파일러 (--profile)
+
+실행이 느릴 때 시간이 파이썬 코드(SmartDetector 점수 계산 등), Playwright/네트워크 대기,
+이미지 처리(Pillow) 중 어디에 쓰였는지 나눠 보기 위한 기능. main.py와
+final_analyzer_universal.py의 --profile 옵션으로 켜며, 결과는 실행 폴더(base_path)에 저장한다.
+
+- cprofile: 표준 cProfile (결정적, 이벤트 루프 스레드의 모든 함수 호출 기록) -> profile.prof
+- sample: pyinstrument 샘플링 (설치된 경우만, async 대기 구간을 호출 위치에 표시) -> profile.html
+- 공통: 이벤트 루프 실행(busy)/대기(idle) 시간, 작업별 루프 점유 시간, CPU 시간 -> profile_report.txt
+
+루프 실행 시간은 asyncio 콜백(작업 한 단계) 실행 시간의 합이고, 나머지는 대기 시간이다.
+cProfile은 이벤트 루프 스레드만 기록하므로 스레드/프로세스 풀의 이미지 처리는 CPU 시간
+항목과 perf_spans.jsonl 단계 시간으로 본다. fork된 렌더링 워커는 프로파일 훅을 물려받지
+않도록 fork 직후 해제한다 (훅이 남으면 워커가 몇 배 느려지고 그 기록은 수집되지도 않음).
+"""
+
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import sys
+import time
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    from pyinstrument import Profiler as SamplingProfiler
+except ImportError:
+    SamplingProfiler = None
+
+PROFILE_MODES = ('cprofile', 'sample')
+PROFILE_FILENAME = 'profile.prof'
+SAMPLE_FILENAME = 'profile.html'
+REPORT_FILENAME = 'profile_report.txt'
+SLOW_STEP_SECONDS = 0.1  # 이보다 오래 루프를 점유한 콜백은 다른 작업을 막은 것으로 집계
+
+_profiling = False
+
+
+def _clear_profile_in_child():
+    """fork된 자식 프로세스에서 물려받은 프로파일 훅 해제"""
+    if _profiling:
+        sys.setprofile(None)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_clear_profile_in_child)
+
+
+def is_sampling_available():
+    """pyinstrument 사용 가능 여부"""
+    return SamplingProfiler is not None
+
+
+def add_profile_arguments(parser):
+    """argparse에 --profile / --profile-top 추가"""
+    parser.add_argument('--profile', nargs='?', const='cprofile', choices=PROFILE_MODES,
+                        help="실행 프로파일 기록 (기본 cprofile, sample은 pyinstrument 필요), 결과는 실행 폴더에 저장. "
+                             "메인 프로세스만 기록하며 렌더링 워커 프로세스는 프로파일하지 않음 (CPU 시간만 집계)")
+    parser.add_argument('--profile-top', type=int, default=30, help="보고서에 출력할 상위 함수/작업 수")
+    return parser
+
+
+def _callback_label(callback):
+    """루프 콜백 이름 (작업 단계는 작업의 코루틴 이름)"""
+    owner = getattr(callback, '__self__', None)
+    if isinstance(owner, asyncio.Task):
+        coro = owner.get_coro()
+        return f"task {getattr(coro, '__qualname__', owner.get_name())}"
+    callback = getattr(callback, 'func', callback)  # functools.partial
+    return getattr(callback, '__qualname__', None) or type(callback).__name__
+
+
+class LoopTimer:
+    """asyncio 콜백 실행 시간 집계 (Handle._run을 감싸 루프 점유 시간 측정)"""
+
+    def __init__(self):
+        self.busy = 0.0
+        self.steps = 0
+        self.slow_steps = 0
+        self.by_label = {}  # 이름 -> [총 시간, 횟수, 최대 1회]
+        self._original = None
+
+    def install(self):
+        original = self._original = asyncio.events.Handle._run
+        timer = self
+
+        def _run(handle):
+            start = time.perf_counter()
+            try:
+                return original(handle)
+            finally:
+                elapsed = time.perf_counter() - start
+                timer.busy += elapsed
+                timer.steps += 1
+                if elapsed >= SLOW_STEP_SECONDS:
+                    timer.slow_steps += 1
+                label = _callback_label(handle._callback)
+                stats = timer.by_label.get(label)
+                if stats is None:
+                    timer.by_label[label] = [elapsed, 1, elapsed]
+                else:
+                    stats[0] += elapsed
+                    stats[1] += 1
+                    if elapsed > stats[2]:
+                        stats[2] = elapsed
+
+        asyncio.events.Handle._run = _run
+
+    def uninstall(self):
+        if self._original is not None:
+            asyncio.events.Handle._run = self._original
+            self._original = None
+
+    def top(self, count):
+        return sorted(self.by_label.items(), key=lambda item: item[1][0], reverse=True)[:count]
+
+
+class RunProfiler:
+    """asyncio 실행 1회를 프로파일러와 루프 시간 측정으로 감싸고 보고서 저장"""
+
+    def __init__(self, mode='cprofile', output_dir='.', top_n=30):
+        if mode == 'sample' and not is_sampling_available():
+            print("[WARNING] pyinstrument가 설치되지 않아 cProfile로 기록합니다 (pip install pyinstrument)")
+            mode = 'cprofile'
+        self.mode = mode
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.loop_timer = LoopTimer()
+        self.profiler = None
+        self.started_at = None
+        self.wall = 0.0
+        self.process_cpu = 0.0
+        self.loop_thread_cpu = 0.0
+        self.children_cpu = None
+
+    def run(self, make_coro):
+        """make_coro()로 만든 코루틴을 asyncio.run으로 실행
+
+        크롤러 객체 생성(렌더링 풀 워커 fork 포함)은 프로파일 시작 전에 끝내고, 실행 중 추가로
+        fork되는 워커는 fork 직후 훅을 해제한다.
+        """
+        global _profiling
+        coro = make_coro()
+        self.started_at = datetime.now()
+        children_before = self._children_cpu()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        thread_start = time.thread_time()
+        self.loop_timer.install()
+        _profiling = True
+        if self.mode == 'sample':
+            self.profiler = SamplingProfiler(async_mode='enabled')
+            self.profiler.start()
+        else:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        try:
+            return asyncio.run(coro)
+        finally:
+            if self.mode == 'sample':
+                self.profiler.stop()
+            else:
+                self.profiler.disable()
+            _profiling = False
+            self.loop_timer.uninstall()
+            self.loop_thread_cpu = time.thread_time() - thread_start
+            self.process_cpu = time.process_time() - cpu_start
+            self.wall = time.perf_counter() - wall_start
+            children_after = self._children_cpu()
+            if children_before is not None and children_after is not None:
+                self.children_cpu = children_after - children_before
+
+    @staticmethod
+    def _children_cpu():
+        """종료된 자식 프로세스 CPU 시간 합 (렌더링 워커, Playwright 드라이버 등, Windows는 None)"""
+        if resource is None:
+            return None
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return usage.ru_utime + usage.ru_stime
+
+    def _share(self, seconds):
+        return f"{seconds:.1f}초 ({seconds / self.wall * 100:.0f}%)" if self.wall else f"{seconds:.1f}초"
+
+    def _summary_lines(self):
+        busy = self.loop_timer.busy
+        lines = [
+            f"실행 시간 (wall)              {self.wall:.1f}초",
+            f"이벤트 루프 실행 (busy)       {self._share(busy)}  - 루프 스레드의 파이썬 코드 (선택자 탐지/추출 등)",
+            f"이벤트 루프 대기 (idle)       {self._share(max(0.0, self.wall - busy))}  - Playwright/네트워크/이미지 작업 완료 대기",
+            f"루프 스레드 CPU               {self.loop_thread_cpu:.1f}초",
+            f"프로세스 CPU (모든 스레드)    {self.process_cpu:.1f}초  - 스레드 작업(to_thread 이미지 처리 등) 포함",
+        ]
+        if self.children_cpu is not None:
+            lines.append(f"자식 프로세스 CPU             {self.children_cpu:.1f}초  - 렌더링 워커, Playwright 드라이버 (종료된 프로세스만)")
+        lines.append(f"루프 콜백 {self.loop_timer.steps}회, {SLOW_STEP_SECONDS * 1000:.0f}ms 이상 점유 {self.loop_timer.slow_steps}회")
+        return lines
+
+    def write_report(self):
+        """프로파일 파일과 상위 함수/작업 보고서 저장, 저장한 경로 목록 반환"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        paths = []
+        report = io.StringIO()
+        report.write(f"프로파일: {self.started_at:%Y-%m-%d %H:%M:%S} ({self.mode})\n\n")
+        summary = self._summary_lines()
+        for line in summary:
+            report.write(line + "\n")
+
+        report.write(f"\n루프 점유 상위 작업/콜백 (총 시간 / 횟수 / 최대 1회):\n")
+        for label, (total, count, longest) in self.loop_timer.top(self.top_n):
+            report.write(f"  {total:9.2f}초 / {count:7d} / {longest * 1000:8.1f}ms  {label}\n")
+
+        if self.mode == 'sample':
+            html_path = os.path.join(self.output_dir, SAMPLE_FILENAME)
+            with open(html_path, 'w', encoding='utf-8') as f:
+                f.write(self.profiler.output_html())
+            paths.append(html_path)
+            report.write("\n샘플링 호출 트리:\n")
+            report.write(self.profiler.output_text(unicode=True, color=False))
+        else:
+            prof_path = os.path.join(self.output_dir, PROFILE_FILENAME)
+            self.profiler.dump_stats(prof_path)
+            paths.append(prof_path)
+            for sort_key, title in (('cumulative', '누적 시간'), ('tottime', '자체 시간')):
+                report.write(f"\n상위 함수 ({title}):\n")
+                stats = pstats.Stats(self.profiler, stream=report)
+                stats.strip_dirs().sort_stats(sort_key).print_stats(self.top_n)
+
+        report_path = os.path.join(self.output_dir, REPORT_FILENAME)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(report.getvalue())
+        paths.insert(0, report_path)
+
+        for line in summary:
+            print(f"[PROFILE] {line}")
+        for path in paths:
+            print(f"[PROFILE] 저장: {path}")
+        return paths
+
+
+def run_profiled(make_coro, mode=None, output_dir='.', top_n=30):
+    """mode가 없으면 asyncio.run(make_coro())과 같고, 있으면 프로파일 후 보고서 저장 (중단/예외 시에도 저장)"""
+    if not mode:
+        return asyncio.run(make_coro())
+    profiler = RunProfiler(mode, output_dir, top_n)
+    try:
+        return profiler.run(make_coro)
+    finally:
+        try:
+            profiler.write_report()
+        except Exception as e:
+            print(f"[WARNING] 프로파일 보고서 저장 실패: {e}")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+원본 이미지 보관소
+
+썸네일/상세이미지는 원본을 덮어쓰거나 결합/분할한 결과만 남기 때문에 스타일을 바꾸면
+다시 크롤링해야 했다. 다운로드한 원본 바이트를 실행 폴더의 src/에 보관하고,
+상품별 렌더링 입력(상품명, 원본 파일)을 src/products.jsonl에 기록하여
+rebuild_images.py가 크롤링 없이 다시 렌더링할 수 있게 한다.
+
+이 모듈은 config.py를 import하지 않는다 (config.py는 import 시 실행 폴더를 지우므로
+재렌더링 명령에서 사용할 수 없음).
+"""
+
+import json
+import os
+from threading import Lock
+
+MANIFEST_FILENAME = 'products.jsonl'
+
+
+class SourceImageStore:
+    """실행 폴더의 src/에 원본 이미지와 상품별 렌더링 입력 기록"""
+
+    def __init__(self, base_path):
+        self.base_path = base_path
+        self.src_path = os.path.join(base_path, 'src')
+        self.manifest_path = os.path.join(self.src_path, MANIFEST_FILENAME)
+        self.lock = Lock()
+        os.makedirs(self.src_path, exist_ok=True)
+
+    def _write(self, filename, image_bytes):
+        """원본 바이트 저장 후 실행 폴더 기준 상대 경로 반환"""
+        with open(os.path.join(self.src_path, filename), 'wb') as f:
+            f.write(image_bytes)
+        return f"src/{filename}"
+
+    def save_thumbnail(self, image_counter, image_bytes):
+        """썸네일 원본 저장"""
+        return self._write(f"{image_counter:03}_thumb.img", image_bytes)
+
+    def save_details(self, image_counter, sources):
+        """상세이미지 원본 저장, [[원래 순번, 상대 경로], ...] 반환 (공통 이미지 제외 후 목록)"""
+        return [[idx, self._write(f"{image_counter:03}_{idx:03}.img", image_bytes)] for idx, image_bytes in sources]
+
+    def record(self, image_counter, product_name, thumbnail=None, details=None):
+        """상품별 렌더링 입력 기록 (같은 상품이 여러 번 기록되면 마지막 값 사용)"""
+        entry = {'image_counter': image_counter, 'product_name': product_name}
+        if thumbnail is not None:
+            entry['thumbnail'] = thumbnail
+        if details is not None:
+            entry['details'] = details
+        line = json.dumps(entry, ensure_ascii=False)
+        with self.lock:
+            with open(self.manifest_path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+
+def load_manifest(base_path):
+    """실행 폴더의 상품별 렌더링 입력 읽기, {상품 번호: 기록} 반환"""
+    manifest_path = os.path.join(base_path, 'src', MANIFEST_FILENAME)
+    products = {}
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            # 썸네일/상세이미지가 따로 기록되므로 같은 상품 번호는 합침
+            products.setdefault(entry['image_counter'], {}).update(entry)
+    return products
+
+
+def read_source(base_path, relative_path):
+    """보관된 원본 바이트 읽기"""
+    with open(os.path.join(base_path, relative_path), 'rb') as f:
+        return f.read()
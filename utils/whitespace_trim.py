@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+상세이미지 여백 분석 (NumPy)
+
+공급사 상세이미지의 위/아래 흰 여백, 긴 빈 구간, 빈 spacer 이미지를 찾아
+실제 내용이 있는 세로 구간만 남긴다. 분석은 흑백 이미지의 행별 최소값/범위(ptp)로 한다.
+JPEG는 1/8 축소 디코딩이라 가볍지만, 축소 디코딩이 없는 형식(PNG/GIF 등)은 전체 해상도로
+디코딩한 뒤 줄인다.
+
+NumPy가 없으면 분석하지 않고 원본 전체를 사용한다.
+"""
+
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_TRIM_OPTIONS = {
+    'white_level': 245,  # 행 최소 밝기가 이 값 이상이면 흰색 행
+    'tolerance': 8,  # 행 밝기 범위(최대-최소)가 이 값 이하면 균일한 행
+    'min_gap': 100,  # 이 높이(px) 이상인 내부 빈 구간은 줄임
+    'keep_gap': 40,  # 잘라낸 자리에 남길 여백 (위/아래 절반씩)
+}
+
+
+def is_available():
+    """NumPy 사용 가능 여부"""
+    return np is not None
+
+
+def find_content_segments(image, size, options=None):
+    """내용이 있는 세로 구간 목록 반환 [(top, bottom), ...] (size 기준 좌표)
+
+    image: 아직 디코딩하지 않은 PIL 이미지 (open 직후)
+    size: 출력 크기 (너비 상한 축소 후 크기)
+    반환값: 빈 이미지면 [], 분석 불가면 None (원본 전체 사용)
+    """
+    if np is None:
+        return None
+    options = dict(DEFAULT_TRIM_OPTIONS, **(options or {}))
+
+    # 분석용 축소 디코딩 (JPEG는 DCT 단계에서 1/8, 그 외는 디코딩 후 축소)
+    image.draft('L', (max(1, size[0] // 8), max(1, size[1] // 8)))
+    gray = image.convert('L')
+    factor = max(1, min(gray.width // 64, gray.height // 64, 8))
+    if factor > 1:
+        gray = gray.reduce(factor)
+    pixels = np.asarray(gray, dtype=np.uint8)
+
+    row_min = pixels.min(axis=1)
+    row_range = np.ptp(pixels, axis=1)
+    content_rows = np.flatnonzero((row_min < options['white_level']) | (row_range > options['tolerance']))
+    if content_rows.size == 0:
+        return []
+
+    scale = size[1] / pixels.shape[0]  # 분석 행 1개가 출력에서 차지하는 높이
+
+    # 내용 행 사이 간격이 min_gap 이상인 곳에서 구간 분리
+    gaps = np.diff(content_rows) - 1
+    breaks = np.flatnonzero(gaps * scale >= options['min_gap'])
+    starts = np.concatenate(([content_rows[0]], content_rows[breaks + 1]))
+    ends = np.concatenate((content_rows[breaks] + 1, [content_rows[-1] + 1]))
+
+    # 출력 좌표로 변환하면서 위/아래 여백 유지 (분석 해상도 오차도 이 여백으로 흡수)
+    margin = options['keep_gap'] // 2
+    segments = []
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        top = max(0, math.floor(start * scale) - margin)
+        bottom = min(size[1], math.ceil(end * scale) + margin)
+        if segments and top <= segments[-1][1]:
+            segments[-1] = (segments[-1][0], bottom)
+        else:
+            segments.append((top, bottom))
+    return segments